@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Rendu hors écran : aucune fenêtre n'est ouverte, et rien d'autre que le JSON sur la sortie standard
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from eel import config
+from eel.eel import Eel
+from eel.food import Food
+from eel.occupancy import OccupancyGrid
+
+
+BENCHMARKS = []
+
+
+def benchmark(name, number, **params):
+    """Enregistrer une mesure : la fonction reçoit number et renvoie la durée en ns de number opérations"""
+    def register(func):
+        BENCHMARKS.append((name, params, number, func))
+        return func
+    return register
+
+
+def _straight_eel(length, ticks):
+    """Anguille de length segments en ligne, avec assez de place pour avancer ticks cases"""
+    width = length + ticks + 2
+    eel = Eel(length, 0, width, 1)
+    eel.initial_segments_to_add = 0
+    eel.body = [(x, 0) for x in range(length - 1, -1, -1)]
+    return eel
+
+
+def _bench_tick(length):
+    def run(number):
+        eel = _straight_eel(length, number)
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            eel.tick()
+        return time.perf_counter_ns() - start
+    return run
+
+
+def _bench_self_collision(length):
+    def run(number):
+        eel = _straight_eel(length, 0)
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            eel.check_self_collision()
+        return time.perf_counter_ns() - start
+    return run
+
+
+for _length in (3, 100, 10000):
+    benchmark("eel.tick", 1000, length=_length)(_bench_tick(_length))
+    benchmark("eel.check_self_collision", 10000, length=_length)(_bench_self_collision(_length))
+
+
+def _nearly_full_board(free_cells):
+    """Positions occupées et grille d'occupation avec seulement free_cells cases libres"""
+    cells = [(x, y) for y in range(config.GRID_HEIGHT) for x in range(config.GRID_WIDTH)]
+    occupied = cells[free_cells:]
+    occupancy = OccupancyGrid()
+    for x, y in occupied:
+        occupancy.add(x, y)
+    return occupied, occupancy
+
+
+@benchmark("food.generate", 200, free_cells=2)
+def bench_food_generate(number):
+    occupied, _ = _nearly_full_board(2)
+    food = Food()
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        food.generate(occupied)
+    return time.perf_counter_ns() - start
+
+
+@benchmark("food.place", 10000, free_cells=2)
+def bench_food_place(number):
+    _, occupancy = _nearly_full_board(2)
+    food = Food()
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        food.place(occupancy)
+    return time.perf_counter_ns() - start
+
+
+def _surface():
+    import pygame
+
+    pygame.display.init()
+    return pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+
+
+@benchmark("grid.draw", 200)
+def bench_grid_draw(number):
+    import pygame
+    from eel.grid import Grid
+
+    surface = _surface()
+    grid = Grid(pygame.Vector2(surface.get_width() / 2, surface.get_height() / 2))
+    grid.draw(surface, config.CELL_SIZE)
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        grid.draw(surface, config.CELL_SIZE)
+    return time.perf_counter_ns() - start
+
+
+def _bench_eel_draw(length):
+    def run(number):
+        import pygame
+        from eel.grid import Grid
+
+        surface = _surface()
+        bounds = Grid(pygame.Vector2(surface.get_width() / 2, surface.get_height() / 2)).get_bounds()
+        # Corps en serpentin sur la grille affichée
+        cells = [(x if y % 2 == 0 else config.GRID_WIDTH - 1 - x, y)
+                 for y in range(config.GRID_HEIGHT) for x in range(config.GRID_WIDTH)]
+        eel = Eel(*cells[length])
+        eel.body = cells[length - 1::-1]
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            eel.draw(surface, bounds)
+        return time.perf_counter_ns() - start
+    return run
+
+
+def _bench_eel_draw_changed(length):
+    def run(number):
+        import pygame
+        from eel.grid import Grid
+
+        surface = _surface()
+        bounds = Grid(pygame.Vector2(surface.get_width() / 2, surface.get_height() / 2)).get_bounds()
+        cells = [(x if y % 2 == 0 else config.GRID_WIDTH - 1 - x, y)
+                 for y in range(config.GRID_HEIGHT) for x in range(config.GRID_WIDTH)]
+        eel = Eel(*cells[length])
+        eel.body = cells[length - 1::-1]
+        rects = eel.draw(surface, bounds)
+        # Frame sans tick : seules la queue et la tête sont redessinées
+        erased = rects[-1:]
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            eel.draw_changed(surface, bounds, erased)
+        return time.perf_counter_ns() - start
+    return run
+
+
+for _length in (3, 100):
+    benchmark("eel.draw", 200, length=_length)(_bench_eel_draw(_length))
+    benchmark("eel.draw_changed", 1000, length=_length)(_bench_eel_draw_changed(_length))
+
+
+@benchmark("game.frame", 200)
+def bench_game_frame(number):
+    import pygame
+    from eel.autopilot import HamiltonianAutopilot
+    from eel.game import Game
+
+    game = Game()
+    # Le pilote automatique garde la partie en vie pendant la mesure
+    game.autopilot = HamiltonianAutopilot()
+    game.state_manager.start_game()
+    game.dt = 1 / config.FPS
+    game.update()
+    game.draw()
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        game.update()
+        game.draw()
+    elapsed = time.perf_counter_ns() - start
+    pygame.quit()
+    return elapsed
+
+
+@benchmark("game.arena_frame", 200)
+def bench_game_arena_frame(number):
+    import pygame
+    from eel.game import Game
+
+    # Arène par défaut : 200x200 cases, 64 anguilles de l'ordinateur ; la configuration est rétablie après
+    saved = {name: getattr(config, name)
+             for name in ("ARENA", "GRID_WIDTH", "GRID_HEIGHT", "CELL_SIZE", "PLAYER_RADIUS", "FOOD_RADIUS")}
+    config.ARENA = True
+    try:
+        game = Game()
+        game.state_manager.start_game()
+        game.state_manager.begin_playing()
+        game.dt = 1 / config.FPS
+        game.update()
+        game.draw()
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            # Le joueur immobile finit par mourir : repartir d'une nouvelle arène
+            if not game.state_manager.is_playing:
+                game._init_game_components()
+                game.state_manager.start_game()
+                game.state_manager.begin_playing()
+            game.update()
+            game.draw()
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+    pygame.quit()
+    return elapsed
+
+
+# Démarrage à froid dans un nouvel interpréteur : de l'import du jeu au menu dessiné (pygame déjà importé,
+# son import ne dépend pas du jeu) ; affiche les deux durées en ns
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter_ns()
+import pygame
+imported = time.perf_counter_ns()
+from eel.game import Game
+game = Game()
+game.draw()
+print(imported - start, time.perf_counter_ns() - imported)
+"""
+
+
+def measure_startup():
+    """Lancer le jeu dans un nouveau processus ; renvoie (import de pygame, jusqu'au premier menu) en ns"""
+    import subprocess
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True,
+                            check=True, env=env, cwd=root)
+    pygame_ns, startup_ns = output.stdout.split()[-2:]
+    return int(pygame_ns), int(startup_ns)
+
+
+@benchmark("game.startup", 5)
+def bench_game_startup(number):
+    return sum(measure_startup()[1] for _ in range(number))
+
+
+def run_benchmarks(pattern=None, repeat=5, scale=1.0):
+    """Lancer les mesures dont le nom contient pattern ; renvoie la liste des résultats"""
+    results = []
+    for name, params, number, func in BENCHMARKS:
+        if pattern and pattern not in name:
+            continue
+        number = max(1, int(number * scale))
+        per_op = [func(number) / number for _ in range(repeat)]
+        results.append({
+            "name": name,
+            "params": params,
+            "number": number,
+            "repeat": repeat,
+            "min_ns": min(per_op),
+            "median_ns": statistics.median(per_op),
+            "mean_ns": statistics.fmean(per_op),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance de la simulation et du rendu")
+    parser.add_argument("-k", dest="pattern", default=None, help="ne lancer que les mesures dont le nom contient ce texte")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre de répétitions de chaque mesure")
+    parser.add_argument("--scale", type=float, default=1.0, help="facteur sur le nombre d'opérations par répétition")
+    parser.add_argument("-o", "--output", default=None, help="fichier JSON de sortie (défaut : sortie standard)")
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": run_benchmarks(args.pattern, args.repeat, args.scale),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import random
+from . import config
+from .eel import Eel, DIRECTIONS, DX, DY, INITIAL_SEGMENTS
+from .food import Food
+from .occupancy import OccupancyGrid
+
+
+# Tirages au hasard pour trouver une case de départ ou une case pour la nourriture
+MAX_SPAWN_TRIES = 64
+
+
+class Arena:
+    """Plusieurs anguilles sur une même grille, sans pygame
+
+    Toutes les anguilles partagent une grille d'occupation : une tête qui
+    arrive sur une case occupée touche le corps d'une anguille, la sienne ou
+    une autre. Deux têtes sur la même case meurent toutes les deux. Les têtes
+    ne sont pas dans la grille d'occupation.
+    """
+
+    def __init__(self, width=None, height=None, food_count=1, seed=None, rng=None):
+        self.width = config.GRID_WIDTH if width is None else width
+        self.height = config.GRID_HEIGHT if height is None else height
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.occupancy = OccupancyGrid(self.width, self.height)
+        self.eels = {}
+        self.foods = []
+        self.ticks = 0
+        self._next_id = 1
+        # Identifiant de l'anguille dont la tête est sur chaque case (mis à jour à chaque tick)
+        self._heads = {}
+
+        for _ in range(food_count):
+            food = Food(self.rng)
+            self.foods.append(food)
+            self._place_food(food)
+
+    def __len__(self):
+        return len(self.eels)
+
+    def add_player(self):
+        """Faire apparaître une anguille ; renvoie son identifiant, ou None si aucune case ne convient"""
+        spawn = self._find_spawn()
+        if spawn is None:
+            return None
+
+        x, y, code = spawn
+        eel = Eel(x, y, occupancy=self.occupancy)
+        eel.direction = code
+        player_id = self._next_id
+        self._next_id += 1
+        self.eels[player_id] = eel
+        self._heads[(x, y)] = player_id
+        return player_id
+
+    def remove_player(self, player_id):
+        """Retirer une anguille et libérer ses cases"""
+        eel = self.eels.pop(player_id, None)
+        if eel is not None:
+            eel.remove_from_grid()
+            head = eel.get_head_position()
+            if self._heads.get(head) == player_id:
+                del self._heads[head]
+
+    def queue_direction(self, player_id, direction):
+        """Mettre en file un changement de direction ; False s'il est ignoré"""
+        eel = self.eels.get(player_id)
+        return eel is not None and eel.queue_direction(direction)
+
+    def score(self, player_id):
+        return self.eels[player_id].score
+
+    def step(self):
+        """Avancer toutes les anguilles d'une case
+
+        Renvoie (déplacements, morts, nourriture) : déplacements est une liste
+        de (identifiant, code de direction, queue lâchée) pour les anguilles
+        encore en vie, morts la liste des identifiants retirés, nourriture la
+        liste des (indice, x, y) des nourritures replacées.
+        """
+        eels = self.eels
+        for eel in eels.values():
+            eel.tick()
+        self.ticks += 1
+
+        # Tête sur chaque case (None si plusieurs têtes s'y rencontrent)
+        heads = {}
+        for player_id, eel in eels.items():
+            head = (eel.target_grid_x, eel.target_grid_y)
+            heads[head] = None if head in heads else player_id
+        self._heads = heads
+
+        deaths = [
+            player_id for player_id, eel in eels.items()
+            if eel.is_out_of_bounds() or eel.check_self_collision()
+            or heads[(eel.target_grid_x, eel.target_grid_y)] is None
+        ]
+        for player_id in deaths:
+            self.remove_player(player_id)
+
+        moves = [(player_id, eel.direction, eel.previous_tail is not None) for player_id, eel in eels.items()]
+
+        # Nourriture mangée par les anguilles restantes (ou pas encore placée faute de place)
+        food_changes = []
+        for index, food in enumerate(self.foods):
+            eater = eels.get(heads.get((food.x, food.y)))
+            if eater is not None:
+                eater.add_segment()
+            elif food.x >= 0:
+                continue
+            if self._place_food(food) or eater is not None:
+                food_changes.append((index, food.x, food.y))
+        return moves, deaths, food_changes
+
+    def is_cell_free(self, x, y):
+        """Une tête peut-elle entrer dans la case (dans la grille, sans corps ni tête) ?"""
+        return self.occupancy.is_free(x, y) and (x, y) not in self._heads
+
+    def nearest_food(self, x, y):
+        """Nourriture placée la plus proche d'une case (distance de Manhattan), ou None"""
+        best = None
+        best_distance = None
+        for food in self.foods:
+            if food.x < 0:
+                continue
+            distance = abs(food.x - x) + abs(food.y - y)
+            if best is None or distance < best_distance:
+                best, best_distance = food, distance
+        return best
+
+    def _is_free(self, x, y):
+        """Case libre de tout corps, de toute tête et de toute nourriture"""
+        if not self.occupancy.is_free(x, y) or (x, y) in self._heads:
+            return False
+        for food in self.foods:
+            if food.x == x and food.y == y:
+                return False
+        return True
+
+    def _place_food(self, food):
+        """Placer la nourriture sur une case libre (hors têtes et autres nourritures)"""
+        food.x = food.y = -1
+        for _ in range(MAX_SPAWN_TRIES):
+            position = self.occupancy.random_free_cell(self.rng)
+            if position is None:
+                break
+            if self._is_free(*position):
+                food.x, food.y = position
+                return True
+        # Grille trop pleine : la nourriture attend hors de la grille
+        return False
+
+    def _find_spawn(self):
+        """Case et direction de départ avec assez de place devant pour les premiers segments"""
+        for _ in range(MAX_SPAWN_TRIES):
+            position = self.occupancy.random_free_cell(self.rng)
+            if position is None:
+                return None
+            x, y = position
+            for code in self.rng.sample(range(len(DIRECTIONS)), len(DIRECTIONS)):
+                if all(self._is_free(x + DX[code] * i, y + DY[code] * i) for i in range(INITIAL_SEGMENTS + 1)):
+                    return x, y, code
+        return None
+
+    def player_cells(self, player_id):
+        """Cases d'une anguille, de la queue à la tête"""
+        eel = self.eels[player_id]
+        xs, ys = eel.body_history.ordered()
+        return list(zip(xs, ys)) + [eel.get_head_position()]
+
+
+class ArenaSeat:
+    """Une anguille de l'arène vue comme une Simulation, pour réutiliser les politiques du jeu solo
+
+    Fournit eel, food (la nourriture la plus proche), get_head_position() et
+    is_cell_free(), ce qu'utilisent greedy_policy et les politiques du tournoi.
+    """
+
+    def __init__(self, arena, player_id):
+        self.arena = arena
+        self.player_id = player_id
+
+    @property
+    def eel(self):
+        return self.arena.eels[self.player_id]
+
+    @property
+    def food(self):
+        return self.arena.nearest_food(*self.get_head_position())
+
+    def get_head_position(self):
+        return self.eel.get_head_position()
+
+    def is_cell_free(self, x, y):
+        return self.arena.is_cell_free(x, y)
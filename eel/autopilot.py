@@ -0,0 +1,481 @@
+import heapq
+from collections import deque
+from .eel import UP, DOWN, LEFT, RIGHT
+
+
+# Ticks d'attente avant de rechercher à nouveau un chemin sûr vers la nourriture
+RETRY_TICKS = 8
+
+# Cases explorées au plus par tick par les recherches de chemin : borne le coût d'une
+# décision, quelle que soit la taille de la grille
+TICK_BUDGET = 3000
+
+# Cases comptées au plus autour de chaque issue quand aucun chemin n'est sûr
+ROOM_LIMIT = 400
+
+
+class _Board:
+    """Voisins précalculés des cases d'une grille (indices y * largeur + x)"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.neighbours = []
+        for y in range(height):
+            for x in range(width):
+                cells = []
+                if y > 0:
+                    cells.append(x + (y - 1) * width)
+                if y < height - 1:
+                    cells.append(x + (y + 1) * width)
+                if x > 0:
+                    cells.append(x - 1 + y * width)
+                if x < width - 1:
+                    cells.append(x + 1 + y * width)
+                self.neighbours.append(tuple(cells))
+
+    def cell(self, position):
+        return position[1] * self.width + position[0]
+
+    def direction(self, cell, neighbour):
+        """Direction pour aller d'une case à une case voisine"""
+        if neighbour == cell + 1:
+            return RIGHT
+        if neighbour == cell - 1:
+            return LEFT
+        return DOWN if neighbour > cell else UP
+
+
+def _board_for(autopilot, occupancy):
+    """Réutiliser les voisins précalculés tant que la taille de la grille ne change pas"""
+    board = autopilot._board
+    if board is None or board.width != occupancy.width or board.height != occupancy.height:
+        board = autopilot._board = _Board(occupancy.width, occupancy.height)
+    return board
+
+
+def _body_cells(board, eel):
+    """Cases du corps, de la queue au segment le plus proche de la tête"""
+    xs, ys = eel.body_history.ordered()
+    width = board.width
+    return [y * width + x for x, y in zip(xs, ys)]
+
+
+def _reverse_cell(board, eel, head):
+    """Case derrière la tête (demi-tour interdit)"""
+    x, y = eel.get_head_position()
+    x -= eel.auto_direction[0]
+    y -= eel.auto_direction[1]
+    if 0 <= x < board.width and 0 <= y < board.height:
+        return board.cell((x, y))
+    return -1
+
+
+def _can_enter(board, eel, cell):
+    """La case pourra-t-elle être prise au prochain tick ?"""
+    x, y = cell % board.width, cell // board.width
+    if eel.is_cell_free(x, y):
+        return True
+
+    # La queue libère sa case pendant le tick si le corps est complet
+    history = eel.body_history
+    return len(history) == history.capacity and history[0] == (x, y)
+
+
+class PathfindingAutopilot:
+    """Plus court chemin (A*) vers la nourriture, en vérifiant qu'il reste de la place après
+
+    Le chemin est gardé d'un tick à l'autre : il n'est recalculé que lorsque la
+    nourriture change de case ou que la prochaine case n'est plus sûre. La
+    recherche tient compte de la queue : une case du corps est libre à partir
+    du tick où la queue l'a quittée. Sans chemin sûr, l'anguille rejoint la
+    trace de sa queue et la suit en retentant la nourriture de temps en temps.
+
+    Les recherches d'un tick explorent au plus TICK_BUDGET cases : une
+    recherche interrompue compte comme un échec et sera retentée plus tard.
+    """
+
+    def __init__(self):
+        self._board = None
+        self._path = deque()
+        self._target = None
+        # Ticks passés depuis l'apparition de la nourriture, et prochaine recherche permise
+        self._waited = 0
+        self._retry = 0
+        # Cases qu'il reste à explorer pendant ce tick
+        self._budget = TICK_BUDGET
+
+    def __call__(self, simulation):
+        """Choisir la direction du prochain tick"""
+        eel = simulation.eel
+        board = _board_for(self, eel.occupancy)
+        head = board.cell(eel.get_head_position())
+        food = simulation.food.get_position()
+        self._budget = TICK_BUDGET
+
+        if food != self._target:
+            self._target = food
+            self._waited = 0
+            self._retry = 0
+            self._path = self._plan(board, eel, head, board.cell(food))
+        elif not self._path or not self._is_safe_step(board, eel, head, self._path[0]):
+            self._path = self._plan(board, eel, head, board.cell(food))
+        elif self._waited >= self._retry and self._path[-1] != board.cell(food):
+            # En suivant la queue : retenter la nourriture, sans rechercher à nouveau la queue
+            path = self._food_path(board, eel, head, board.cell(food),
+                                   self._free_at(board, eel), _reverse_cell(board, eel, head))
+            if path:
+                self._path = path
+        self._waited += 1
+
+        if self._path:
+            return board.direction(head, self._path.popleft())
+        return self._escape(board, eel, head)
+
+    def _is_safe_step(self, board, eel, head, cell):
+        """La case voisine peut-elle être prise au prochain tick ?"""
+        if cell not in board.neighbours[head] or cell == _reverse_cell(board, eel, head):
+            return False
+        return _can_enter(board, eel, cell)
+
+    def _plan(self, board, eel, head, food):
+        """Chemin sûr vers la nourriture, sinon vers la queue ; file vide si aucun"""
+        free_at = self._free_at(board, eel)
+        reverse = _reverse_cell(board, eel, head)
+
+        if self._waited >= self._retry:
+            path = self._food_path(board, eel, head, food, free_at, reverse)
+            if path:
+                return path
+
+        # Pas de chemin sûr : suivre la queue en attendant que la place se libère
+        history = eel.body_history
+        if len(history):
+            path = self._trail_path(board, head, _body_cells(board, eel), free_at, reverse)
+            if path:
+                return deque(path)
+        return deque()
+
+    def _food_path(self, board, eel, head, food, free_at, reverse):
+        """Chemin sûr vers la nourriture ; None si aucun, nouvel essai dans RETRY_TICKS ticks"""
+        path = self._search(board, head, food, free_at, reverse)
+        # Sans issue après trop longtemps (la queue tourne en rond) : prendre le risque
+        if path and (self._waited > len(board.neighbours) or self._leaves_room(board, eel, head, path)):
+            return deque(path)
+        # Laisser le corps avancer avant de chercher à nouveau
+        self._retry = self._waited + RETRY_TICKS
+        return None
+
+    def _trail_path(self, board, head, body, free_at, reverse):
+        """Plus court chemin vers une case que la queue aura quittée, puis la trace de la queue
+
+        Sur la trace, chaque case se libère juste avant que la tête y arrive.
+        """
+        neighbours = board.neighbours
+        came_from = {head: None}
+        frontier = [head]
+        steps = 0
+        while frontier:
+            steps += 1
+            following = []
+            for cell in frontier:
+                if not self._budget:
+                    return None
+                self._budget -= 1
+                for neighbour in neighbours[cell]:
+                    if neighbour in came_from or (cell == head and neighbour == reverse):
+                        continue
+                    if neighbour in free_at:
+                        if free_at[neighbour] > steps:
+                            continue
+                        path = [neighbour]
+                        while cell != head:
+                            path.append(cell)
+                            cell = came_from[cell]
+                        path.reverse()
+                        path.extend(body[body.index(neighbour) + 1:])
+                        return path
+                    came_from[neighbour] = cell
+                    following.append(neighbour)
+            frontier = following
+        return None
+
+    def _free_at(self, board, eel):
+        """Tick à partir duquel chaque case du corps sera libre"""
+        history = eel.body_history
+        # Segments ajoutés mais pas encore placés : la queue attend autant de ticks
+        lag = history.capacity - len(history)
+        return dict(zip(_body_cells(board, eel), range(1 + lag, len(history) + 1 + lag)))
+
+    def _search(self, board, start, goal, free_at, reverse):
+        """A* (distance de Manhattan) en tenant compte du tick d'arrivée sur chaque case"""
+        width = board.width
+        neighbours = board.neighbours
+        goal_x, goal_y = goal % width, goal // width
+
+        best = {start: 0}
+        came_from = {}
+        heap = [(0, 0, start)]
+        while heap:
+            _, negative_cost, cell = heapq.heappop(heap)
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = came_from[cell]
+                path.reverse()
+                return path
+
+            cost = -negative_cost
+            if cost > best[cell]:
+                continue
+            if not self._budget:
+                # Trop loin ou sans issue : l'appelant réessaiera quelques ticks plus tard
+                return None
+            self._budget -= 1
+            steps = cost + 1
+            for neighbour in neighbours[cell]:
+                if free_at.get(neighbour, 0) > steps or steps >= best.get(neighbour, steps + 1):
+                    continue
+                if cell == start and neighbour == reverse:
+                    continue
+                best[neighbour] = steps
+                came_from[neighbour] = cell
+                estimate = abs(neighbour % width - goal_x) + abs(neighbour // width - goal_y)
+                # À estimation égale, explorer d'abord les cases les plus avancées
+                heapq.heappush(heap, (steps + estimate, -steps, neighbour))
+        return None
+
+    def _leaves_room(self, board, eel, head, path):
+        """Après avoir mangé au bout du chemin, la tête peut-elle encore rejoindre la queue ?"""
+        cells = _body_cells(board, eel)
+        cells.append(head)
+        cells.extend(path[:-1])
+
+        # Corps virtuel une fois la nourriture mangée (un segment de plus)
+        length = eel.length + 1
+        body = cells[-length:]
+        tail = body[0]
+        return self._flood(board, path[-1], set(body[1:]), tail, length)
+
+    def _flood(self, board, start, blocked, tail, limit):
+        """Parcours en largeur borné : vrai si la queue est atteinte ou si limit cases sont libres"""
+        neighbours = board.neighbours
+        seen = {start}
+        queue = deque((start,))
+        while queue:
+            if not self._budget:
+                # Place inconnue faute de budget : ne pas prendre le risque
+                return False
+            self._budget -= 1
+            cell = queue.popleft()
+            for neighbour in neighbours[cell]:
+                if neighbour == tail:
+                    return True
+                if neighbour in seen or neighbour in blocked:
+                    continue
+                seen.add(neighbour)
+                if len(seen) >= limit:
+                    return True
+                queue.append(neighbour)
+        return False
+
+    def _escape(self, board, eel, head):
+        """Dernier recours : la case voisine qui donne accès au plus de place"""
+        blocked = set(_body_cells(board, eel))
+        blocked.add(head)
+        reverse = _reverse_cell(board, eel, head)
+        limit = min(eel.length + 1, ROOM_LIMIT)
+
+        best = None
+        best_room = -1
+        regions = []
+        for neighbour in board.neighbours[head]:
+            if neighbour == reverse or not self._is_safe_step(board, eel, head, neighbour):
+                continue
+            # Deux issues dans la même zone ont la même place : ne la compter qu'une fois
+            room = next((len(seen) for seen in regions if neighbour in seen), None)
+            if room is None:
+                seen = self._room(board, neighbour, blocked, limit)
+                regions.append(seen)
+                room = len(seen)
+            if room > best_room:
+                best, best_room = neighbour, room
+        return None if best is None else board.direction(head, best)
+
+    def _room(self, board, start, blocked, limit):
+        """Cases accessibles depuis start, au plus limit"""
+        neighbours = board.neighbours
+        seen = {start}
+        queue = deque((start,))
+        while queue and len(seen) < limit:
+            cell = queue.popleft()
+            for neighbour in neighbours[cell]:
+                if neighbour not in seen and neighbour not in blocked:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return seen
+
+
+def hamiltonian_cycle(width, height):
+    """Cycle passant par toutes les cases de la grille ; renvoie (cycle, cases hors cycle)
+
+    Si la largeur et la hauteur sont impaires, aucun cycle ne couvre toute la
+    grille : le coin (0, hauteur - 1) reste hors du cycle. Les cases hors cycle
+    sont données avec la case du cycle qu'elles peuvent remplacer.
+    """
+    if width < 2 or height < 2:
+        raise ValueError("grille trop petite pour un cycle hamiltonien")
+
+    if height % 2 and not width % 2:
+        # Transposer : construire le cycle avec une hauteur paire
+        cycle, _ = hamiltonian_cycle(height, width)
+        return [(cell % height) * width + cell // height for cell in cycle], {}
+
+    rows = height if height % 2 == 0 else height - 1
+    cycle = []
+    for y in range(rows):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        if y == rows - 1 and rows != height:
+            # Dernière ligne paire : détours par la ligne du bas, deux cases à la fois
+            for x in range(width - 1, 1, -2):
+                cycle.extend((y * width + x, (y + 1) * width + x, (y + 1) * width + x - 1, y * width + x - 1))
+        else:
+            cycle.extend(y * width + x for x in xs)
+    # Retour par la première colonne
+    cycle.extend(y * width for y in range(rows - 1, -1, -1))
+
+    off_cycle = {}
+    if rows != height:
+        # Coin (0, hauteur - 1), entre (1, hauteur - 1) et (0, hauteur - 2) : remplace (1, hauteur - 2)
+        off_cycle[(height - 1) * width] = (height - 2) * width + 1
+    return cycle, off_cycle
+
+
+class HamiltonianAutopilot:
+    """Suit un cycle hamiltonien précalculé, avec des raccourcis tant que le corps est court
+
+    Un raccourci n'avance jamais au-delà de la nourriture ni trop près de la
+    queue dans l'ordre du cycle : le corps reste toujours derrière la tête.
+    Sur une grille de taille impaire, le cycle laisse un coin de côté :
+    l'anguille n'y entre que si le cycle sera libre à sa sortie. Remplir
+    la grille dépend alors de l'endroit où réapparaît la nourriture ;
+    plutôt que d'entrer dans son corps, l'anguille continue de tourner.
+    """
+
+    def __init__(self, shortcuts=True):
+        self.shortcuts = shortcuts
+        self._board = None
+        self._cycle_board = None
+        self._reversed = False
+
+    def __call__(self, simulation):
+        """Choisir la direction du prochain tick"""
+        eel = simulation.eel
+        board = _board_for(self, eel.occupancy)
+        if self._cycle_board is not board:
+            self._build_cycle(board)
+
+        head = board.cell(eel.get_head_position())
+        history = eel.body_history
+        order = self._order
+        size = len(self._cycle)
+
+        # En début de partie, parcourir le cycle dans le sens qui n'impose pas de demi-tour
+        next_cell = self._cycle[(order[head] + 1) % size]
+        if not len(history) and next_cell == _reverse_cell(board, eel, head):
+            self._build_cycle(board, not self._reversed)
+            order = self._order
+            next_cell = self._cycle[(order[head] + 1) % size]
+
+        food = board.cell(simulation.food.get_position())
+        if (food in board.neighbours[head] and (order[food] - order[head]) % size == 1
+                and (food not in self._off_cycle or self._can_leave_corner(board, eel, food, True))):
+            # Nourriture sur la case suivante, ou sur la case hors cycle qui la remplace
+            return board.direction(head, food)
+
+        # Une case hors cycle ne s'atteint que depuis la case qui la précède : ne pas dépasser celle-ci
+        food_order = order[food] - 1 if food in self._off_cycle else order[food]
+        to_food = (food_order - order[head]) % size or size
+        to_tail = (order[board.cell(history[0])] - order[head]) % size if len(history) else size
+        allow_shortcuts = self.shortcuts and eel.length < size // 2
+        # Marge pour les segments pas encore placés et celui gagné en mangeant
+        margin = history.capacity - len(history) + 2
+
+        # Grille impaire : passer par le coin hors cycle dès que c'est sûr, pour que la dernière
+        # case libre soit la case remplacée, qui touche quatre cases du cycle au lieu de deux
+        detour = self._detours.get(next_cell)
+        if (detour is not None and detour in board.neighbours[head]
+                and eel.is_cell_free(detour % board.width, detour // board.width)
+                and self._can_leave_corner(board, eel, detour, detour == food)):
+            next_cell = detour
+
+        best = next_cell
+        best_distance = 1
+        for neighbour in board.neighbours[head]:
+            if not eel.is_cell_free(neighbour % board.width, neighbour // board.width):
+                continue
+            distance = (order[neighbour] - order[head]) % size
+            if allow_shortcuts and best_distance < distance <= to_food and distance < to_tail - margin:
+                best, best_distance = neighbour, distance
+        if not _can_enter(board, eel, best):
+            # Case suivante encore occupée (croissance en cours) : prendre une case libre s'il y en a une
+            for neighbour in board.neighbours[head]:
+                if neighbour != _reverse_cell(board, eel, head) and _can_enter(board, eel, neighbour):
+                    best = neighbour
+                    break
+        return board.direction(head, best)
+
+    def _can_leave_corner(self, board, eel, corner, eating):
+        """En passant par la case hors cycle, le cycle restera-t-il libre devant la tête ?
+
+        Un segment gagné sur cette case retient la queue un tick de plus :
+        chaque case du corps rencontrée en suivant le cycle doit avoir été
+        quittée par la queue au tick où la tête l'atteint.
+        """
+        history = eel.body_history
+        pending = history.capacity - len(history)
+        # Tick où la queue quitte chaque case du corps (tick 1 : entrée sur la case hors cycle)
+        vacated = {}
+        for index, cell in enumerate(_body_cells(board, eel)):
+            vacated[cell] = 1 if pending == 0 and index == 0 else pending + eating + index + 1
+
+        start = self._order[corner]
+        size = len(self._cycle)
+        for step in range(1, size):
+            cell = self._cycle[(start + step) % size]
+            if vacated.get(cell, 0) > step + 1:
+                return False
+        return True
+
+    def _build_cycle(self, board, reverse=False):
+        """Calculer le cycle et la position de chaque case dans le cycle"""
+        cycle, off_cycle = hamiltonian_cycle(board.width, board.height)
+        if reverse:
+            cycle.reverse()
+        order = [0] * (board.width * board.height)
+        for index, cell in enumerate(cycle):
+            order[cell] = index
+        for cell, replaced in off_cycle.items():
+            order[cell] = order[replaced]
+        self._cycle = cycle
+        self._order = order
+        self._off_cycle = off_cycle
+        self._detours = {replaced: cell for cell, replaced in off_cycle.items()}
+        self._reversed = reverse
+        self._cycle_board = board
+
+
+AUTOPILOTS = {
+    "pathfinding": PathfindingAutopilot,
+    "hamiltonian": HamiltonianAutopilot,
+}
+
+
+def create_autopilot(name):
+    """Créer le pilote automatique configuré (None si désactivé)"""
+    if name is None:
+        return None
+    if name not in AUTOPILOTS:
+        raise ValueError(f"pilote automatique inconnu : {name}")
+    return AUTOPILOTS[name]()
@@ -0,0 +1,155 @@
+import numpy as np
+from . import config
+
+
+# Codes de direction : même ordre que simulation.DIRECTIONS (haut, bas, gauche, droite)
+DX = np.array([0, 0, -1, 1], dtype=np.int32)
+DY = np.array([-1, 1, 0, 0], dtype=np.int32)
+OPPOSITE = np.array([1, 0, 3, 2], dtype=np.int8)
+NO_ACTION = -1
+
+# Cases tirées au hasard par partie avant de parcourir toute la grille (comme Food)
+RANDOM_TRIES = 32
+
+
+class BatchEelEnv:
+    """N parties avancées en même temps par des opérations NumPy vectorisées
+
+    Mêmes règles que Simulation : une partie qui remplit la grille est
+    gagnée et se termine.
+    """
+
+    def __init__(self, num_envs, width=None, height=None, start_x=None, start_y=None, initial_segments=3, seed=None):
+        self.num_envs = num_envs
+        self.width = config.GRID_WIDTH if width is None else width
+        self.height = config.GRID_HEIGHT if height is None else height
+        self.start_x = self.width // 2 if start_x is None else start_x
+        self.start_y = self.height // 2 if start_y is None else start_y
+        self.initial_segments = initial_segments
+        self.capacity = self.width * self.height
+        self.rng = np.random.default_rng(seed)
+
+        n = num_envs
+        self.head_x = np.zeros(n, dtype=np.int32)
+        self.head_y = np.zeros(n, dtype=np.int32)
+        self.direction = np.zeros(n, dtype=np.int8)
+        # Tampon circulaire du corps : indices de case (y * largeur + x)
+        self.body = np.zeros((n, self.capacity), dtype=np.int32)
+        self.head_index = np.zeros(n, dtype=np.int32)
+        self.tail_index = np.zeros(n, dtype=np.int32)
+        self.length = np.zeros(n, dtype=np.int32)
+        self.occupancy = np.zeros((n, self.capacity), dtype=np.uint8)
+        self.food = np.zeros(n, dtype=np.int32)
+        self.growth = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int32)
+        self.done = np.zeros(n, dtype=bool)
+        self._rows = np.arange(n)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Remettre à zéro toutes les parties, ou seulement celles du masque"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        rows = self._rows[mask]
+        if rows.size == 0:
+            return
+
+        start_cell = self.start_y * self.width + self.start_x
+        self.head_x[rows] = self.start_x
+        self.head_y[rows] = self.start_y
+        self.direction[rows] = 3
+        self.body[rows, 0] = start_cell
+        self.head_index[rows] = 0
+        self.tail_index[rows] = 0
+        self.length[rows] = 1
+        self.occupancy[rows] = 0
+        self.occupancy[rows, start_cell] = 1
+        self.growth[rows] = self.initial_segments
+        self.score[rows] = 0
+        self.ticks[rows] = 0
+        self.done[rows] = False
+        self._place_food(rows)
+
+    def step(self, actions):
+        """Avancer toutes les parties d'une case ; renvoie (ate, died, won)"""
+        actions = np.asarray(actions, dtype=np.int8)
+        alive = ~self.done
+
+        # Appliquer changement de direction si valide (pas de demi-tour)
+        turn = alive & (actions >= 0) & (actions != OPPOSITE[self.direction])
+        self.direction[turn] = actions[turn]
+
+        new_x = self.head_x + DX[self.direction]
+        new_y = self.head_y + DY[self.direction]
+        self.ticks[alive] += 1
+
+        # Collision avec les limites
+        out_of_bounds = alive & ((new_x < 0) | (new_x >= self.width) | (new_y < 0) | (new_y >= self.height))
+        moving = alive & ~out_of_bounds
+
+        # La queue libère sa case avant le test de collision
+        growing = moving & (self.growth > 0)
+        self.growth[growing] -= 1
+        shrinking = self._rows[moving & ~growing]
+        tail_cells = self.body[shrinking, self.tail_index[shrinking]]
+        self.occupancy[shrinking, tail_cells] = 0
+        self.tail_index[shrinking] = (self.tail_index[shrinking] + 1) % self.capacity
+        self.length[shrinking] -= 1
+
+        # Collision avec soi-même
+        new_cell = np.where(moving, new_y * self.width + new_x, 0)
+        hit_self = moving & (self.occupancy[self._rows, new_cell] > 0)
+        died = out_of_bounds | hit_self
+        self.done |= died
+
+        # Avancer la tête
+        movers = self._rows[moving & ~hit_self]
+        cells = new_cell[movers]
+        self.head_x[movers] = new_x[movers]
+        self.head_y[movers] = new_y[movers]
+        self.head_index[movers] = (self.head_index[movers] + 1) % self.capacity
+        self.body[movers, self.head_index[movers]] = cells
+        self.occupancy[movers, cells] = 1
+        self.length[movers] += 1
+
+        # Collision avec la nourriture
+        ate = np.zeros(self.num_envs, dtype=bool)
+        ate[movers] = cells == self.food[movers]
+        self.growth[ate] += 1
+        self.score[ate] += 1
+        won = np.zeros(self.num_envs, dtype=bool)
+        won[self._place_food(self._rows[ate])] = True
+        self.done |= won
+
+        return ate, died, won
+
+    def _place_food(self, rows):
+        """Placer la nourriture sur une case libre tirée au hasard pour chaque partie
+
+        Renvoie les parties dont la grille est pleine (plus de nourriture).
+        """
+        if rows.size == 0:
+            return rows
+
+        # Quelques tirages au hasard suffisent tant que la grille est peu remplie
+        candidates = self.rng.integers(0, self.capacity, (rows.size, RANDOM_TRIES))
+        free = self.occupancy[rows[:, None], candidates] == 0
+        first = np.argmax(free, axis=1)
+        found = free[np.arange(rows.size), first]
+        self.food[rows[found]] = candidates[found, first[found]]
+
+        rows = rows[~found]
+        if rows.size == 0:
+            return rows
+
+        # Grille presque pleine : tirage uniforme parmi les cases libres, la plus grande clé gagne
+        keys = self.rng.random((rows.size, self.capacity))
+        keys[self.occupancy[rows] > 0] = -1.0
+        cells = np.argmax(keys, axis=1)
+
+        # Grille pleine : plus de nourriture
+        full = keys[np.arange(rows.size), cells] < 0
+        self.food[rows] = np.where(full, -1, cells)
+        return rows[full]
@@ -0,0 +1,174 @@
+import argparse
+import asyncio
+import time
+from . import config
+from .eel import Eel, INITIAL_SEGMENTS, direction_code
+from .food import Food
+from .occupancy import OccupancyGrid
+from . import protocol
+
+
+class ArenaView:
+    """Copie locale de l'arène du serveur, tenue à jour par ses messages (sans pygame)
+
+    Chaque anguille est un Eel sur une grille d'occupation partagée : un
+    déplacement reçu est rejoué avec tick(), ce qui donne l'interpolation et
+    le dessin du jeu solo.
+    """
+
+    def __init__(self):
+        self.player_id = None
+        self.width = 0
+        self.height = 0
+        self.tick_interval = config.MOVE_INTERVAL
+        self.occupancy = None
+        self.eels = {}
+        self.foods = []
+        self.ticks = 0
+        self.last_tick_time = 0.0
+
+    @property
+    def ready(self):
+        """L'état complet a-t-il été reçu ?"""
+        return self.occupancy is not None
+
+    def apply(self, kind, body):
+        """Appliquer un message du serveur"""
+        if kind == protocol.WELCOME:
+            self.player_id, self.width, self.height, self.tick_interval = protocol.decode_welcome(body)
+        elif kind == protocol.STATE:
+            self._apply_state(*protocol.decode_state(body))
+        elif kind == protocol.TICK:
+            self._apply_tick(*protocol.decode_tick(body))
+        self.last_tick_time = time.perf_counter()
+
+    def score(self, player_id=None):
+        """Score d'une anguille (par défaut celle du joueur), d'après sa longueur"""
+        eel = self.eels.get(self.player_id if player_id is None else player_id)
+        return 0 if eel is None else max(0, eel.length - INITIAL_SEGMENTS)
+
+    def cells(self, player_id):
+        """Cases d'une anguille, de la queue à la tête"""
+        eel = self.eels[player_id]
+        xs, ys = eel.body_history.ordered()
+        return list(zip(xs, ys)) + [eel.get_head_position()]
+
+    def _apply_state(self, ticks, eels, foods):
+        self.ticks = ticks
+        self.occupancy = OccupancyGrid(self.width, self.height)
+        self.eels = {}
+        for player_id, cells in eels:
+            self._add_eel(player_id, cells)
+        self.foods = []
+        for _, x, y in foods:
+            food = Food()
+            food.x, food.y = x, y
+            self.foods.append(food)
+
+    def _apply_tick(self, ticks, deaths, moves, food_changes, joins):
+        self.ticks = ticks
+        for player_id in deaths:
+            eel = self.eels.pop(player_id, None)
+            if eel is not None:
+                eel.remove_from_grid()
+
+        if len(moves) != len(self.eels):
+            raise ValueError("déplacements désynchronisés avec le serveur")
+        for eel, move in zip(self.eels.values(), moves):
+            eel.direction = move & 3
+            # Sans queue lâchée, l'anguille a grandi : un segment de plus avant d'avancer
+            history = eel.body_history
+            if not move & protocol.TAIL_DROPPED and len(history) == history.capacity:
+                eel.add_segment()
+            eel.tick()
+
+        for index, x, y in food_changes:
+            self.foods[index].x, self.foods[index].y = x, y
+        for player_id, x, y in joins:
+            self._add_eel(player_id, [(x, y)])
+
+    def _add_eel(self, player_id, cells):
+        """Créer une anguille à partir de ses cases (de la queue à la tête)"""
+        eel = Eel(*cells[-1], self.width, self.height, occupancy=self.occupancy)
+        # La croissance vient du serveur, à chaque déplacement
+        eel.initial_segments_to_add = 0
+        eel.first_move = False
+        eel.body = cells[-2::-1]
+        self.eels[player_id] = eel
+
+
+async def play(host, port):
+    """Se connecter au serveur et afficher l'arène avec le rendu du jeu"""
+    import pygame
+    from .game import KEY_DIRECTIONS
+    from .grid import Grid, fit_board
+    from .sprites import clear as clear_sprites
+    from .text_cache import TextCache
+
+    reader, writer = await asyncio.open_connection(host, port)
+    view = ArenaView()
+    while not view.ready:
+        view.apply(*await protocol.read_message(reader))
+
+    async def receive():
+        try:
+            while True:
+                view.apply(*await protocol.read_message(reader))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    # Adapter la taille des cases à la grille du serveur
+    fit_board(view.width, view.height)
+
+    # Seuls l'affichage et les polices servent : ni son ni manettes à initialiser
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    pygame.display.set_caption("The Eel - arène")
+    clear_sprites()
+    grid = Grid(pygame.Vector2(screen.get_width() / 2, screen.get_height() / 2))
+    text_cache = TextCache(pygame.font.Font(None, 36))
+    receiver = asyncio.create_task(receive())
+
+    running = True
+    while running and not receiver.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+                writer.write(protocol.frame(protocol.DIRECTION, bytes([direction_code(KEY_DIRECTIONS[event.key])])))
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and view.player_id not in view.eels:
+                writer.write(protocol.frame(protocol.JOIN))
+
+        # Interpolation entre le dernier tick reçu et le suivant
+        alpha = (time.perf_counter() - view.last_tick_time) / view.tick_interval
+        grid.draw(screen, config.CELL_SIZE)
+        bounds = grid.get_bounds()
+        # Nourriture pas encore placée (arène pleine) : envoyée en (-1, -1), rien à dessiner
+        for food in view.foods:
+            if food.x >= 0:
+                food.draw(screen, bounds)
+        for eel in view.eels.values():
+            eel.interpolate(alpha)
+            eel.draw(screen, bounds)
+
+        status = f"Score: {view.score()}" if view.player_id in view.eels else "Espace pour rejouer"
+        screen.blit(text_cache.render(f"{status}   Joueurs: {len(view.eels)}", True, "white"), (20, 20))
+        pygame.display.flip()
+        await asyncio.sleep(1 / config.FPS)
+
+    receiver.cancel()
+    writer.close()
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Client de l'arène multijoueur")
+    parser.add_argument("host", nargs="?", default="127.0.0.1", help="adresse du serveur")
+    parser.add_argument("--port", type=int, default=7777, help="port du serveur")
+    args = parser.parse_args(argv)
+    asyncio.run(play(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,16 @@ SCREEN_HEIGHT = 720
 # Couleurs
 BG_COLOR = "darkblue"
 PLAYER_COLOR = "darkgreen"
+FOOD_COLOR = "red"
 
 # Joueur
 PLAYER_RADIUS = 25
 PLAYER_SPEED = 55 * 10 / 2  # pixels par seconde (55 pixels en 0.2s)
 MOVE_INTERVAL = 2 / 10
 
+# Nourriture
+FOOD_RADIUS = 8
+
 # Vitesses de jeu
 SPEED_SLOW = 3 / 10      # 0.3s
 SPEED_NORMAL = 2 / 10    # 0.2s
@@ -18,7 +22,40 @@ SPEED_FAST = 1 / 10      # 0.1s
 
 # FPS
 FPS = 60
+MAX_FRAME_TIME = 1 / 4  # temps de frame maximal pris en compte (évite l'emballement après un gel)
+
+# Replays : dossier où enregistrer chaque partie (None pour désactiver)
+REPLAY_DIR = None
+
+# Scores : base SQLite où enregistrer chaque partie (None pour désactiver), et taille des classements
+SCORES_DB = None
+LEADERBOARD_SIZE = 5
+
+# Pilote automatique : None, "pathfinding" ou "hamiltonian"
+AUTOPILOT = None
+
+# Arène : les joueurs et des anguilles dirigées par l'ordinateur sur une grande grille
+ARENA = False
+ARENA_WIDTH = 200
+ARENA_HEIGHT = 200
+ARENA_AI_EELS = 64
+ARENA_HUMANS = 1        # 2 : le premier joueur utilise les flèches, le second ZQSD
+ARENA_FOOD = 40
+ARENA_AI_COLOR = "darkorange"
+ARENA_HUMAN_COLORS = ("darkgreen", "gold")
+
+# Rendu : ne rafraîchir que les zones modifiées (flip complet aux changements d'état)
+DIRTY_RECTS = True
+
+# Profilage : durée des phases de chaque frame, overlay avec F3
+PROFILE = False
+PROFILE_FRAMES = 600   # taille du tampon circulaire
+PROFILE_TRACE = None   # fichier .json ou .csv écrit à la sortie (None pour désactiver)
 
 # Grille
 GRID_COLOR = "darkred"
+GRID_LINE_COLOR = "darkgrey"
+GRID_BORDER_COLOR = "red"
 CELL_SIZE = 55
+GRID_WIDTH = 11   # nombre de cases en largeur
+GRID_HEIGHT = 11  # nombre de cases en hauteur
@@ -1,166 +1,424 @@
-import pygame
+import struct
 from . import config
+from .history import PositionHistory
+from .occupancy import OccupancyGrid
+from .snapshot import pack_parts, unpack_parts
 
 
-class Eel:
-    """Classe représentant l'anguille"""
+# Directions (dx, dy) ; le code d'une direction est son indice dans DIRECTIONS
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Tables indexées par code de direction
+DX = (0, 0, -1, 1)
+DY = (-1, 1, 0, 0)
+OPPOSITE = (1, 0, 3, 2)
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+NO_DIRECTION = -1
+
+# Position des segments ajoutés mais pas encore placés sur la grille
+OFF_GRID = (-10, -10)
+
+# Segments ajoutés un par tick en début de partie
+INITIAL_SEGMENTS = 3
+
+# Changements de direction gardés en attente (un consommé par tick)
+MAX_QUEUED_DIRECTIONS = 3
+
+# État de l'anguille dans un instantané : départ, tête, case précédente, queue libérée,
+# direction, direction en attente, premier mouvement, alpha, segments initiaux et ajoutés
+SNAPSHOT_STATE = struct.Struct("<6i?2i2b?d2i")
+
 
-    def __init__(self, start_x=5, start_y=5):
+def direction_code(direction):
+    """Code d'une direction donnée en (dx, dy) (tuple ou pygame.Vector2)"""
+    return DIRECTION_CODES[(int(direction[0]), int(direction[1]))]
+
+
+class Eel:
+    """Classe représentant l'anguille
+
+    Le mouvement est discret : tick() avance la tête d'une case, en entiers.
+    Les positions flottantes (grid_x, grid_y) ne servent qu'à l'affichage, via
+    interpolate(). Les directions sont gardées sous forme de codes (indices
+    dans DIRECTIONS).
+    """
+
+    __slots__ = (
+        "start_x", "start_y", "grid_x", "grid_y", "target_grid_x", "target_grid_y",
+        "previous_grid_x", "previous_grid_y", "direction", "_pending", "direction_queue",
+        "first_move", "alpha", "occupancy", "body_history", "initial_segments_to_add",
+        "segments_added", "previous_tail", "color", "_blits", "_drawn_head",
+    )
+
+    def __init__(self, start_x=5, start_y=5, width=None, height=None, occupancy=None):
         # Position en coordonnées de grille
+        self.start_x = start_x
+        self.start_y = start_y
         self.grid_x = start_x
         self.grid_y = start_y
         self.target_grid_x = start_x
         self.target_grid_y = start_y
+        self.previous_grid_x = start_x
+        self.previous_grid_y = start_y
 
-        # Direction et mouvement
-        self.auto_direction = pygame.Vector2(1, 0)
-        self.pending_direction = None
-        self.move_timer = 0
+        # Direction et mouvement (codes de direction)
+        self.direction = DIRECTION_CODES[RIGHT]
+        self._pending = NO_DIRECTION
+        self.direction_queue = []
         self.first_move = True
-        self.body_delay = 0.05
-        self.body_move_timer = 0
+        self.alpha = 0.0
 
-        # Corps de l'anguille
-        self.body = []
-        self.body_history = []
-        self.initial_segments_to_add = 3
+        # Corps de l'anguille : les dernières cases de la tête, la plus ancienne est la queue.
+        # La grille d'occupation peut être partagée entre plusieurs anguilles (arène)
+        self.occupancy = OccupancyGrid(width, height) if occupancy is None else occupancy
+        self.body_history = PositionHistory()
+        self.initial_segments_to_add = INITIAL_SEGMENTS
         self.segments_added = 0
 
-    def add_segment(self):
-        """Ajouter un nouveau segment au corps"""
-        positions_per_cell = int(config.MOVE_INTERVAL * config.FPS)
-        new_segment_index = len(self.body) * positions_per_cell + positions_per_cell
-
-        if len(self.body_history) > new_segment_index:
-            self.body.append((self.body_history[-new_segment_index][0], self.body_history[-new_segment_index][1]))
-        else:
-            self.body.append((-10, -10))
-
-    def update_movement(self, dt):
-        """Mettre à jour le mouvement de l'anguille"""
-        self.move_timer += dt
-        self.body_move_timer += dt
+        # Case libérée par la queue au dernier tick (pour l'affichage)
+        self.previous_tail = None
+
+        # Affichage : couleur (None : PLAYER_COLOR), paires (disque, destination) réutilisées, tête au dernier dessin
+        self.color = None
+        self._blits = []
+        self._drawn_head = None
+
+    @property
+    def auto_direction(self):
+        """Direction courante (dx, dy)"""
+        return DIRECTIONS[self.direction]
+
+    @auto_direction.setter
+    def auto_direction(self, direction):
+        self.direction = direction_code(direction)
+
+    @property
+    def pending_direction(self):
+        """Direction à appliquer au prochain tick (dx, dy), ou None"""
+        return None if self._pending == NO_DIRECTION else DIRECTIONS[self._pending]
+
+    @pending_direction.setter
+    def pending_direction(self, direction):
+        self._pending = NO_DIRECTION if direction is None else direction_code(direction)
+
+    @property
+    def body(self):
+        """Positions des segments du corps, du plus proche de la tête à la queue"""
+        history = self.body_history
+        segments = [history[-1 - i] for i in range(len(history))]
+        segments.extend([OFF_GRID] * (history.capacity - len(history)))
+        return segments
+
+    @body.setter
+    def body(self, segments):
+        segments = list(segments)
+        # Ne libérer que les cases de ce corps : la grille peut être partagée
+        self.remove_from_grid()
+        self.body_history = PositionHistory(len(segments))
+        for x, y in reversed(segments):
+            self.body_history.append(x, y)
+            self.occupancy.add(x, y)
+
+    def remove_from_grid(self):
+        """Libérer les cases occupées par le corps dans la grille d'occupation"""
+        xs, ys = self.body_history.ordered()
+        for x, y in zip(xs, ys):
+            self.occupancy.remove(x, y)
+
+    @property
+    def length(self):
+        """Nombre de segments du corps, y compris ceux pas encore placés"""
+        return self.body_history.capacity
+
+    @property
+    def score(self):
+        """Score : segments ajoutés en plus des segments initiaux"""
+        if self.segments_added < self.initial_segments_to_add:
+            return 0
+        return self.length - self.initial_segments_to_add
 
-        # Ajouter position actuelle à l'historique
-        if self.body_move_timer >= self.body_delay:
-            self.body_history.append((self.grid_x, self.grid_y))
+    def add_segment(self):
+        """Ajouter un nouveau segment au corps (placé au bout de la queue au prochain tick)"""
+        self.body_history.grow()
+
+    def tick(self):
+        """Avancer la tête d'une case"""
+        # Un changement de direction en file par tick : les appuis rapides ne se perdent pas
+        pending = self._pending
+        if pending == NO_DIRECTION and self.direction_queue:
+            pending = self.direction_queue.pop(0)
+
+        # Appliquer changement de direction si valide (un demi-tour est abandonné)
+        if pending != NO_DIRECTION:
+            if pending != OPPOSITE[self.direction]:
+                self.direction = pending
+            self._pending = NO_DIRECTION
 
         # Ajouter progressivement les segments initiaux
-        if self.segments_added < self.initial_segments_to_add and self.body_move_timer >= self.body_delay:
-            if len(self.body_history) >= (self.segments_added + 1) * int(config.MOVE_INTERVAL * config.FPS):
-                self.add_segment()
-                self.segments_added += 1
-
-        # Changement de direction et mouvement synchronisés
-        if self.move_timer >= config.MOVE_INTERVAL:
-            self.move_timer -= config.MOVE_INTERVAL
-
-            # Appliquer changement de direction si valide
-            if self.pending_direction and self._is_valid_direction_change(self.pending_direction):
-                self.auto_direction = self.pending_direction
-                self.pending_direction = None
-
-            # Mouvement
-            if self.first_move:
-                self.first_move = False
-                self.target_grid_x = 5 + self.auto_direction.x
-                self.target_grid_y = 5 + self.auto_direction.y
-            else:
-                self.target_grid_x += self.auto_direction.x
-                self.target_grid_y += self.auto_direction.y
-
-        # Mettre à jour positions des segments
-        self._update_body_segments()
-
-        # mouvement fluide
-        self._interpolate_position()
-
-        # Limiter taille historique
-        self._limit_history()
-
-    def _update_body_segments(self):
-        """Mettre à jour les positions des segments du corps"""
-        positions_per_cell = int(config.MOVE_INTERVAL * config.FPS)
-
-        for i in range(len(self.body)):
-            history_index = len(self.body_history) - 1 - (i + 1) * positions_per_cell
-            if history_index >= 0:
-                self.body[i] = self.body_history[history_index]
-
-    def _interpolate_position(self):
-        """Interpolation fluide vers la position cible"""
-        progress = self.move_timer / config.MOVE_INTERVAL
-        progress = min(progress, 1.0)
-
-        if self.first_move:
-            self.grid_x = 5
-            self.grid_y = 5
-        else:
-            start_x = self.target_grid_x - self.auto_direction.x
-            start_y = self.target_grid_y - self.auto_direction.y
-
-            self.grid_x = start_x + (self.target_grid_x - start_x) * progress
-            self.grid_y = start_y + (self.target_grid_y - start_y) * progress
-
-    def _limit_history(self):
-        """Limiter la taille de l'historique"""
-        positions_per_cell = int(config.MOVE_INTERVAL * config.FPS)
-        max_history = len(self.body) * positions_per_cell + 100
-        if len(self.body_history) > max_history:
-            self.body_history = self.body_history[-max_history:]
+        if self.segments_added < self.initial_segments_to_add:
+            self.add_segment()
+            self.segments_added += 1
+
+        # L'ancienne case de la tête devient le premier segment
+        self._advance_body(self.target_grid_x, self.target_grid_y)
+
+        # Mouvement
+        self.first_move = False
+        self.previous_grid_x = self.target_grid_x
+        self.previous_grid_y = self.target_grid_y
+        self.target_grid_x += DX[self.direction]
+        self.target_grid_y += DY[self.direction]
+
+    def _advance_body(self, head_x, head_y):
+        """Ajouter la case de la tête au corps ; la queue libère sa case si le corps est complet"""
+        history = self.body_history
+        self.previous_tail = None
+        if history.capacity == 0:
+            return
+
+        if len(history) == history.capacity:
+            self.previous_tail = history[0]
+            self.occupancy.remove(*self.previous_tail)
+
+        history.append(head_x, head_y)
+        self.occupancy.add(head_x, head_y)
+
+    def snapshot(self):
+        """Instantané en octets de tout l'état de l'anguille (corps et grille d'occupation compris)"""
+        tail = self.previous_tail
+        state = SNAPSHOT_STATE.pack(
+            self.start_x, self.start_y, self.target_grid_x, self.target_grid_y,
+            self.previous_grid_x, self.previous_grid_y,
+            tail is not None, *(tail or (0, 0)),
+            self.direction, self._pending, self.first_move, self.alpha,
+            self.initial_segments_to_add, self.segments_added,
+        )
+        return pack_parts(state, bytes(self.direction_queue),
+                          self.body_history.snapshot(), self.occupancy.snapshot())
+
+    def restore(self, blob):
+        """Remettre l'anguille dans l'état d'un instantané"""
+        state, queue, history, occupancy = unpack_parts(blob)
+        (self.start_x, self.start_y, self.target_grid_x, self.target_grid_y,
+         self.previous_grid_x, self.previous_grid_y,
+         has_tail, tail_x, tail_y,
+         self.direction, self._pending, self.first_move, alpha,
+         self.initial_segments_to_add, self.segments_added) = SNAPSHOT_STATE.unpack(state)
+        self.previous_tail = (tail_x, tail_y) if has_tail else None
+        self.direction_queue = list(queue)
+        self.body_history = PositionHistory.from_snapshot(history)
+        self.occupancy = OccupancyGrid.from_snapshot(occupancy)
+        self.interpolate(alpha)
+        # La couleur est un réglage d'affichage, hors de l'instantané
+        self.color = getattr(self, "color", None)
+        self._blits = []
+        self._drawn_head = None
+
+    @classmethod
+    def from_snapshot(cls, blob):
+        """Créer une anguille depuis un instantané"""
+        eel = cls.__new__(cls)
+        eel.restore(blob)
+        return eel
+
+    def interpolate(self, alpha):
+        """Placer la tête affichée entre la case précédente et la case courante (alpha entre 0 et 1)"""
+        self.alpha = min(max(alpha, 0.0), 1.0)
+        self.grid_x = self.previous_grid_x + (self.target_grid_x - self.previous_grid_x) * self.alpha
+        self.grid_y = self.previous_grid_y + (self.target_grid_y - self.previous_grid_y) * self.alpha
 
     def _is_valid_direction_change(self, new_direction):
         """Vérifier si le changement de direction est valide (pas de demi-tour)"""
-        return new_direction != -self.auto_direction
+        return direction_code(new_direction) != OPPOSITE[self.direction]
 
     def set_pending_direction(self, direction):
         """Définir la direction en attente"""
-        self.pending_direction = direction
+        self._pending = direction_code(direction)
+
+    def queue_direction(self, direction):
+        """Mettre en file un changement de direction ; False s'il est ignoré
+
+        Chaque direction est comparée à la précédente dans la file : les
+        répétitions et les demi-tours sont ignorés, ainsi que les appuis au-delà
+        de MAX_QUEUED_DIRECTIONS.
+        """
+        code = direction_code(direction)
+        queue = self.direction_queue
+        if queue:
+            previous = queue[-1]
+        elif self._pending != NO_DIRECTION:
+            previous = self._pending
+        else:
+            previous = self.direction
+
+        if len(queue) == MAX_QUEUED_DIRECTIONS or code == previous or code == OPPOSITE[previous]:
+            return False
+        queue.append(code)
+        return True
 
     def start_movement(self, direction):
         """Démarrer le mouvement - toujours une case à droite puis direction du clic"""
         if self.first_move:
-            self.auto_direction = pygame.Vector2(1, 0)  # Toujours commencer vers la droite
-            self.pending_direction = direction
+            self.direction = DIRECTION_CODES[RIGHT]  # Toujours commencer vers la droite
+            self.set_pending_direction(direction)
 
     def get_head_position(self):
-        """Obtenir la position de la tête en coordonnées de grille"""
-        return (int(round(self.grid_x)), int(round(self.grid_y)))
+        """Obtenir la case de la tête en coordonnées de grille"""
+        return (self.target_grid_x, self.target_grid_y)
 
     def check_self_collision(self):
         """Vérifier collision avec soi-même"""
-        current_grid_x, current_grid_y = self.get_head_position()
-
-        # Vérifier seulement quand proche d'une position entière
-        if abs(self.grid_x - round(self.grid_x)) < 0.1 and abs(self.grid_y - round(self.grid_y)) < 0.1:
-            for i, segment in enumerate(self.body):
-                segment_grid_x = int(round(segment[0]))
-                segment_grid_y = int(round(segment[1]))
+        # Les segments hors grille ne sont pas comptés dans l'occupation
+        return self.occupancy.is_occupied(self.target_grid_x, self.target_grid_y)
 
-                # Ignorer segments hors grille
-                if (0 <= segment_grid_x < 11 and 0 <= segment_grid_y < 11 and
-                    current_grid_x == segment_grid_x and current_grid_y == segment_grid_y):
-                    return True
-        return False
+    def is_cell_free(self, x, y):
+        """La case est-elle libre de tout segment du corps ?"""
+        return self.occupancy.is_free(x, y)
 
     def is_out_of_bounds(self):
         """Vérifier si l'anguille sort des limites"""
-        return not (0 <= self.target_grid_x < 11 and 0 <= self.target_grid_y < 11)
+        return not self.occupancy.contains(self.target_grid_x, self.target_grid_y)
 
     def get_pixel_position(self, grid_bounds):
         """Convertir position grille en pixels"""
+        import pygame  # pygame n'est nécessaire que pour l'affichage
+
         pixel_x = grid_bounds.left + (self.grid_x * config.CELL_SIZE) + (config.CELL_SIZE // 2)
         pixel_y = grid_bounds.top + (self.grid_y * config.CELL_SIZE) + (config.CELL_SIZE // 2)
         return pygame.Vector2(pixel_x, pixel_y)
 
+    def _sprite_blits(self, sprite, count):
+        """Les count premières paires (disque, destination) de la liste réutilisée d'une frame à l'autre"""
+        blits = self._blits
+        if blits and blits[0][0] is not sprite:
+            blits.clear()
+        size = sprite.get_size()
+        while len(blits) < count:
+            blits.append((sprite, self._new_rect(size)))
+        return blits if len(blits) == count else blits[:count]
+
+    @staticmethod
+    def _new_rect(size):
+        import pygame  # pygame n'est nécessaire que pour l'affichage
+
+        return pygame.Rect((0, 0), size)
+
     def draw(self, screen, grid_bounds):
-        """Dessiner l'anguille"""
-        # Dessiner les segments du corps
-        for segment_pos in self.body:
-            segment_pixel_x = grid_bounds.left + (segment_pos[0] * config.CELL_SIZE) + (config.CELL_SIZE // 2)
-            segment_pixel_y = grid_bounds.top + (segment_pos[1] * config.CELL_SIZE) + (config.CELL_SIZE // 2)
-            pygame.draw.circle(screen, config.PLAYER_COLOR, (segment_pixel_x, segment_pixel_y), config.PLAYER_RADIUS)
-
-        # Dessiner la tête
-        pixel_pos = self.get_pixel_position(grid_bounds)
-        pygame.draw.circle(screen, config.PLAYER_COLOR, pixel_pos, config.PLAYER_RADIUS)
\ No newline at end of file
+        """Dessiner l'anguille en un seul appel à blits() ; renvoie les zones dessinées
+
+        Les destinations sont des Rect préalloués, déplacés sur place : aucun
+        tuple n'est créé par segment.
+        """
+        from .sprites import circle_sprite  # pygame n'est nécessaire que pour l'affichage
+
+        radius = config.PLAYER_RADIUS
+        sprite = circle_sprite(radius, self.color or config.PLAYER_COLOR)
+        cell_size = config.CELL_SIZE
+        offset_x = grid_bounds.left + cell_size // 2 - radius
+        offset_y = grid_bounds.top + cell_size // 2 - radius
+
+        xs, ys = self.body_history.ordered()
+        has_tail = self.previous_tail is not None and len(xs) > 0
+        blits = self._sprite_blits(sprite, len(xs) + has_tail + 1)
+
+        # La queue glisse depuis la case qu'elle vient de libérer
+        index = 0
+        if has_tail:
+            self._place_tail(blits[0][1], xs[0], ys[0], offset_x, offset_y)
+            index = 1
+
+        # Segments du corps
+        for x, y in zip(xs, ys):
+            rect = blits[index][1]
+            rect.x = offset_x + x * cell_size
+            rect.y = offset_y + y * cell_size
+            index += 1
+
+        # Tête
+        self._place_head(blits[index][1], offset_x, offset_y)
+
+        self._drawn_head = (self.target_grid_x, self.target_grid_y)
+        return screen.blits(blits)
+
+    def changed_rects(self, grid_bounds):
+        """Zones des cases qui ont changé depuis le dernier dessin (au plus un tick) : queue libérée, nouveau segment"""
+        if self._drawn_head == (self.target_grid_x, self.target_grid_y):
+            return []
+
+        cells = []
+        if self.previous_tail is not None:
+            cells.append(self.previous_tail)
+        if self.body_history.capacity:
+            cells.append((self.previous_grid_x, self.previous_grid_y))
+        return [self._cell_rect(x, y, grid_bounds) for x, y in cells]
+
+    def draw_changed(self, screen, grid_bounds, erased):
+        """Dessiner seulement les segments sous les zones effacées, puis la queue et la tête ; renvoie les zones dessinées
+
+        Les segments du corps ne bougent pas entre deux ticks : après draw(),
+        il suffit de redessiner ceux que les zones effacées ont touchés.
+        """
+        from .sprites import circle_sprite  # pygame n'est nécessaire que pour l'affichage
+
+        radius = config.PLAYER_RADIUS
+        sprite = circle_sprite(radius, self.color or config.PLAYER_COLOR)
+        cell_size = config.CELL_SIZE
+        offset_x = grid_bounds.left + cell_size // 2 - radius
+        offset_y = grid_bounds.top + cell_size // 2 - radius
+        occupancy = self.occupancy
+
+        # Segments posés sur les cases touchées par les zones effacées
+        cells = set()
+        for rect in erased:
+            left = max((rect.left - grid_bounds.left) // cell_size, 0)
+            right = min((rect.right - 1 - grid_bounds.left) // cell_size, occupancy.width - 1)
+            top = max((rect.top - grid_bounds.top) // cell_size, 0)
+            bottom = min((rect.bottom - 1 - grid_bounds.top) // cell_size, occupancy.height - 1)
+            for y in range(top, bottom + 1):
+                for x in range(left, right + 1):
+                    if occupancy.is_occupied(x, y):
+                        cells.add((x, y))
+
+        history = self.body_history
+        has_tail = self.previous_tail is not None and len(history) > 0
+        blits = self._sprite_blits(sprite, len(cells) + has_tail + 1)
+
+        index = 0
+        for x, y in cells:
+            rect = blits[index][1]
+            rect.x = offset_x + x * cell_size
+            rect.y = offset_y + y * cell_size
+            index += 1
+
+        # La queue glisse au-dessus des segments, comme dans draw()
+        if has_tail:
+            self._place_tail(blits[index][1], history.x_at(0), history.y_at(0), offset_x, offset_y)
+            index += 1
+        self._place_head(blits[index][1], offset_x, offset_y)
+
+        self._drawn_head = (self.target_grid_x, self.target_grid_y)
+        return screen.blits(blits)
+
+    def _place_tail(self, rect, tail_x, tail_y, offset_x, offset_y):
+        """Placer la queue entre la case libérée et le dernier segment"""
+        previous_x, previous_y = self.previous_tail
+        rect.x = int(offset_x + (previous_x + (tail_x - previous_x) * self.alpha) * config.CELL_SIZE)
+        rect.y = int(offset_y + (previous_y + (tail_y - previous_y) * self.alpha) * config.CELL_SIZE)
+
+    def _place_head(self, rect, offset_x, offset_y):
+        """Placer la tête à sa position interpolée"""
+        rect.x = int(offset_x + self.grid_x * config.CELL_SIZE)
+        rect.y = int(offset_y + self.grid_y * config.CELL_SIZE)
+
+    def _cell_rect(self, x, y, grid_bounds):
+        """Zone du disque d'un segment posé sur une case"""
+        radius = config.PLAYER_RADIUS
+        cell_size = config.CELL_SIZE
+        rect = self._new_rect((2 * radius, 2 * radius))
+        rect.x = grid_bounds.left + cell_size // 2 - radius + x * cell_size
+        rect.y = grid_bounds.top + cell_size // 2 - radius + y * cell_size
+        return rect
@@ -0,0 +1,94 @@
+import numpy as np
+from .eel import DIRECTIONS
+from .simulation import Simulation
+
+
+# Canaux de l'observation
+BODY = 0
+HEAD = 1
+FOOD = 2
+
+
+class EelEnv:
+    """Environnement d'apprentissage à la Gymnasium autour de Simulation
+
+    L'observation est un tableau (3, hauteur, largeur) alloué une seule fois et
+    mis à jour sur place à chaque pas : seules les cases qui changent (tête,
+    queue, nourriture) sont écrites. step() renvoie toujours le même tableau ;
+    le copier pour le conserver.
+    """
+
+    def __init__(self, width=None, height=None, max_steps=None, seed=None):
+        self.simulation = Simulation(width, height, seed=seed)
+        self.width = self.simulation.width
+        self.height = self.simulation.height
+        self.max_steps = max_steps
+        self.observation = np.zeros((3, self.height, self.width), dtype=np.uint8)
+
+    def reset(self, seed=None):
+        """Commencer une nouvelle partie ; renvoie (observation, info)"""
+        self.simulation.reset(seed)
+        self._rebuild_observation()
+        return self.observation, self._info(None)
+
+    def step(self, action):
+        """Jouer une action (indice dans DIRECTIONS, ou None pour continuer tout droit)
+
+        Renvoie (observation, récompense, terminé, tronqué, info). Après une
+        partie terminée, appeler reset() avant de rejouer.
+        """
+        simulation = self.simulation
+        # La tête peut être hors de la grille : l'observation ne doit plus être écrite
+        if not simulation.alive:
+            raise RuntimeError("partie terminée : appeler reset() avant step()")
+        eel = simulation.eel
+        observation = self.observation
+        old_head = eel.get_head_position()
+        old_food = simulation.food.get_position()
+
+        result = simulation.step(None if action is None else DIRECTIONS[action])
+
+        # Corps : la queue libère sa case, l'ancienne tête devient un segment
+        if eel.previous_tail is not None:
+            observation[BODY, eel.previous_tail[1], eel.previous_tail[0]] = 0
+        if eel.body_history.capacity:
+            observation[BODY, old_head[1], old_head[0]] = 1
+
+        # Tête
+        observation[HEAD, old_head[1], old_head[0]] = 0
+        if not eel.is_out_of_bounds():
+            head_x, head_y = eel.get_head_position()
+            observation[HEAD, head_y, head_x] = 1
+
+        # Nourriture
+        food = simulation.food.get_position()
+        if food != old_food:
+            observation[FOOD, old_food[1], old_food[0]] = 0
+            observation[FOOD, food[1], food[0]] = 1
+
+        if result == "ate" or result == "won":
+            reward = 1.0
+        elif result == "game_over":
+            reward = -1.0
+        else:
+            reward = 0.0
+
+        terminated = not simulation.alive
+        truncated = not terminated and self.max_steps is not None and simulation.ticks >= self.max_steps
+        return observation, reward, terminated, truncated, self._info(result)
+
+    def _rebuild_observation(self):
+        """Reconstruire entièrement l'observation depuis l'état de la simulation"""
+        observation = self.observation
+        observation.fill(0)
+        history = self.simulation.eel.body_history
+        for i in range(len(history)):
+            observation[BODY, history.y_at(i), history.x_at(i)] = 1
+
+        head_x, head_y = self.simulation.get_head_position()
+        observation[HEAD, head_y, head_x] = 1
+        food_x, food_y = self.simulation.food.get_position()
+        observation[FOOD, food_y, food_x] = 1
+
+    def _info(self, result):
+        return {"score": self.simulation.score, "ticks": self.simulation.ticks, "result": result}
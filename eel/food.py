@@ -1,37 +1,74 @@
-import pygame
 import random
+import struct
 from . import config
 
 
+# Tirages au hasard avant de passer à la liste des cases libres
+MAX_RANDOM_TRIES = 32
+
+# Position de la nourriture dans un instantané
+SNAPSHOT_STATE = struct.Struct("<ii")
+
+
 class Food:
     """Classe représentant la nourriture"""
 
-    def __init__(self):
+    __slots__ = ("rng", "x", "y")
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
         self.x = 0
         self.y = 0
         self.generate()
 
     def generate(self, avoid_positions=None):
-        """Générer une nouvelle position pour la nourriture"""
-        if avoid_positions is None:
-            avoid_positions = []
+        """Générer une nouvelle position pour la nourriture ; False si la grille est pleine"""
+        avoid = set(avoid_positions or [])
 
-        # Générer position aléatoire
-        self.x = random.randint(0, 10)
-        self.y = random.randint(0, 10)
+        # Quelques tirages au hasard suffisent tant que la grille est peu remplie
+        for _ in range(MAX_RANDOM_TRIES):
+            self.x = self.rng.randint(0, config.GRID_WIDTH - 1)
+            self.y = self.rng.randint(0, config.GRID_HEIGHT - 1)
+            if (self.x, self.y) not in avoid:
+                return True
 
-        # Éviter les positions occupées
-        for avoid_x, avoid_y in avoid_positions:
-            if self.x == avoid_x and self.y == avoid_y:
-                self.generate(avoid_positions)  # Régénérer
-                return
+        # Grille presque pleine : choisir parmi les cases libres restantes
+        free_cells = [
+            (x, y)
+            for y in range(config.GRID_HEIGHT)
+            for x in range(config.GRID_WIDTH)
+            if (x, y) not in avoid
+        ]
+        if not free_cells:
+            return False
+        self.x, self.y = self.rng.choice(free_cells)
+        return True
+
+    def place(self, occupancy, exclude=None):
+        """Placer la nourriture sur une case libre de la grille d'occupation ; False si la grille est pleine"""
+        position = occupancy.random_free_cell(self.rng, exclude)
+        if position is None:
+            return False
+        self.x, self.y = position
+        return True
+
+    def snapshot(self):
+        """Instantané en octets de la position (le générateur aléatoire appartient à la simulation)"""
+        return SNAPSHOT_STATE.pack(self.x, self.y)
+
+    def restore(self, blob):
+        """Remettre la nourriture à la position d'un instantané"""
+        self.x, self.y = SNAPSHOT_STATE.unpack(blob)
 
     def get_position(self):
         """Obtenir la position de la nourriture"""
         return (self.x, self.y)
 
     def draw(self, screen, grid_bounds):
-        """Dessiner la nourriture"""
+        """Dessiner la nourriture ; renvoie la zone dessinée"""
+        from .sprites import circle_sprite  # pygame n'est nécessaire que pour l'affichage
+
+        radius = config.FOOD_RADIUS
         food_pixel_x = grid_bounds.left + (self.x * config.CELL_SIZE) + (config.CELL_SIZE // 2)
         food_pixel_y = grid_bounds.top + (self.y * config.CELL_SIZE) + (config.CELL_SIZE // 2)
-        pygame.draw.circle(screen, "red", (food_pixel_x, food_pixel_y), 8)
\ No newline at end of file
+        return screen.blit(circle_sprite(radius, config.FOOD_COLOR), (food_pixel_x - radius, food_pixel_y - radius))
@@ -1,27 +1,61 @@
+import os
+import random
+import struct
+import time
 import pygame
 from . import config
-from .eel import Eel
-from .food import Food
-from .grid import Grid
+from .eel import UP, DOWN, LEFT, RIGHT, DIRECTIONS
+from .grid import Grid, fit_board
 from .menu import Menu
 from .game_state import GameStateManager
+from . import sprites
+from .replay import Replay, ReplayRecorder
+from .simulation import Simulation
+from .snapshot import pack_parts, unpack_parts
+from .text_cache import TextCache
+
+
+# Touches de direction (ZQSD et flèches)
+KEY_DIRECTIONS = {
+    pygame.K_z: UP, pygame.K_UP: UP,
+    pygame.K_s: DOWN, pygame.K_DOWN: DOWN,
+    pygame.K_q: LEFT, pygame.K_LEFT: LEFT,
+    pygame.K_d: RIGHT, pygame.K_RIGHT: RIGHT,
+}
+
+# Touches du second joueur dans l'arène à deux joueurs
+SECOND_PLAYER_KEYS = {pygame.K_z, pygame.K_s, pygame.K_q, pygame.K_d}
+
+# Temps accumulé entre deux ticks, dans un instantané
+SNAPSHOT_STATE = struct.Struct("<d")
 
 
 class Game:
     """Classe principale"""
 
     def __init__(self):
-        pygame.init()
+        # Seuls l'affichage et les polices servent : ni son ni manettes à initialiser
+        pygame.display.init()
+        pygame.font.init()
 
         # Configuration de la fenêtre
         self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         pygame.display.set_caption("The Eel")
+        sprites.clear()  # Disques convertis pour le nouvel affichage
         self.clock = pygame.time.Clock()
         self.running = True
         self.dt = 0
+        self.accumulator = 0.0
 
-        # Police pour le score
+        # Rendu par zones modifiées
+        self._dirty_rects = []
+        self._drawn_state = None
+        self._drawn_tick = 0
+        self._needs_full_redraw = True
+
+        # Police pour le score, et cache des textes partagé avec le menu
         self.font = pygame.font.Font(None, 36)
+        self.text_cache = TextCache(self.font)
 
         # Centre de l'écran
         self.center = pygame.Vector2(
@@ -31,29 +65,102 @@ class Game:
 
         # Gestionnaires
         self.state_manager = GameStateManager()
-        self.menu = Menu(self.screen, self.font)
+        self.scores = self._create_score_store()
+        self.leaderboard = []
+        self.menu = Menu(self.screen, self.font, self.text_cache, self.scores)
+        self.autopilot = self._create_autopilot()
+        self.profiler = self._create_profiler()
+
+        # Arène : cases réduites pour que la grande grille tienne dans la fenêtre
+        if config.ARENA:
+            fit_board(config.ARENA_WIDTH, config.ARENA_HEIGHT)
 
         # Composants du jeu
         self._init_game_components()
 
+    # Les modules des options ne sont importés que si elles sont activées : démarrage plus rapide
+
+    def _create_score_store(self):
+        if config.SCORES_DB is None:
+            return None
+        from .scores import ScoreStore
+        return ScoreStore(config.SCORES_DB)
+
+    def _create_autopilot(self):
+        if config.AUTOPILOT is None:
+            return None
+        from .autopilot import create_autopilot
+        return create_autopilot(config.AUTOPILOT)
+
+    def _create_profiler(self):
+        if not config.PROFILE:
+            return None
+        from .profiler import FrameProfiler
+        return FrameProfiler(config.PROFILE_FRAMES)
+
     def _init_game_components(self):
         """Initialiser les composants de jeu"""
-        self.eel = Eel(5, 5)
-        self.food = Food()
+        # Générateur aléatoire propre à la partie, pour pouvoir la rejouer
+        self.seed = random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.simulation = Simulation(rng=self.rng)
+        self.recorder = ReplayRecorder(self.seed, self.simulation.width, self.simulation.height)
+        self.eel = self.simulation.eel
+        self.food = self.simulation.food
         self.grid = Grid(self.center)
-        self.food.generate([self.eel.get_head_position()])
+        self.accumulator = 0.0
+        self.arena = None
+        if config.ARENA:
+            self._init_arena()
+
+    def _init_arena(self):
+        """Créer l'arène : les joueurs d'abord, puis les anguilles de l'ordinateur"""
+        from .arena import Arena, ArenaSeat
+        from .tournament import greedy_policy
+
+        self.ai_policy = greedy_policy
+        self.arena = Arena(food_count=config.ARENA_FOOD, rng=self.rng)
+        self.human_ids = []
+        self.human_eels = []
+        for index in range(config.ARENA_HUMANS):
+            player_id = self.arena.add_player()
+            eel = self.arena.eels[player_id]
+            eel.color = config.ARENA_HUMAN_COLORS[index % len(config.ARENA_HUMAN_COLORS)]
+            self.human_ids.append(player_id)
+            self.human_eels.append(eel)
+        self.ai_seats = [ArenaSeat(self.arena, None) for _ in range(config.ARENA_AI_EELS)]
+        self._respawn_arena_ai()
+        # Le score et l'interpolation de l'affichage suivent le premier joueur
+        self.eel = self.human_eels[0]
+        self.food = self.arena.foods[0]
 
     def run(self):
         while self.running:
-            self.handle_events()   # Gestion des événements (clavier, souris, fermeture fenêtre)
-            self.update()          # Logique du jeu (mouvements, collisions...)
-            self.draw()            # Rendu graphique
+            if self.profiler is None:
+                self.handle_events()   # Gestion des événements (clavier, souris, fermeture fenêtre)
+                self.update()          # Logique du jeu (mouvements, collisions...)
+                self.draw()            # Rendu graphique
+            else:
+                self._run_profiled_frame()
 
             # Calcul du delta time (temps entre deux frames)
             self.dt = self.clock.tick(config.FPS) / 1000
 
+        if self.profiler is not None and config.PROFILE_TRACE:
+            self.profiler.dump(config.PROFILE_TRACE)
+        if self.scores is not None:
+            self.scores.close()
         pygame.quit()
 
+    def _run_profiled_frame(self):
+        """Une frame, avec la durée de chaque phase"""
+        profiler = self.profiler
+        profiler.begin_frame()
+        profiler.measure("events", self.handle_events)
+        profiler.measure("update", self.update)
+        profiler.measure("draw", self.draw)
+        profiler.end_frame()
+
     def handle_events(self):
         """Gérer les événements pygame"""
         for event in pygame.event.get():
@@ -61,86 +168,266 @@ class Game:
                 self.running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self._handle_mouse_click(event.pos)
-
-        # Gestion des entrées clavier pour l'anguille
-        if self.state_manager.is_waiting_start or self.state_manager.is_playing:
-            keys = pygame.key.get_pressed()
-            self._handle_keyboard_input(keys)
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3 and self.profiler is not None:
+                    self.profiler.toggle_hud()
+                    self._needs_full_redraw = True
+                else:
+                    self._handle_key_down(event.key)
 
     def update(self):
         """Mettre à jour la logique du jeu"""
+        if self.arena is not None:
+            self._update_arena()
+            return
+
+        # Le pilote automatique démarre la partie sans attendre de touche
+        if self.autopilot is not None and self.state_manager.is_waiting_start:
+            self.state_manager.begin_playing()
+            self.eel.start_movement(RIGHT)
+            self.recorder.record(self.simulation.ticks, RIGHT)
+
         if not self.state_manager.should_update_game():
             return
 
-        # Mise à jour de l'anguille
-        self.eel.update_movement(self.dt)
+        # Pas de temps fixe : autant de ticks que le temps écoulé en contient
+        self.accumulator += min(self.dt, config.MAX_FRAME_TIME)
+        while self.accumulator >= config.MOVE_INTERVAL:
+            self.accumulator -= config.MOVE_INTERVAL
+            if self.autopilot is not None:
+                self._steer_autopilot()
+            elif self.eel.pending_direction is None and self.eel.direction_queue:
+                # Enregistrer la direction au tick où elle est appliquée
+                self.recorder.record(self.simulation.ticks, DIRECTIONS[self.eel.direction_queue[0]])
+            self.simulation.advance()
+
+            # Vérifier les collisions
+            self._check_collisions()
+            if not self.state_manager.is_playing:
+                return
+
+        # Interpolation de l'affichage entre les deux derniers ticks
+        self.eel.interpolate(self.accumulator / config.MOVE_INTERVAL)
+
+    def _update_arena(self):
+        """Mettre à jour l'arène : mêmes ticks à pas fixe, pour toutes les anguilles"""
+        if not self.state_manager.should_update_game():
+            return
 
-        # Vérifier les collisions
-        self._check_collisions()
+        arena = self.arena
+        self.accumulator += min(self.dt, config.MAX_FRAME_TIME)
+        while self.accumulator >= config.MOVE_INTERVAL:
+            self.accumulator -= config.MOVE_INTERVAL
+            self._steer_arena_ai()
+            # Collisions entre anguilles par la grille d'occupation partagée
+            arena.step()
+            if not any(player_id in arena.eels for player_id in self.human_ids):
+                print("Game Over")
+                self.state_manager.game_over()
+                self._record_score(arena.ticks)
+                return
+            self._respawn_arena_ai()
+
+        alpha = self.accumulator / config.MOVE_INTERVAL
+        for eel in arena.eels.values():
+            eel.interpolate(alpha)
+
+    def _steer_arena_ai(self):
+        """Diriger les anguilles de l'ordinateur vers la nourriture la plus proche"""
+        for seat in self.ai_seats:
+            if seat.player_id is None or seat.food is None:
+                continue
+            direction = self.ai_policy(seat)
+            eel = seat.eel
+            if direction is not None and direction != (eel.pending_direction or eel.auto_direction):
+                eel.set_pending_direction(direction)
+
+    def _respawn_arena_ai(self):
+        """Remplacer les anguilles de l'ordinateur mortes (réessayé au tick suivant faute de place)"""
+        eels = self.arena.eels
+        for seat in self.ai_seats:
+            if seat.player_id not in eels:
+                seat.player_id = self.arena.add_player()
+                if seat.player_id is not None:
+                    eels[seat.player_id].color = config.ARENA_AI_COLOR
+
+    def _steer_autopilot(self):
+        """Donner à l'anguille la direction choisie par le pilote automatique"""
+        direction = self.autopilot(self.simulation)
+        if direction is not None and direction != (self.eel.pending_direction or self.eel.auto_direction):
+            self.eel.set_pending_direction(direction)
+            self.recorder.record(self.simulation.ticks, direction)
 
     def _check_collisions(self):
         """Vérifier toutes les collisions"""
-        # Collision avec les limites
-        if self.eel.is_out_of_bounds():
-            print(f"Game Over: Sortie de grille")
+        result = self.simulation.check_collisions()
+        if result == "game_over":
+            print("Game Over")
             self.state_manager.game_over()
+            self._save_replay()
+            self._record_score(self.simulation.ticks)
+        elif result == "won":
+            print("Victoire : grille remplie")
+            self.state_manager.win()
+            self._save_replay()
+            self._record_score(self.simulation.ticks)
+
+    def _record_score(self, ticks):
+        """Enregistrer le résultat de la partie et préparer le classement affiché au game over
+
+        L'écriture se fait sur le thread du magasin ; le classement, déjà
+        à jour avec cette partie, est lu en mémoire sans attendre l'écriture.
+        """
+        if self.scores is None:
             return
-
-        # Collision avec soi-même
-        if self.eel.check_self_collision():
-            print("Game Over: Collision avec soi-même")
-            self.state_manager.game_over()
+        score = self._calculate_final_score()
+        speed = config.MOVE_INTERVAL
+        self.scores.record(score, self.eel.length, ticks * speed, speed, self.seed, self.state_manager.won)
+        self.leaderboard = [result.score for result in self.scores.top(config.LEADERBOARD_SIZE, speed)]
+
+    def _save_replay(self):
+        """Enregistrer le replay de la partie si un dossier est configuré"""
+        if config.REPLAY_DIR is None:
             return
+        os.makedirs(config.REPLAY_DIR, exist_ok=True)
+        path = os.path.join(config.REPLAY_DIR, f"{self.seed}.eelr")
+        self.recorder.save(path, self.simulation.ticks)
+
+    def snapshot(self):
+        """Instantané immuable (bytes) de la partie : états, simulation et entrées du replay
+
+        Rien de l'affichage n'y figure : restaurer un instantané dans un autre
+        Game (ou le même) reprend la partie à l'identique.
+        """
+        return pack_parts(
+            SNAPSHOT_STATE.pack(self.accumulator),
+            self.state_manager.snapshot(),
+            self.simulation.snapshot(),
+            self.recorder.to_bytes(self.simulation.ticks),
+        )
 
-        # Collision avec la nourriture
-        head_pos = self.eel.get_head_position()
-        food_pos = self.food.get_position()
-
-        if head_pos == food_pos:
-            self.eel.add_segment()
-            # Régénérer la nourriture en évitant l'anguille'
-            avoid_positions = [head_pos] + [tuple(map(int, segment)) for segment in self.eel.body]
-            self.food.generate(avoid_positions)
+    def restore(self, blob):
+        """Reprendre la partie dans l'état d'un instantané"""
+        state, state_manager, simulation, replay = unpack_parts(blob)
+        (self.accumulator,) = SNAPSHOT_STATE.unpack(state)
+        self.state_manager.restore(state_manager)
+        self.simulation.restore(simulation)
+        self.eel = self.simulation.eel
+        self.food = self.simulation.food
+
+        replay = Replay.from_bytes(replay)
+        self.seed = replay.seed
+        self.recorder = ReplayRecorder(replay.seed, replay.width, replay.height)
+        self.recorder.inputs = replay.inputs
+        self._needs_full_redraw = True
 
     def draw(self):
         """Dessiner tous les éléments du jeu"""
-        self.screen.fill(config.BG_COLOR)
-
-        # Toujours dessiner le jeu en arrière-plan
-        self._draw_game_elements()
+        state = self.state_manager.state
+        # Au-delà d'un tick depuis la frame précédente, les cases changées ne sont plus connues
+        ticks = self.simulation.ticks - self._drawn_tick
+        # L'arène est toujours redessinée en entier : presque toutes ses anguilles bougent à chaque tick
+        if (not config.DIRTY_RECTS or self.arena is not None or self._needs_full_redraw
+                or state != self._drawn_state or ticks not in (0, 1)):
+            self._draw_full()
+            self._drawn_state = state
+            self._needs_full_redraw = False
+        elif self.state_manager.is_waiting_start or self.state_manager.is_playing:
+            self._draw_dirty()
+        self._drawn_tick = self.simulation.ticks
+        # Menu et game over sont statiques : rien à redessiner
+
+    def _draw_full(self):
+        """Redessiner tout l'écran"""
+        # Toujours dessiner le jeu en arrière-plan (le calque de la grille contient le fond)
+        self._dirty_rects = self._draw_game_elements()
 
         # Dessiner les overlays selon l'état
         if self.state_manager.is_menu:
             self.menu.draw_main_menu()
         elif self.state_manager.is_game_over:
             final_score = self._calculate_final_score()
-            self.menu.draw_game_over(final_score)
+            self.menu.draw_game_over(final_score, self.state_manager.won, self.leaderboard)
         else:
-            self._draw_score()
+            self._dirty_rects.append(self._draw_score())
 
-        pygame.display.flip()
+        self._present(self._dirty_rects, full=True)
+
+    def _draw_dirty(self):
+        """Redessiner seulement les zones qui ont changé depuis la frame précédente"""
+        grid_bounds = self.grid.get_bounds()
+
+        # Effacer avec le calque de la grille les zones de la frame précédente et les cases changées au dernier tick
+        layer = self.grid.get_layer(self.screen.get_size(), config.CELL_SIZE)
+        erased = self._dirty_rects + self.eel.changed_rects(grid_bounds)
+        for rect in erased:
+            self.screen.blit(layer, rect, rect)
+
+        # Seuls les segments sous les zones effacées sont redessinés
+        rects = [self.food.draw(self.screen, grid_bounds)]
+        rects.extend(self.eel.draw_changed(self.screen, grid_bounds, erased))
+        rects.append(self._draw_score())
+
+        self._dirty_rects = rects
+        self._present(erased + rects)
+
+    def _present(self, rects, full=False):
+        """Afficher la frame : flip complet, ou seulement les zones données
+
+        L'overlay du profilage est dessiné juste avant ; sa zone est ajoutée à
+        celles à effacer à la frame suivante.
+        """
+        if self.profiler is None:
+            if full:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+
+        if self.profiler.hud_visible:
+            hud_rect = self.profiler.draw_hud(self.screen)
+            self._dirty_rects.append(hud_rect)
+            if not full:
+                rects.append(hud_rect)
+
+        start = time.perf_counter_ns()
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.profiler.add("present", time.perf_counter_ns() - start)
 
     def _draw_game_elements(self):
-        """Dessiner les éléments de jeu (grille, anguille, nourriture)"""
+        """Dessiner les éléments de jeu (grille, anguille, nourriture) ; renvoie les zones des sprites"""
         self.grid.draw(self.screen, config.CELL_SIZE)
         grid_bounds = self.grid.get_bounds()
-        self.food.draw(self.screen, grid_bounds)
-        self.eel.draw(self.screen, grid_bounds)
+        if self.arena is not None:
+            return self._draw_arena(grid_bounds)
+        rects = [self.food.draw(self.screen, grid_bounds)]
+        rects.extend(self.eel.draw(self.screen, grid_bounds))
+        return rects
+
+    def _draw_arena(self, grid_bounds):
+        """Dessiner la nourriture placée et toutes les anguilles de l'arène"""
+        rects = [food.draw(self.screen, grid_bounds) for food in self.arena.foods if food.x >= 0]
+        for eel in self.arena.eels.values():
+            rects.extend(eel.draw(self.screen, grid_bounds))
+        return rects
 
     def _draw_score(self):
-        """Dessiner le score en haut à gauche"""
-        if self.eel.segments_added < self.eel.initial_segments_to_add:
-            score = 0
+        """Dessiner le score en haut à gauche ; renvoie la zone dessinée"""
+        if self.arena is not None:
+            score = " | ".join(str(eel.score) for eel in self.human_eels)
         else:
-            score = len(self.eel.body) - self.eel.initial_segments_to_add
-        score_text = self.font.render(f"Score: {score}", True, "white")
-        self.screen.blit(score_text, (20, 20))
+            score = self.eel.score
+        score_text = self.text_cache.render(f"Score: {score}", True, "white")
+        return self.screen.blit(score_text, (20, 20))
 
     def _calculate_final_score(self):
-        """Calculer le score final"""
-        if self.eel.segments_added >= self.eel.initial_segments_to_add:
-            return len(self.eel.body) - self.eel.initial_segments_to_add
-        return 0
+        """Calculer le score final (dans l'arène, le meilleur des joueurs)"""
+        if self.arena is not None:
+            return max(eel.score for eel in self.human_eels)
+        return self.eel.score
 
     def _handle_mouse_click(self, pos):
         """Gérer les clics de souris selon l'état"""
@@ -148,31 +435,38 @@ class Game:
             action = self.menu.handle_click(pos)
             if action == "play":
                 self._start_new_game()
+            elif action == "speed_changed":
+                self._needs_full_redraw = True
         elif self.state_manager.is_game_over:
             action = self.menu.handle_game_over_click(pos)
             if action == "restart":
                 self._restart_game()
 
-    def _handle_keyboard_input(self, keys):
-        """Gérer les entrées clavier"""
-        directions = {
-            (pygame.K_z, pygame.K_UP): pygame.Vector2(0, -1),
-            (pygame.K_s, pygame.K_DOWN): pygame.Vector2(0, 1),
-            (pygame.K_q, pygame.K_LEFT): pygame.Vector2(-1, 0),
-            (pygame.K_d, pygame.K_RIGHT): pygame.Vector2(1, 0)
-        }
-
-        for key_pair, direction in directions.items():
-            if any(keys[key] for key in key_pair):
-                if self.state_manager.is_waiting_start:
-                    # Ne pas démarrer vers la gauche
-                    if direction.x == -1:
-                        continue
-                    self.state_manager.begin_playing()
-                    self.eel.start_movement(direction)
-                elif self.state_manager.is_playing:
-                    self.eel.set_pending_direction(direction)
-                break
+    def _handle_key_down(self, key):
+        """Gérer l'appui sur une touche de direction"""
+        direction = KEY_DIRECTIONS.get(key)
+        if direction is None:
+            return
+
+        if self.arena is not None:
+            self._handle_arena_key(key, direction)
+        elif self.state_manager.is_waiting_start:
+            # Ne pas démarrer vers la gauche
+            if direction == LEFT:
+                return
+            self.state_manager.begin_playing()
+            self.eel.start_movement(direction)
+            self.recorder.record(self.simulation.ticks, direction)
+        elif self.state_manager.is_playing:
+            self.eel.queue_direction(direction)
+
+    def _handle_arena_key(self, key, direction):
+        """Diriger l'anguille du joueur de la touche ; la première touche lance la partie"""
+        index = 1 if len(self.human_ids) > 1 and key in SECOND_PLAYER_KEYS else 0
+        if self.state_manager.is_waiting_start:
+            self.state_manager.begin_playing()
+        if self.state_manager.is_playing:
+            self.arena.queue_direction(self.human_ids[index], direction)
 
     def _start_new_game(self):
         """Démarrer une nouvelle partie"""
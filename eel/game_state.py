@@ -1,3 +1,4 @@
+import struct
 from enum import Enum
 
 
@@ -9,12 +10,18 @@ class GameState(Enum):
     GAME_OVER = "game_over"
 
 
+# État du gestionnaire dans un instantané : indice de l'état, partie commencée, victoire
+SNAPSHOT_STATE = struct.Struct("<B??")
+STATES = tuple(GameState)
+
+
 class GameStateManager:
     """Gestionnaire d'états du jeu"""
 
     def __init__(self):
         self._state = GameState.MENU
         self._game_started = False
+        self._won = False
 
     @property
     def state(self):
@@ -40,6 +47,19 @@ class GameStateManager:
     def game_started(self):
         return self._game_started
 
+    @property
+    def won(self):
+        return self._won
+
+    def snapshot(self):
+        """Instantané en octets de l'état"""
+        return SNAPSHOT_STATE.pack(STATES.index(self._state), self._game_started, self._won)
+
+    def restore(self, blob):
+        """Remettre le gestionnaire dans l'état d'un instantané"""
+        index, self._game_started, self._won = SNAPSHOT_STATE.unpack(blob)
+        self._state = STATES[index]
+
     def transition_to(self, new_state):
         """Changer d'état"""
         self._state = new_state
@@ -48,6 +68,7 @@ class GameStateManager:
         """Démarrer le jeu"""
         self._state = GameState.WAITING_START
         self._game_started = False
+        self._won = False
 
     def begin_playing(self):
         """Commencer à jouer"""
@@ -58,10 +79,16 @@ class GameStateManager:
         """Terminer le jeu"""
         self._state = GameState.GAME_OVER
 
+    def win(self):
+        """Terminer le jeu sur une victoire (grille remplie)"""
+        self._state = GameState.GAME_OVER
+        self._won = True
+
     def restart(self):
         """Redémarrer"""
         self._state = GameState.MENU
         self._game_started = False
+        self._won = False
 
     def should_update_game(self):
         """Le jeu doit-il être mis à jour ?"""
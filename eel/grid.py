@@ -2,6 +2,21 @@ import pygame
 from . import config
 
 
+def fit_board(width, height, margin=(40, 80)):
+    """Régler la taille de grille et réduire la taille des cases pour qu'elle tienne dans la fenêtre
+
+    Les rayons des disques suivent la taille des cases. Modifie config : à
+    appeler avant de créer la grille et de dessiner.
+    """
+    cell_size = min(config.CELL_SIZE, (config.SCREEN_WIDTH - margin[0]) // width,
+                    (config.SCREEN_HEIGHT - margin[1]) // height)
+    scale = cell_size / config.CELL_SIZE
+    config.GRID_WIDTH, config.GRID_HEIGHT = width, height
+    config.CELL_SIZE = cell_size
+    config.PLAYER_RADIUS = max(1, int(config.PLAYER_RADIUS * scale))
+    config.FOOD_RADIUS = max(1, int(config.FOOD_RADIUS * scale))
+
+
 class Grid:
     """Classe pour gérer l'affichage de la grille"""
 
@@ -10,10 +25,14 @@ class Grid:
         self.bounds = None
         self._create_bounds()
 
+        # Calque statique (fond, lignes, bord) reconstruit seulement si nécessaire
+        self.layer = None
+        self._layer_key = None
+
     def _create_bounds(self):
         """Créer les limites de la grille"""
-        rect_width = 605
-        rect_height = 605
+        rect_width = config.GRID_WIDTH * config.CELL_SIZE
+        rect_height = config.GRID_HEIGHT * config.CELL_SIZE
 
         self.bounds = pygame.Rect(0, 0, rect_width - 1, rect_height - 1)
         self.bounds.center = self.screen_center
@@ -23,20 +42,42 @@ class Grid:
         return self.bounds
 
     def draw(self, screen, cell_size):
-        """Dessiner la grille"""
+        """Dessiner la grille à partir du calque pré-rendu"""
+        self.get_layer(screen.get_size(), cell_size)
+        screen.blit(self.layer, (0, 0))
+
+    def get_layer(self, size, cell_size):
+        """Obtenir le calque statique, reconstruit si la taille ou les couleurs changent"""
+        layer_key = (
+            tuple(size), cell_size, tuple(self.bounds),
+            config.BG_COLOR, config.GRID_LINE_COLOR, config.GRID_BORDER_COLOR
+        )
+        if layer_key != self._layer_key:
+            self.layer = self._build_layer(size, cell_size)
+            self._layer_key = layer_key
+        return self.layer
+
+    def _build_layer(self, size, cell_size):
+        """Pré-rendre le fond, les lignes et le bord sur une surface hors écran"""
+        layer = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.fill(config.BG_COLOR)
+
         # Lignes verticales
         for x in range(self.bounds.left, self.bounds.right + 1, cell_size):
             pygame.draw.line(
-                screen, "darkgrey",
+                layer, config.GRID_LINE_COLOR,
                 (x, self.bounds.top), (x, self.bounds.bottom), 1
             )
 
         # Lignes horizontales
         for y in range(self.bounds.top, self.bounds.bottom + 1, cell_size):
             pygame.draw.line(
-                screen, "darkgrey",
+                layer, config.GRID_LINE_COLOR,
                 (self.bounds.left, y), (self.bounds.right, y), 1
             )
 
         # Bord rouge
-        pygame.draw.rect(screen, "red", self.bounds, 3)
\ No newline at end of file
+        pygame.draw.rect(layer, config.GRID_BORDER_COLOR, self.bounds, 3)
+        return layer
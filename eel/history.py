@@ -0,0 +1,123 @@
+import struct
+from array import array
+
+
+# En-tête d'un instantané : capacité, nombre de positions
+SNAPSHOT_HEADER = struct.Struct("<II")
+
+
+class PositionHistory:
+    """Historique circulaire de cases (x, y), sans allocation par ajout
+
+    capacity est le nombre de positions gardées ; le tampon alloué peut être
+    plus grand. Quand la capacité le dépasse, il double : faire grandir
+    l'historique d'une position à la fois coûte O(1) amorti.
+    """
+
+    __slots__ = ("capacity", "_xs", "_ys", "_size", "_start", "_count")
+
+    def __init__(self, capacity=0):
+        self.capacity = capacity
+        self._xs = array('i', bytes(4 * capacity))
+        self._ys = array('i', bytes(4 * capacity))
+        self._size = capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """Obtenir une position (x, y) ; les indices négatifs partent du plus récent"""
+        slot = self._slot(index)
+        return (self._xs[slot], self._ys[slot])
+
+    def append(self, x, y):
+        """Ajouter une position, en écrasant la plus ancienne si le tampon est plein"""
+        if self.capacity == 0:
+            return
+
+        slot = (self._start + self._count) % self._size
+        self._xs[slot] = x
+        self._ys[slot] = y
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self._size
+
+    def x_at(self, index):
+        """Coordonnée x de la position à l'indice donné"""
+        return self._xs[self._slot(index)]
+
+    def y_at(self, index):
+        """Coordonnée y de la position à l'indice donné"""
+        return self._ys[self._slot(index)]
+
+    def ordered(self):
+        """Copies (xs, ys) des positions, de la plus ancienne à la plus récente (copies en C, sans boucle Python)"""
+        xs = (self._xs[self._start:] + self._xs[:self._start])[:self._count]
+        ys = (self._ys[self._start:] + self._ys[:self._start])[:self._count]
+        return xs, ys
+
+    def grow(self):
+        """Garder une position de plus (sans allocation tant que le tampon a de la place)"""
+        self.resize(self.capacity + 1)
+
+    def resize(self, capacity):
+        """Changer la capacité en conservant les positions les plus récentes"""
+        if capacity < self._count:
+            # Oublier les plus anciennes : le tampon reste en place
+            if self._size:
+                self._start = (self._start + self._count - capacity) % self._size
+            self._count = capacity
+        if capacity > self._size:
+            # Tampon plein : le doubler, positions remises dans l'ordre
+            size = max(capacity, 2 * self._size)
+            padding = array('i', bytes(4 * (size - self._count)))
+            xs, ys = self.ordered()
+            self._xs = xs + padding
+            self._ys = ys + padding
+            self._size = size
+            self._start = 0
+        self.capacity = capacity
+
+    def snapshot(self):
+        """Instantané en octets : en-tête puis les x et les y, du plus ancien au plus récent"""
+        xs, ys = self.ordered()
+        return SNAPSHOT_HEADER.pack(self.capacity, self._count) + xs.tobytes() + ys.tobytes()
+
+    def restore(self, data):
+        """Remettre l'historique dans l'état d'un instantané"""
+        capacity, count = SNAPSHOT_HEADER.unpack_from(data)
+        offset = SNAPSHOT_HEADER.size
+        padding = bytes(4 * (capacity - count))
+        self._xs = array('i')
+        self._xs.frombytes(data[offset:offset + 4 * count])
+        self._xs.frombytes(padding)
+        self._ys = array('i')
+        self._ys.frombytes(data[offset + 4 * count:offset + 8 * count])
+        self._ys.frombytes(padding)
+        self._size = capacity
+        self._start = 0
+        self._count = count
+        self.capacity = capacity
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Créer un historique depuis un instantané"""
+        history = cls.__new__(cls)
+        history.restore(data)
+        return history
+
+    def clear(self):
+        """Vider l'historique"""
+        self._start = 0
+        self._count = 0
+
+    def _slot(self, index):
+        """Convertir un indice logique en case du tampon"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("index hors de l'historique")
+        return (self._start + index) % self._size
@@ -1,13 +1,17 @@
 import pygame
 from . import config
+from .text_cache import TextCache
 
 
 class Menu:
     """Classe pour gérer le menu principal et game over"""
 
-    def __init__(self, screen, font):
+    def __init__(self, screen, font, text_cache=None, scores=None):
         self.screen = screen
         self.font = font
+        self.text_cache = text_cache if text_cache is not None else TextCache(font)
+        # Magasin des scores (ScoreStore) pour le meilleur score de chaque vitesse, ou None
+        self.scores = scores
         self.selected_speed = config.SPEED_NORMAL
 
         # Boutons du menu
@@ -20,54 +24,101 @@ class Menu:
         self.speed_fast_rect = pygame.Rect(center_x + 80, center_y - 50, 130, 60)
         self.restart_button_rect = pygame.Rect(center_x - 100, center_y + 50, 200, 50)
 
+        # Dernière image composée
+        self._frame = None
+        self._frame_key = None
+
+        # Dernier fond semi-transparent, gardé tant que l'opacité et la taille de l'écran ne changent pas
+        self._overlay = None
+        self._overlay_key = None
+
     def draw_overlay(self, alpha=160):
         """Dessiner fond semi-transparent"""
-        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        overlay.set_alpha(alpha)
-        overlay.fill("black")
-        self.screen.blit(overlay, (0, 0))
+        overlay_key = (alpha, self.screen.get_size())
+        if overlay_key != self._overlay_key:
+            self._overlay = self._new_frame(alpha)
+            self._overlay_key = overlay_key
+        self.screen.blit(self._overlay, (0, 0))
 
     def draw_main_menu(self):
         """Dessiner le menu principal"""
-        self.draw_overlay()
+        # Image composée reconstruite seulement si la vitesse ou la taille de l'écran change
+        best_score = self.scores.best_score(self.selected_speed) if self.scores is not None else None
+        frame_key = ("menu", self.selected_speed, best_score, self.screen.get_size())
+        if frame_key != self._frame_key:
+            self._frame = self._build_main_menu(best_score)
+            self._frame_key = frame_key
+        self.screen.blit(self._frame, (0, 0))
+
+    def draw_game_over(self, final_score, won=False, leaderboard=()):
+        """Dessiner l'écran de game over (leaderboard : meilleurs scores à cette vitesse)"""
+        frame_key = ("game_over", final_score, won, tuple(leaderboard), self.screen.get_size())
+        if frame_key != self._frame_key:
+            self._frame = self._build_game_over(final_score, won, leaderboard)
+            self._frame_key = frame_key
+        self.screen.blit(self._frame, (0, 0))
+
+    def _new_frame(self, alpha):
+        """Créer une image transparente couvrant l'écran, avec le fond semi-transparent"""
+        frame = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        frame.fill((0, 0, 0, alpha))
+        return frame
+
+    def _build_main_menu(self, best_score=None):
+        """Composer l'image du menu principal (fond, titre, boutons, meilleur score)"""
+        frame = self._new_frame(160)
 
         # Titre
-        title_text = self.font.render("THE EEL", True, "white")
+        title_text = self.text_cache.render("THE EEL", True, "white")
         title_rect = title_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 - 150))
-        self.screen.blit(title_text, title_rect)
+        frame.blit(title_text, title_rect)
 
         # Label vitesse
-        speed_label = self.font.render("Speed:", True, "white")
+        speed_label = self.text_cache.render("Speed:", True, "white")
         speed_label_rect = speed_label.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 - 100))
-        self.screen.blit(speed_label, speed_label_rect)
+        frame.blit(speed_label, speed_label_rect)
 
         # Boutons de vitesse
-        self._draw_speed_buttons()
+        self._draw_speed_buttons(frame)
+
+        # Meilleur score à la vitesse choisie
+        if best_score is not None:
+            best_text = self.text_cache.render(f"Best: {best_score}", True, "white")
+            best_rect = best_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 50))
+            frame.blit(best_text, best_rect)
 
         # Bouton PLAY
-        self._draw_button(self.play_button_rect, "PLAY", "darkgreen", "white", 3)
+        self._draw_button(frame, self.play_button_rect, "PLAY", "darkgreen", "white", 3)
+        return frame
 
-    def draw_game_over(self, final_score):
-        """Dessiner l'écran de game over"""
-        self.draw_overlay(128)
+    def _build_game_over(self, final_score, won, leaderboard=()):
+        """Composer l'image de game over (fond, textes, bouton)"""
+        frame = self._new_frame(128)
 
         center_x = config.SCREEN_WIDTH // 2
         center_y = config.SCREEN_HEIGHT // 2
 
         # Texte Game Over
-        game_over_text = self.font.render("GAME OVER", True, "white")
+        game_over_text = self.text_cache.render("YOU WIN" if won else "GAME OVER", True, "white")
         game_over_rect = game_over_text.get_rect(center=(center_x, center_y - 50))
-        self.screen.blit(game_over_text, game_over_rect)
+        frame.blit(game_over_text, game_over_rect)
 
         # Score final
-        score_text = self.font.render(f"Final Score: {final_score}", True, "white")
+        score_text = self.text_cache.render(f"Final Score: {final_score}", True, "white")
         score_rect = score_text.get_rect(center=(center_x, center_y - 10))
-        self.screen.blit(score_text, score_rect)
+        frame.blit(score_text, score_rect)
+
+        # Classement à cette vitesse
+        if leaderboard:
+            top_text = self.text_cache.render("Top: " + "  ".join(str(score) for score in leaderboard), True, "white")
+            top_rect = top_text.get_rect(center=(center_x, center_y + 20))
+            frame.blit(top_text, top_rect)
 
         # Bouton Restart
-        self._draw_button(self.restart_button_rect, "RESTART", "darkgreen", "white", 2)
+        self._draw_button(frame, self.restart_button_rect, "RESTART", "darkgreen", "white", 2)
+        return frame
 
-    def _draw_speed_buttons(self):
+    def _draw_speed_buttons(self, surface):
         """Dessiner les boutons de sélection de vitesse"""
         speeds = [
             (self.speed_slow_rect, "SLOW", config.SPEED_SLOW),
@@ -80,16 +131,16 @@ class Menu:
             bg_color = "green" if is_selected else "darkgray"
             border_color = "white" if is_selected else "gray"
 
-            self._draw_button(rect, text, bg_color, border_color, 2)
+            self._draw_button(surface, rect, text, bg_color, border_color, 2)
 
-    def _draw_button(self, rect, text, bg_color, border_color, border_width):
+    def _draw_button(self, surface, rect, text, bg_color, border_color, border_width):
         """Dessiner un bouton générique"""
-        pygame.draw.rect(self.screen, bg_color, rect)
-        pygame.draw.rect(self.screen, border_color, rect, border_width)
+        pygame.draw.rect(surface, bg_color, rect)
+        pygame.draw.rect(surface, border_color, rect, border_width)
 
-        button_text = self.font.render(text, True, "white")
+        button_text = self.text_cache.render(text, True, "white")
         text_rect = button_text.get_rect(center=rect.center)
-        self.screen.blit(button_text, text_rect)
+        surface.blit(button_text, text_rect)
 
     def handle_click(self, pos):
         """Gérer les clics dans le menu principal"""
@@ -0,0 +1,138 @@
+import struct
+from array import array
+from . import config
+
+
+# Tableau des indices 0..n-1 par taille de grille, copié à chaque clear()
+_RANGES = {}
+
+# En-tête d'un instantané : largeur, hauteur, nombre de cases libres
+SNAPSHOT_HEADER = struct.Struct("<iiI")
+
+
+class OccupancyGrid:
+    """Compteur d'occupation par case de la grille, mis à jour de façon incrémentale
+
+    Les cases libres sont aussi gardées dans une liste (avec la position de chaque
+    case dans cette liste) pour tirer une case libre au hasard en temps constant.
+    Les cases sont des indices y * largeur + x, rangés dans des tableaux compacts.
+    """
+
+    __slots__ = ("width", "height", "_counts", "_free", "_free_index")
+
+    def __init__(self, width=None, height=None):
+        self.width = config.GRID_WIDTH if width is None else width
+        self.height = config.GRID_HEIGHT if height is None else height
+        self.clear()
+
+    def contains(self, x, y):
+        """La case est-elle dans la grille ?"""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def add(self, x, y):
+        """Marquer une case comme occupée (ignorée hors grille)"""
+        if self.contains(x, y):
+            cell = y * self.width + x
+            self._counts[cell] += 1
+            if self._counts[cell] == 1:
+                self._remove_free(cell)
+
+    def remove(self, x, y):
+        """Libérer une case (ignorée hors grille)"""
+        if self.contains(x, y):
+            cell = y * self.width + x
+            self._counts[cell] -= 1
+            if self._counts[cell] == 0:
+                self._add_free(cell)
+
+    def move(self, old_x, old_y, new_x, new_y):
+        """Déplacer une occupation d'une case à une autre"""
+        if old_x != new_x or old_y != new_y:
+            self.remove(old_x, old_y)
+            self.add(new_x, new_y)
+
+    def is_occupied(self, x, y):
+        """La case est-elle occupée ?"""
+        return self.contains(x, y) and self._counts[y * self.width + x] > 0
+
+    def is_free(self, x, y):
+        """La case est-elle libre et dans la grille ?"""
+        return self.contains(x, y) and self._counts[y * self.width + x] == 0
+
+    def free_count(self):
+        """Nombre de cases libres"""
+        return len(self._free)
+
+    def random_free_cell(self, rng, exclude=None):
+        """Tirer une case libre au hasard, sauf exclude ; None si la grille est pleine"""
+        count = len(self._free)
+        excluded_index = -1
+        if exclude is not None and self.is_free(*exclude):
+            excluded_index = self._free_index[exclude[1] * self.width + exclude[0]]
+            count -= 1
+
+        if count <= 0:
+            return None
+
+        # Sauter la case exclue sans reconstruire de liste
+        index = rng.randrange(count)
+        if 0 <= excluded_index <= index:
+            index += 1
+
+        cell = self._free[index]
+        return (cell % self.width, cell // self.width)
+
+    def clear(self):
+        """Vider la grille"""
+        area = self.width * self.height
+        self._counts = bytearray(area)
+        cells = _RANGES.get(area)
+        if cells is None:
+            cells = _RANGES[area] = array('i', range(area))
+        self._free = cells[:]
+        self._free_index = cells[:]
+
+    def snapshot(self):
+        """Instantané en octets : compteurs, liste des cases libres (dans son ordre) et positions dans la liste
+
+        L'ordre de la liste des cases libres est conservé : une copie tire les
+        mêmes cases que l'original avec le même générateur aléatoire.
+        """
+        return (SNAPSHOT_HEADER.pack(self.width, self.height, len(self._free))
+                + self._counts + self._free.tobytes() + self._free_index.tobytes())
+
+    def restore(self, data):
+        """Remettre la grille dans l'état d'un instantané"""
+        width, height, free_count = SNAPSHOT_HEADER.unpack_from(data)
+        area = width * height
+        offset = SNAPSHOT_HEADER.size
+        self.width = width
+        self.height = height
+        self._counts = bytearray(data[offset:offset + area])
+        offset += area
+        self._free = array('i')
+        self._free.frombytes(data[offset:offset + 4 * free_count])
+        offset += 4 * free_count
+        self._free_index = array('i')
+        self._free_index.frombytes(data[offset:offset + 4 * area])
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """Créer une grille depuis un instantané"""
+        grid = cls.__new__(cls)
+        grid.restore(data)
+        return grid
+
+    def _add_free(self, cell):
+        """Ajouter une case à la liste des cases libres"""
+        self._free_index[cell] = len(self._free)
+        self._free.append(cell)
+
+    def _remove_free(self, cell):
+        """Retirer une case de la liste des cases libres (échange avec la dernière)"""
+        index = self._free_index[cell]
+        last = self._free.pop()
+        if last != cell:
+            self._free[index] = last
+            self._free_index[last] = index
+        self._free_index[cell] = -1
@@ -0,0 +1,136 @@
+import time
+from array import array
+
+
+# Phases mesurées à chaque frame ("frame" : durée totale, sans l'attente de clock.tick)
+PHASES = ("events", "update", "draw", "present", "frame")
+
+# Frames entre deux mises à jour du texte de l'overlay
+HUD_REFRESH = 30
+
+
+class FrameProfiler:
+    """Durées des phases de chaque frame (perf_counter_ns) dans un tampon circulaire de taille fixe
+
+    "draw" ne compte pas la présentation à l'écran (flip ou update), mesurée à part dans "present".
+    """
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self._samples = {phase: array('q', bytes(8 * capacity)) for phase in PHASES}
+        self._current = dict.fromkeys(PHASES, 0)
+        self._index = 0
+        self._count = 0
+        self._frame_start = 0
+        self.frames = 0
+
+        # Overlay
+        self.hud_visible = False
+        self._hud = None
+        self._font = None
+
+    def __len__(self):
+        return self._count
+
+    def begin_frame(self):
+        """Commencer la mesure d'une frame"""
+        for phase in PHASES:
+            self._current[phase] = 0
+        self._frame_start = time.perf_counter_ns()
+
+    def measure(self, phase, func):
+        """Appeler func en ajoutant sa durée à la phase"""
+        start = time.perf_counter_ns()
+        result = func()
+        self._current[phase] += time.perf_counter_ns() - start
+        return result
+
+    def add(self, phase, elapsed):
+        """Ajouter une durée (ns) à une phase de la frame en cours"""
+        self._current[phase] += elapsed
+
+    def end_frame(self):
+        """Terminer la frame et l'écrire dans le tampon"""
+        current = self._current
+        current["frame"] = time.perf_counter_ns() - self._frame_start
+        current["draw"] -= current["present"]
+
+        index = self._index
+        for phase in PHASES:
+            self._samples[phase][index] = current[phase]
+        self._index = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.frames += 1
+
+    def samples(self, phase):
+        """Durées (ns) d'une phase, de la frame la plus ancienne à la plus récente"""
+        values = self._samples[phase]
+        if self._count < self.capacity:
+            return values[:self._count]
+        return values[self._index:] + values[:self._index]
+
+    def percentiles(self, phase, fractions=(0.5, 0.95, 0.99)):
+        """Percentiles (plus proche rang, en ns) d'une phase sur les frames du tampon"""
+        values = sorted(self.samples(phase))
+        if not values:
+            return [0] * len(fractions)
+        last = len(values) - 1
+        return [values[min(last, int(fraction * len(values)))] for fraction in fractions]
+
+    def summary(self):
+        """p50/p95/p99 de chaque phase, en millisecondes"""
+        summary = {}
+        for phase in PHASES:
+            p50, p95, p99 = self.percentiles(phase)
+            summary[phase] = {"p50": p50 / 1e6, "p95": p95 / 1e6, "p99": p99 / 1e6}
+        return summary
+
+    def toggle_hud(self):
+        """Afficher ou masquer l'overlay"""
+        self.hud_visible = not self.hud_visible
+        self._hud = None
+
+    def draw_hud(self, screen):
+        """Dessiner l'overlay des percentiles en haut à droite ; renvoie la zone dessinée"""
+        import pygame  # pygame n'est nécessaire que pour l'affichage
+
+        if self._font is None:
+            self._font = pygame.font.Font(None, 24)
+        font = self._font
+
+        # Le texte n'est recalculé que toutes les HUD_REFRESH frames
+        if self._hud is None or self.frames % HUD_REFRESH == 0:
+            lines = ["phase     p50    p95    p99 (ms)"]
+            for phase, values in self.summary().items():
+                lines.append(f"{phase:<8}{values['p50']:>6.2f} {values['p95']:>6.2f} {values['p99']:>6.2f}")
+            surfaces = [font.render(line, True, "white") for line in lines]
+
+            line_height = font.get_linesize()
+            width = max(surface.get_width() for surface in surfaces) + 16
+            self._hud = pygame.Surface((width, line_height * len(lines) + 16), pygame.SRCALPHA)
+            self._hud.fill((0, 0, 0, 180))
+            for i, surface in enumerate(surfaces):
+                self._hud.blit(surface, (8, 8 + i * line_height))
+
+        return screen.blit(self._hud, (screen.get_width() - self._hud.get_width() - 20, 20))
+
+    def dump(self, path):
+        """Écrire la trace des frames du tampon (.csv, sinon JSON avec les percentiles)"""
+        import csv  # importés seulement pour écrire la trace, pas au démarrage du jeu
+        import json
+
+        columns = [self.samples(phase) for phase in PHASES]
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow([f"{phase}_ns" for phase in PHASES])
+                writer.writerows(zip(*columns))
+            return
+
+        trace = {
+            "frames": self.frames,
+            "summary_ms": self.summary(),
+            "samples_ns": {phase: list(values) for phase, values in zip(PHASES, columns)},
+        }
+        with open(path, "w") as file:
+            json.dump(trace, file, indent=2)
@@ -0,0 +1,130 @@
+import struct
+from array import array
+
+
+# Trame : longueur du contenu, type du message
+FRAME = struct.Struct("<IB")
+
+# Messages du serveur
+WELCOME = 1   # identifiant du joueur (0 : spectateur), taille de grille, intervalle des ticks
+STATE = 2     # état complet de l'arène, envoyé à l'arrivée
+TICK = 3      # changements d'un tick
+
+# Messages du client
+DIRECTION = 16  # code de direction
+JOIN = 17       # réapparaître après une mort
+
+WELCOME_BODY = struct.Struct("<IHHd")
+STATE_HEADER = struct.Struct("<IH")   # tick, nombre d'anguilles
+EEL_HEADER = struct.Struct("<II")     # identifiant, nombre de cases
+COUNT = struct.Struct("<H")
+TICK_HEADER = struct.Struct("<I")
+FOOD = struct.Struct("<Hhh")           # indice, x, y
+JOINED = struct.Struct("<Ihh")         # identifiant, case de la tête
+
+# Octet de déplacement : code de direction, et ce bit si la queue a quitté sa case
+TAIL_DROPPED = 4
+
+
+def frame(kind, body=b""):
+    """Message prêt à envoyer"""
+    return FRAME.pack(len(body), kind) + body
+
+
+async def read_message(reader):
+    """Lire un message d'un asyncio.StreamReader ; renvoie (type, contenu)"""
+    length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    body = await reader.readexactly(length) if length else b""
+    return kind, body
+
+
+def encode_welcome(player_id, width, height, tick_interval):
+    return frame(WELCOME, WELCOME_BODY.pack(player_id or 0, width, height, tick_interval))
+
+
+def decode_welcome(body):
+    """Renvoie (identifiant ou None, largeur, hauteur, intervalle des ticks)"""
+    player_id, width, height, tick_interval = WELCOME_BODY.unpack(body)
+    return player_id or None, width, height, tick_interval
+
+
+def encode_state(arena):
+    """État complet : chaque anguille (cases de la queue à la tête), puis les nourritures
+
+    Les anguilles sont dans l'ordre de l'arène : les déplacements des ticks
+    suivants sont envoyés dans cet ordre, sans identifiant.
+    """
+    data = bytearray(STATE_HEADER.pack(arena.ticks, len(arena.eels)))
+    for player_id in arena.eels:
+        cells = arena.player_cells(player_id)
+        data += EEL_HEADER.pack(player_id, len(cells))
+        data += array('h', [coordinate for cell in cells for coordinate in cell]).tobytes()
+    data += COUNT.pack(len(arena.foods))
+    for index, food in enumerate(arena.foods):
+        data += FOOD.pack(index, food.x, food.y)
+    return frame(STATE, bytes(data))
+
+
+def decode_state(body):
+    """Renvoie (tick, [(identifiant, cases)], [(indice, x, y)])"""
+    ticks, count = STATE_HEADER.unpack_from(body)
+    offset = STATE_HEADER.size
+    eels = []
+    for _ in range(count):
+        player_id, length = EEL_HEADER.unpack_from(body, offset)
+        offset += EEL_HEADER.size
+        coordinates = array('h')
+        coordinates.frombytes(body[offset:offset + 4 * length])
+        offset += 4 * length
+        eels.append((player_id, list(zip(coordinates[::2], coordinates[1::2]))))
+    foods, offset = _unpack_list(FOOD, body, offset)
+    return ticks, eels, foods
+
+
+def encode_tick(ticks, deaths, moves, food_changes, joins):
+    """Changements d'un tick, à appliquer dans l'ordre : morts, déplacements, nourriture, arrivées
+
+    Un déplacement tient en un octet (code de direction | TAIL_DROPPED), dans
+    l'ordre des anguilles restantes.
+    """
+    data = bytearray(TICK_HEADER.pack(ticks))
+    data += COUNT.pack(len(deaths))
+    data += array('I', deaths).tobytes()
+    data += COUNT.pack(len(moves))
+    data += bytes(code | TAIL_DROPPED if dropped else code for _, code, dropped in moves)
+    data += COUNT.pack(len(food_changes))
+    for change in food_changes:
+        data += FOOD.pack(*change)
+    data += COUNT.pack(len(joins))
+    for join in joins:
+        data += JOINED.pack(*join)
+    return frame(TICK, bytes(data))
+
+
+def decode_tick(body):
+    """Renvoie (tick, morts, octets de déplacement, nourriture, arrivées)"""
+    (ticks,) = TICK_HEADER.unpack_from(body)
+    offset = TICK_HEADER.size
+
+    (count,) = COUNT.unpack_from(body, offset)
+    offset += COUNT.size
+    deaths = array('I')
+    deaths.frombytes(body[offset:offset + 4 * count])
+    offset += 4 * count
+
+    (count,) = COUNT.unpack_from(body, offset)
+    offset += COUNT.size
+    moves = body[offset:offset + count]
+    offset += count
+
+    food_changes, offset = _unpack_list(FOOD, body, offset)
+    joins, offset = _unpack_list(JOINED, body, offset)
+    return ticks, list(deaths), moves, food_changes, joins
+
+
+def _unpack_list(item, body, offset):
+    """Lire un nombre d'éléments puis les éléments ; renvoie (liste, nouvel offset)"""
+    (count,) = COUNT.unpack_from(body, offset)
+    offset += COUNT.size
+    items = list(item.iter_unpack(body[offset:offset + item.size * count]))
+    return items, offset + item.size * count
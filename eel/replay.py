@@ -0,0 +1,119 @@
+import struct
+import sys
+import time
+from .eel import DIRECTIONS
+from .simulation import Simulation
+
+
+# En-tête : magie, version, largeur, hauteur, graine, dernier tick, nombre d'entrées
+MAGIC = b"EELR"
+VERSION = 1
+HEADER = struct.Struct("<4sBHHQII")
+
+
+def _write_varint(buffer, value):
+    """Écrire un entier positif en varint (7 bits par octet)"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, offset):
+    """Lire un varint ; renvoie (valeur, nouvel offset)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayRecorder:
+    """Enregistre la graine et les changements de direction d'une partie"""
+
+    def __init__(self, seed, width, height):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.inputs = []
+
+    def record(self, tick, direction):
+        """Noter une direction donnée avant le tick suivant"""
+        self.inputs.append((tick, DIRECTIONS.index((int(direction[0]), int(direction[1])))))
+
+    def to_bytes(self, end_tick):
+        """Encoder le replay : chaque entrée est un varint (écart de ticks << 2 | direction)"""
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.width, self.height, self.seed, end_tick, len(self.inputs)))
+        last_tick = 0
+        for tick, code in self.inputs:
+            _write_varint(data, ((tick - last_tick) << 2) | code)
+            last_tick = tick
+        return bytes(data)
+
+    def save(self, path, end_tick):
+        """Écrire le replay dans un fichier"""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes(end_tick))
+
+
+class Replay:
+    """Replay décodé : graine, taille de grille, dernier tick et entrées (tick, code de direction)"""
+
+    def __init__(self, seed, width, height, end_tick, inputs):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.end_tick = end_tick
+        self.inputs = inputs
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Décoder un replay"""
+        magic, version, width, height, seed, end_tick, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("fichier de replay invalide")
+
+        inputs = []
+        offset = HEADER.size
+        tick = 0
+        for _ in range(count):
+            value, offset = _read_varint(data, offset)
+            tick += value >> 2
+            inputs.append((tick, value & 3))
+        return cls(seed, width, height, end_tick, inputs)
+
+    @classmethod
+    def load(cls, path):
+        """Lire un replay depuis un fichier"""
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def play(self):
+        """Rejouer la partie sans affichage, aussi vite que possible ; renvoie la simulation finale"""
+        simulation = Simulation(self.width, self.height, seed=self.seed)
+        inputs = self.inputs
+        index = 0
+        while simulation.alive and simulation.ticks < self.end_tick:
+            # Appliquer les directions données avant ce tick
+            while index < len(inputs) and inputs[index][0] == simulation.ticks:
+                simulation.eel.set_pending_direction(DIRECTIONS[inputs[index][1]])
+                index += 1
+            simulation.step()
+        return simulation
+
+
+def main(paths):
+    """Vérifier des replays et afficher leur score"""
+    for path in paths:
+        start = time.perf_counter()
+        simulation = Replay.load(path).play()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{path}: score {simulation.score}, {simulation.ticks} ticks, {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
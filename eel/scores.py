@@ -0,0 +1,195 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    score INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    speed REAL NOT NULL,
+    seed INTEGER NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC, id);
+CREATE INDEX IF NOT EXISTS games_by_speed ON games (speed, score DESC, id);
+"""
+
+INSERT = ("INSERT INTO games (finished_at, score, length, duration, speed, seed, won) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+COLUMNS = "score, length, duration, speed, seed, won"
+
+# Parties écrites au plus par transaction (les imports en masse se regroupent en gros lots)
+BATCH_SIZE = 16384
+
+# Cache de pages du thread d'écriture, en Kio (valeur négative pour SQLite) : les index restent en mémoire
+WRITER_CACHE_KIB = 16 * 1024
+
+# Meilleures parties gardées en mémoire, toutes vitesses et pour chaque vitesse
+CACHED_TOP = 10
+
+# Fin du thread d'écriture
+_STOP = object()
+
+
+class GameResult:
+    """Résultat d'une partie lu dans le magasin"""
+
+    __slots__ = ("score", "length", "duration", "speed", "seed", "won")
+
+    def __init__(self, score, length, duration, speed, seed, won):
+        self.score = score
+        self.length = length
+        self.duration = duration
+        self.speed = speed
+        self.seed = seed
+        self.won = bool(won)
+
+    def __repr__(self):
+        return f"GameResult(score={self.score}, length={self.length}, speed={self.speed}, seed={self.seed})"
+
+
+class ScoreStore:
+    """Scores et statistiques des parties dans une base SQLite
+
+    record() ne fait que mettre le résultat en file : un thread écrit les
+    parties par lots, une transaction par lot, sans jamais bloquer la
+    boucle de jeu. La base est en mode WAL : les lectures ne sont pas
+    bloquées par les écritures. Les meilleures parties (cached, toutes
+    vitesses et pour chaque vitesse) sont lues une fois à l'ouverture, par
+    les index, puis tenues à jour par record() : les classements et le meilleur
+    score, demandés à chaque frame, ne touchent jamais SQLite.
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE, cached=CACHED_TOP):
+        self.path = path
+        self.batch_size = batch_size
+        self.cached = cached
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Connexion de lecture (thread du jeu) ; le thread d'écriture a la sienne
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+
+        # Meilleures parties par vitesse (None : toutes vitesses), triées comme top()
+        self._best = {None: self._query_top(cached, None)}
+        speed = self._connection.execute("SELECT MIN(speed) FROM games").fetchone()[0]
+        while speed is not None:
+            self._best[speed] = self._query_top(cached, speed)
+            # Vitesse suivante par l'index : une recherche par vitesse, pas un parcours de la table
+            speed = self._connection.execute("SELECT MIN(speed) FROM games WHERE speed > ?", (speed,)).fetchone()[0]
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="eel-scores", daemon=True)
+        self._writer.start()
+
+    def record(self, score, length, duration, speed, seed, won=False):
+        """Mettre en file le résultat d'une partie (écrit plus tard par le thread d'écriture)"""
+        self._queue.put((time.time(), score, length, duration, speed, seed, int(won)))
+        self._remember(GameResult(score, length, duration, speed, seed, won))
+
+    def record_many(self, results):
+        """Mettre en file plusieurs résultats (score, longueur, durée, vitesse, graine, victoire)"""
+        finished_at = time.time()
+        for score, length, duration, speed, seed, won in results:
+            self._queue.put((finished_at, score, length, duration, speed, seed, int(won)))
+            self._remember(GameResult(score, length, duration, speed, seed, won))
+
+    def flush(self):
+        """Attendre que toutes les parties en file soient écrites"""
+        self._queue.join()
+
+    def close(self):
+        """Écrire les parties en file puis fermer la base"""
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        self._connection.close()
+
+    def top(self, count=10, speed=None):
+        """Meilleures parties, toutes vitesses ou pour une vitesse (à égalité, la plus ancienne d'abord)
+
+        Jusqu'à cached parties, lues en mémoire (y compris celles encore en
+        file) ; au-delà, lues dans la base, parmi les parties déjà écrites.
+        """
+        if count <= self.cached:
+            return self._best.get(speed, [])[:count]
+        return self._query_top(count, speed)
+
+    def best_score(self, speed=None):
+        """Meilleur score (0 sans partie enregistrée)"""
+        best = self.top(1, speed)
+        return best[0].score if best else 0
+
+    def stats(self, speed=None):
+        """Nombre de parties, score moyen et durée totale de jeu
+
+        Parcourt toute la table : à réserver aux statistiques, pas à
+        l'affichage de chaque frame.
+        """
+        query = "SELECT COUNT(*), AVG(score), TOTAL(duration) FROM games"
+        if speed is None:
+            games, mean_score, duration = self._connection.execute(query).fetchone()
+        else:
+            games, mean_score, duration = self._connection.execute(query + " WHERE speed = ?", (speed,)).fetchone()
+        return {"games": games, "mean_score": mean_score or 0.0, "duration": duration}
+
+    def _remember(self, result):
+        """Placer une nouvelle partie dans les classements en mémoire"""
+        for speed in (None, result.speed):
+            best = self._best.setdefault(speed, [])
+            # Après les parties de même score : à égalité, la plus ancienne reste devant
+            index = len(best)
+            while index and best[index - 1].score < result.score:
+                index -= 1
+            if index < self.cached:
+                best.insert(index, result)
+                del best[self.cached:]
+
+    def _query_top(self, count, speed):
+        """Meilleures parties écrites dans la base, par les index"""
+        if speed is None:
+            rows = self._connection.execute(
+                f"SELECT {COLUMNS} FROM games ORDER BY score DESC, id LIMIT ?", (count,))
+        else:
+            rows = self._connection.execute(
+                f"SELECT {COLUMNS} FROM games WHERE speed = ? ORDER BY score DESC, id LIMIT ?", (speed, count))
+        return [GameResult(*row) for row in rows]
+
+    def _write_loop(self):
+        """Thread d'écriture : une transaction pour toutes les parties arrivées depuis la précédente"""
+        connection = sqlite3.connect(self.path)
+        # En mode WAL, une coupure de courant peut perdre les derniers lots mais pas corrompre la base
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA cache_size=-{WRITER_CACHE_KIB}")
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                # Ce qui s'est accumulé pendant l'écriture précédente part dans le même lot
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _STOP in batch:
+                    stopping = True
+                    batch.remove(_STOP)
+                if batch:
+                    with connection:
+                        connection.executemany(INSERT, batch)
+                for _ in range(len(batch) + stopping):
+                    self._queue.task_done()
+        finally:
+            connection.close()
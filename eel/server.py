@@ -0,0 +1,205 @@
+import argparse
+import asyncio
+import socket
+import time
+from . import config
+from .arena import Arena
+from .eel import DIRECTIONS
+from . import protocol
+
+
+# Octets en attente d'envoi au-delà desquels un client trop lent est déconnecté
+MAX_CLIENT_BUFFER = 256 * 1024
+
+# Connexions en attente d'acceptation (des centaines de joueurs peuvent arriver ensemble)
+BACKLOG = 1024
+
+
+class _Connection:
+    """Un client connecté et l'anguille qu'il dirige (None s'il regarde seulement)"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.player_id = None
+        self.welcomed = False
+        self.wants_join = True
+
+
+class ArenaServer:
+    """Serveur de référence : fait avancer l'arène à pas fixe et diffuse les changements de chaque tick
+
+    Les clients envoient leurs changements de direction, appliqués au tick
+    suivant. Chaque tick est encodé une seule fois puis écrit sur toutes les
+    connexions sans attendre : un client trop lent est déconnecté plutôt que
+    de retarder les autres.
+    """
+
+    def __init__(self, arena=None, tick_interval=None, max_buffer=MAX_CLIENT_BUFFER):
+        self.arena = arena if arena is not None else Arena()
+        self.tick_interval = config.MOVE_INTERVAL if tick_interval is None else tick_interval
+        self.max_buffer = max_buffer
+        self.connections = []
+        self._handlers = set()
+        self._server = None
+        self._running = False
+
+        # Durée du dernier tick et la plus longue (secondes)
+        self.last_tick_duration = 0.0
+        self.max_tick_duration = 0.0
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Ouvrir le port d'écoute (0 : port libre choisi par le système)"""
+        self._server = await asyncio.start_server(self._handle_client, host, port, backlog=BACKLOG)
+        return self.port
+
+    async def run(self, ticks=None):
+        """Faire avancer l'arène à pas fixe (ticks : nombre de ticks, None pour ne jamais s'arrêter)"""
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        count = 0
+        self._running = True
+        while self._running and (ticks is None or count < ticks):
+            next_time += self.tick_interval
+            delay = next_time - loop.time()
+            if delay < -self.tick_interval:
+                # Trop de retard : repartir de maintenant plutôt que d'enchaîner les ticks
+                next_time = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+            self.tick()
+            count += 1
+
+    def stop(self):
+        """Arrêter la boucle des ticks"""
+        self._running = False
+
+    async def close(self):
+        """Fermer le port d'écoute et toutes les connexions"""
+        self.stop()
+        if self._server is not None:
+            self._server.close()
+        for connection in self.connections:
+            connection.writer.close()
+        self.connections = []
+        # Les lecteurs voient la fin de connexion et se terminent
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def tick(self):
+        """Un pas de l'arène : départs, déplacements, arrivées, puis diffusion"""
+        start = time.perf_counter()
+        arena = self.arena
+
+        # Les clients partis sont retirés avant le pas : ils n'ont pas de déplacement
+        deaths = []
+        connections = []
+        for connection in self.connections:
+            if connection.writer.is_closing():
+                if connection.player_id is not None:
+                    arena.remove_player(connection.player_id)
+                    deaths.append(connection.player_id)
+            else:
+                connections.append(connection)
+        self.connections = connections
+
+        moves, step_deaths, food_changes = arena.step()
+        deaths.extend(step_deaths)
+
+        # Arrivées et réapparitions
+        joins = []
+        dead = set(step_deaths)
+        for connection in connections:
+            if connection.player_id in dead:
+                connection.player_id = None
+            if connection.wants_join and connection.player_id is None:
+                connection.wants_join = False
+                connection.player_id = arena.add_player()
+                if connection.player_id is not None:
+                    x, y = arena.eels[connection.player_id].get_head_position()
+                    joins.append((connection.player_id, x, y))
+
+        # Un seul encodage, écrit sur toutes les connexions
+        message = protocol.encode_tick(arena.ticks, deaths, moves, food_changes, joins)
+        joined = {join[0] for join in joins}
+        state = None
+        for connection in connections:
+            writer = connection.writer
+            if not connection.welcomed:
+                # L'état complet contient déjà ce tick
+                if state is None:
+                    state = protocol.encode_state(arena)
+                writer.write(protocol.encode_welcome(connection.player_id, arena.width, arena.height,
+                                                     self.tick_interval))
+                writer.write(state)
+                connection.welcomed = True
+            else:
+                if connection.player_id in joined:
+                    writer.write(protocol.encode_welcome(connection.player_id, arena.width, arena.height,
+                                                         self.tick_interval))
+                writer.write(message)
+
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                writer.close()
+
+        self.last_tick_duration = time.perf_counter() - start
+        self.max_tick_duration = max(self.max_tick_duration, self.last_tick_duration)
+
+    async def _handle_client(self, reader, writer):
+        """Lire les messages d'un client jusqu'à sa déconnexion"""
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        connection = _Connection(writer)
+        self.connections.append(connection)
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                kind, body = await protocol.read_message(reader)
+                if kind == protocol.DIRECTION and connection.player_id is not None and body:
+                    if body[0] < len(DIRECTIONS):
+                        self.arena.queue_direction(connection.player_id, DIRECTIONS[body[0]])
+                elif kind == protocol.JOIN and connection.player_id is None:
+                    connection.wants_join = True
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Retiré de l'arène au tick suivant
+            writer.close()
+            self._handlers.discard(handler)
+
+
+async def serve(host, port, arena, tick_interval):
+    server = ArenaServer(arena, tick_interval)
+    await server.start(host, port)
+    print(f"Serveur sur {host}:{server.port}")
+    try:
+        await server.run()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur multijoueur : une arène partagée")
+    parser.add_argument("--host", default="127.0.0.1", help="adresse d'écoute")
+    parser.add_argument("--port", type=int, default=7777, help="port d'écoute")
+    parser.add_argument("--width", type=int, default=40, help="largeur de la grille")
+    parser.add_argument("--height", type=int, default=40, help="hauteur de la grille")
+    parser.add_argument("--food", type=int, default=10, help="nombre de nourritures")
+    parser.add_argument("--tick", type=float, default=None, help="intervalle entre deux ticks (secondes)")
+    args = parser.parse_args(argv)
+
+    arena = Arena(args.width, args.height, food_count=args.food)
+    try:
+        asyncio.run(serve(args.host, args.port, arena, args.tick))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
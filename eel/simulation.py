@@ -0,0 +1,122 @@
+import random
+import struct
+from . import config
+from .eel import Eel, UP, DOWN, LEFT, RIGHT, DIRECTIONS
+from .food import Food
+from .snapshot import pack_parts, unpack_parts, pack_random, restore_random
+
+
+# État de la partie dans un instantané : taille de grille, départ, ticks, en vie
+SNAPSHOT_STATE = struct.Struct("<4iQ?")
+
+
+class Simulation:
+    """Moteur de jeu sans pygame : une case par pas de simulation
+
+    Game utilise les mêmes règles à pas de temps fixe ; sans affichage, step()
+    peut être appelé aussi vite que possible.
+    """
+
+    __slots__ = ("width", "height", "start_x", "start_y", "rng", "eel", "food", "ticks", "alive")
+
+    def __init__(self, width=None, height=None, start_x=None, start_y=None, seed=None, rng=None):
+        self.width = config.GRID_WIDTH if width is None else width
+        self.height = config.GRID_HEIGHT if height is None else height
+        self.start_x = self.width // 2 if start_x is None else start_x
+        self.start_y = self.height // 2 if start_y is None else start_y
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Remettre la partie à zéro"""
+        if seed is not None:
+            self.rng.seed(seed)
+
+        self.eel = Eel(self.start_x, self.start_y, self.width, self.height)
+        self.food = Food(self.rng)
+        self.food.place(self.eel.occupancy, self.eel.get_head_position())
+        self.ticks = 0
+        self.alive = True
+
+    def snapshot(self):
+        """Instantané immuable (bytes) de toute la partie, générateur aléatoire compris
+
+        Le même instantané peut être restauré autant de fois que voulu : chaque
+        copie rejoue exactement la même suite de nourriture que l'original.
+        """
+        state = SNAPSHOT_STATE.pack(self.width, self.height, self.start_x, self.start_y, self.ticks, self.alive)
+        return pack_parts(state, self.eel.snapshot(), self.food.snapshot(), pack_random(self.rng))
+
+    def restore(self, blob):
+        """Remettre la partie dans l'état d'un instantané (l'anguille et la nourriture sont modifiées sur place)"""
+        state, eel, food, rng = unpack_parts(blob)
+        self.width, self.height, self.start_x, self.start_y, self.ticks, self.alive = SNAPSHOT_STATE.unpack(state)
+        self.eel.restore(eel)
+        self.food.restore(food)
+        self.food.rng = self.rng
+        restore_random(self.rng, rng)
+
+    @classmethod
+    def from_snapshot(cls, blob):
+        """Créer une nouvelle partie depuis un instantané, sans passer par reset()"""
+        simulation = cls.__new__(cls)
+        simulation.rng = random.Random()
+        simulation.eel = Eel.__new__(Eel)
+        simulation.food = Food.__new__(Food)
+        simulation.restore(blob)
+        return simulation
+
+    def fork(self, count):
+        """Copies indépendantes de la partie dans son état actuel"""
+        blob = self.snapshot()
+        return [Simulation.from_snapshot(blob) for _ in range(count)]
+
+    @property
+    def score(self):
+        return self.eel.score
+
+    def step(self, action=None):
+        """Avancer d'une case ; renvoie "ate", "won", "game_over" ou None"""
+        if not self.alive:
+            return "game_over"
+
+        self.advance(action)
+        result = self.check_collisions()
+        if result in ("game_over", "won"):
+            self.alive = False
+        return result
+
+    def advance(self, action=None):
+        """Avancer l'anguille d'une case, sans vérifier les collisions"""
+        if action is not None:
+            self.eel.set_pending_direction(action)
+        self.eel.tick()
+        self.ticks += 1
+
+    def check_collisions(self):
+        """Vérifier toutes les collisions ; renvoie "ate", "won", "game_over" ou None"""
+        # Collision avec les limites
+        if self.eel.is_out_of_bounds():
+            return "game_over"
+
+        # Collision avec soi-même
+        if self.eel.check_self_collision():
+            return "game_over"
+
+        # Collision avec la nourriture
+        head_pos = self.eel.get_head_position()
+        if head_pos == self.food.get_position():
+            self.eel.add_segment()
+            # Régénérer la nourriture sur une case libre, hors de la tête
+            if not self.food.place(self.eel.occupancy, head_pos):
+                return "won"
+            return "ate"
+        return None
+
+    def get_head_position(self):
+        """Obtenir la position de la tête"""
+        return self.eel.get_head_position()
+
+    def is_cell_free(self, x, y):
+        """La case est-elle libre et dans la grille ?"""
+        return self.eel.is_cell_free(x, y) and (x, y) != self.eel.get_head_position()
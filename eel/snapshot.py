@@ -0,0 +1,44 @@
+import struct
+
+
+# Longueur de chaque partie d'un instantané
+PART_LENGTH = struct.Struct("<I")
+
+# État d'un random.Random : gauss_next, puis les 624 mots de Mersenne Twister et la position
+RANDOM_GAUSS = struct.Struct("<?d")
+RANDOM_WORDS = struct.Struct("<625I")
+
+
+def pack_parts(*parts):
+    """Assembler plusieurs instantanés en un seul bloc d'octets (chaque partie préfixée par sa longueur)"""
+    data = bytearray()
+    for part in parts:
+        data += PART_LENGTH.pack(len(part))
+        data += part
+    return bytes(data)
+
+
+def unpack_parts(blob):
+    """Découper un bloc assemblé par pack_parts ; renvoie des memoryview, sans copie"""
+    view = memoryview(blob)
+    parts = []
+    offset = 0
+    while offset < len(view):
+        (length,) = PART_LENGTH.unpack_from(view, offset)
+        offset += PART_LENGTH.size
+        parts.append(view[offset:offset + length])
+        offset += length
+    return parts
+
+
+def pack_random(rng):
+    """Instantané d'un random.Random"""
+    _, internal, gauss_next = rng.getstate()
+    return RANDOM_GAUSS.pack(gauss_next is not None, gauss_next or 0.0) + RANDOM_WORDS.pack(*internal)
+
+
+def restore_random(rng, data):
+    """Remettre un random.Random dans l'état d'un instantané de pack_random"""
+    has_gauss, gauss_next = RANDOM_GAUSS.unpack_from(data)
+    internal = RANDOM_WORDS.unpack_from(data, RANDOM_GAUSS.size)
+    rng.setstate((rng.VERSION, internal, gauss_next if has_gauss else None))
@@ -0,0 +1,35 @@
+import pygame
+
+
+# Disques pré-rendus, par (rayon, couleur)
+_circles = {}
+
+# Couleur transparente du fond des disques (les disques ne sont pas lissés : une couleur clé suffit)
+COLORKEY = (255, 0, 255)
+
+
+def circle_sprite(radius, color):
+    """Disque de rayon et couleur donnés, rendu une seule fois
+
+    Collé en (x - rayon, y - rayon), il donne exactement les mêmes pixels que
+    pygame.draw.circle centré en (x, y).
+    """
+    # Les pygame.Color ne sont pas hachables : les convertir en tuple
+    key = (radius, color if isinstance(color, str) else tuple(color))
+    sprite = _circles.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((2 * radius, 2 * radius))
+        key_color = COLORKEY if pygame.Color(color)[:3] != COLORKEY else (0, 0, 0)
+        sprite.fill(key_color)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        # Copie RLE : seules les lignes de pixels du disque sont copiées
+        sprite.set_colorkey(key_color, pygame.RLEACCEL)
+        _circles[key] = sprite
+    return sprite
+
+
+def clear():
+    """Oublier les disques pré-rendus (après un changement de mode d'affichage)"""
+    _circles.clear()
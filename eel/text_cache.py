@@ -0,0 +1,32 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """Cache LRU des surfaces de texte rendues par une police"""
+
+    def __init__(self, font, max_size=64):
+        self.font = font
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+
+    def render(self, text, antialias, color):
+        """Rendre un texte (même signature que Font.render), en réutilisant la surface si possible"""
+        # Les pygame.Color ne sont pas hachables : les convertir en tuple
+        key = (text, antialias, color if isinstance(color, str) else tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        surface = self.font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Vider le cache"""
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
@@ -0,0 +1,164 @@
+import argparse
+import importlib
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .eel import DIRECTIONS
+from .simulation import Simulation
+
+
+# État propre à chaque processus : la politique et une simulation réutilisée
+_worker = {}
+
+
+def greedy_policy(simulation):
+    """Politique d'exemple : aller vers la nourriture en évitant les cases occupées"""
+    head_x, head_y = simulation.get_head_position()
+    food_x, food_y = simulation.food.get_position()
+    direction = simulation.eel.auto_direction
+
+    best = None
+    best_distance = None
+    for dx, dy in DIRECTIONS:
+        if (dx, dy) == (-direction[0], -direction[1]):
+            continue
+        x, y = head_x + dx, head_y + dy
+        if not simulation.is_cell_free(x, y):
+            continue
+        distance = abs(food_x - x) + abs(food_y - y)
+        if best is None or distance < best_distance:
+            best = (dx, dy)
+            best_distance = distance
+    return best
+
+
+def load_policy(spec):
+    """Charger une politique depuis "module:fonction" (une classe est instanciée, ex. un pilote automatique)"""
+    module_name, _, name = spec.partition(":")
+    policy = getattr(importlib.import_module(module_name), name or "policy")
+    if isinstance(policy, type):
+        policy = policy()
+    return policy
+
+
+def play_game(simulation, policy, seed, max_ticks):
+    """Jouer une partie complète ; renvoie (score, ticks)"""
+    simulation.reset(seed)
+    while simulation.alive and simulation.ticks < max_ticks:
+        simulation.step(policy(simulation))
+    return simulation.score, simulation.ticks
+
+
+def _init_worker(policy_spec, width, height, max_ticks):
+    """Préparer un processus : charger la politique une fois et créer sa simulation"""
+    _worker["policy"] = load_policy(policy_spec)
+    _worker["simulation"] = Simulation(width, height)
+    _worker["max_ticks"] = max_ticks
+
+
+def _run_chunk(first_seed, count):
+    """Jouer un lot de parties avec des graines consécutives"""
+    simulation = _worker["simulation"]
+    policy = _worker["policy"]
+    max_ticks = _worker["max_ticks"]
+    return [play_game(simulation, policy, seed, max_ticks) for seed in range(first_seed, first_seed + count)]
+
+
+def run_tournament(policy_spec, games, workers=None, seed=0, width=None, height=None, max_ticks=10000):
+    """Jouer games parties sur plusieurs processus ; renvoie les statistiques agrégées"""
+    if games < 1:
+        raise ValueError(f"nombre de parties invalide : {games}")
+    workers = workers or os.cpu_count() or 1
+    # Plusieurs lots par processus pour équilibrer la charge
+    chunk_size = max(1, games // (workers * 8))
+    chunks = [(seed + start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+
+    start_time = time.perf_counter()
+    results = []
+    if workers == 1:
+        _init_worker(policy_spec, width, height, max_ticks)
+        for first_seed, count in chunks:
+            results.extend(_run_chunk(first_seed, count))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(policy_spec, width, height, max_ticks)) as executor:
+            for chunk_results in executor.map(_run_chunk, *zip(*chunks)):
+                results.extend(chunk_results)
+    elapsed = time.perf_counter() - start_time
+
+    return summarize(results, elapsed)
+
+
+def _percentile(sorted_values, fraction):
+    """Percentile (plus proche rang) d'une liste triée"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def summarize(results, elapsed):
+    """Agréger les scores et durées de survie"""
+    scores = sorted(score for score, _ in results)
+    ticks = sorted(tick for _, tick in results)
+
+    distribution = {}
+    for score in scores:
+        distribution[score] = distribution.get(score, 0) + 1
+
+    return {
+        "games": len(results),
+        "elapsed": elapsed,
+        "games_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        "score": {
+            "mean": statistics.fmean(scores),
+            "median": _percentile(scores, 0.5),
+            "p90": _percentile(scores, 0.9),
+            "max": scores[-1],
+            "distribution": distribution,
+        },
+        "survival_ticks": {
+            "mean": statistics.fmean(ticks),
+            "median": _percentile(ticks, 0.5),
+            "max": ticks[-1],
+        },
+    }
+
+
+def _positive_int(text):
+    """Type argparse : entier strictement positif"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"doit être au moins 1 : {text}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tournoi de politiques sans affichage")
+    parser.add_argument("policy", nargs="?", default="eel.tournament:greedy_policy",
+                        help="politique à évaluer, sous la forme module:fonction")
+    parser.add_argument("--games", type=_positive_int, default=1000, help="nombre de parties")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (défaut : un par cœur)")
+    parser.add_argument("--seed", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--width", type=int, default=None, help="largeur de la grille")
+    parser.add_argument("--height", type=int, default=None, help="hauteur de la grille")
+    parser.add_argument("--max-ticks", type=int, default=10000, help="durée maximale d'une partie")
+    parser.add_argument("--json", action="store_true", help="afficher les résultats en JSON")
+    args = parser.parse_args(argv)
+
+    stats = run_tournament(args.policy, args.games, args.workers, args.seed,
+                           args.width, args.height, args.max_ticks)
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+
+    print(f"{stats['games']} parties en {stats['elapsed']:.2f} s ({stats['games_per_second']:.0f} parties/s)")
+    score = stats["score"]
+    print(f"Score : moyenne {score['mean']:.2f}, médiane {score['median']}, p90 {score['p90']}, max {score['max']}")
+    survival = stats["survival_ticks"]
+    print(f"Survie (ticks) : moyenne {survival['mean']:.1f}, médiane {survival['median']}, max {survival['max']}")
+
+
+if __name__ == "__main__":
+    main()
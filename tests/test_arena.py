@@ -0,0 +1,150 @@
+import subprocess
+import sys
+import pytest
+from eel.arena import Arena, ArenaSeat
+from eel.eel import UP, DOWN, LEFT, RIGHT, direction_code
+from eel.tournament import greedy_policy
+
+
+class TestArena:
+
+    def setup_method(self):
+        self.arena = Arena(20, 20, food_count=3, seed=1)
+
+    def _place(self, player_id, x, y, direction):
+        """Déplacer une anguille qui vient d'apparaître (sans corps) sur une case donnée"""
+        eel = self.arena.eels[player_id]
+        del self.arena._heads[eel.get_head_position()]
+        eel.target_grid_x = eel.previous_grid_x = x
+        eel.target_grid_y = eel.previous_grid_y = y
+        eel.direction = direction_code(direction)
+        self.arena._heads[(x, y)] = player_id
+
+    def _clear_food(self):
+        for food in self.arena.foods:
+            food.x, food.y = 19, 19
+
+    def test_no_pygame_import(self):
+        code = "import sys, eel.arena; print('pygame' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
+
+    def test_add_players(self):
+        ids = [self.arena.add_player() for _ in range(10)]
+        assert len(set(ids)) == 10
+        assert len(self.arena) == 10
+        heads = {self.arena.eels[player_id].get_head_position() for player_id in ids}
+        assert len(heads) == 10
+
+    def test_eels_share_occupancy(self):
+        first, second = self.arena.add_player(), self.arena.add_player()
+        assert self.arena.eels[first].occupancy is self.arena.eels[second].occupancy is self.arena.occupancy
+
+    def test_step_moves_and_grows(self):
+        player_id = self.arena.add_player()
+        self._place(player_id, 5, 5, RIGHT)
+        self._clear_food()
+        for _ in range(3):
+            moves, deaths, _ = self.arena.step()
+        assert moves == [(player_id, direction_code(RIGHT), False)]
+        assert self.arena.player_cells(player_id) == [(5, 5), (6, 5), (7, 5), (8, 5)]
+
+        moves, _, _ = self.arena.step()
+        assert moves == [(player_id, direction_code(RIGHT), True)]
+        assert self.arena.occupancy.is_free(5, 5)
+
+    def test_head_to_head(self):
+        first, second = self.arena.add_player(), self.arena.add_player()
+        self._place(first, 5, 5, RIGHT)
+        self._place(second, 7, 5, LEFT)
+        self._clear_food()
+        _, deaths, _ = self.arena.step()
+        assert sorted(deaths) == sorted([first, second])
+        assert len(self.arena) == 0
+
+    def test_head_to_body(self):
+        first, second = self.arena.add_player(), self.arena.add_player()
+        self._place(first, 5, 5, RIGHT)
+        self._place(second, 6, 3, DOWN)
+        self._clear_food()
+        # La première anguille laisse son corps en (6, 5), la seconde y descend
+        _, deaths, _ = self.arena.step()
+        assert deaths == []
+        moves, deaths, _ = self.arena.step()
+        assert deaths == [second]
+        assert [move[0] for move in moves] == [first]
+        # Le corps de l'anguille morte est libéré
+        assert self.arena.occupancy.free_count() == 400 - len(self.arena.eels[first].body_history)
+
+    def test_eating_moves_food_and_grows(self):
+        player_id = self.arena.add_player()
+        self._place(player_id, 5, 5, RIGHT)
+        self._clear_food()
+        self.arena.foods[1].x, self.arena.foods[1].y = 6, 5
+        _, _, food_changes = self.arena.step()
+
+        food = self.arena.foods[1]
+        assert food_changes == [(1, food.x, food.y)]
+        assert (food.x, food.y) != (6, 5)
+        assert self.arena.eels[player_id].length == 2
+
+    def test_remove_player_frees_cells(self):
+        player_id = self.arena.add_player()
+        for _ in range(3):
+            self.arena.step()
+        self.arena.remove_player(player_id)
+        assert self.arena.occupancy.free_count() == 400
+
+    def test_queue_direction(self):
+        player_id = self.arena.add_player()
+        eel = self.arena.eels[player_id]
+        turn = DIRECTIONS_PERPENDICULAR[eel.direction]
+        assert self.arena.queue_direction(player_id, turn) is True
+        assert self.arena.queue_direction(12345, turn) is False
+
+    def test_full_arena_refuses_players(self):
+        arena = Arena(4, 1, food_count=0, seed=0)
+        assert arena.add_player() is not None
+        assert arena.add_player() is None
+
+
+# Une direction perpendiculaire à chaque code de direction
+DIRECTIONS_PERPENDICULAR = (LEFT, LEFT, UP, UP)
+
+
+class TestArenaSeat:
+
+    def setup_method(self):
+        self.arena = Arena(20, 20, food_count=2, seed=1)
+        self.player_id = self.arena.add_player()
+        self.seat = ArenaSeat(self.arena, self.player_id)
+        eel = self.arena.eels[self.player_id]
+        del self.arena._heads[eel.get_head_position()]
+        eel.target_grid_x = eel.previous_grid_x = 5
+        eel.target_grid_y = eel.previous_grid_y = 5
+        eel.direction = direction_code(RIGHT)
+        self.arena._heads[(5, 5)] = self.player_id
+
+    def test_nearest_food(self):
+        near, far = self.arena.foods
+        near.x, near.y = 7, 5
+        far.x, far.y = 15, 15
+        assert self.seat.food is near
+
+    def test_unplaced_food_ignored(self):
+        for food in self.arena.foods:
+            food.x = food.y = -1
+        assert self.seat.food is None
+
+    def test_cells_with_heads_not_free(self):
+        other = self.arena.add_player()
+        x, y = self.arena.eels[other].get_head_position()
+        assert not self.seat.is_cell_free(x, y)
+        assert not self.seat.is_cell_free(-1, 0)
+        assert self.seat.is_cell_free(6, 5) == self.arena.occupancy.is_free(6, 5)
+
+    def test_greedy_policy_moves_towards_food(self):
+        near, far = self.arena.foods
+        near.x, near.y = 5, 9
+        far.x, far.y = 19, 19
+        assert greedy_policy(self.seat) == DOWN
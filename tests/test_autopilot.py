@@ -0,0 +1,167 @@
+import pytest
+from unittest.mock import patch
+from eel.autopilot import (PathfindingAutopilot, HamiltonianAutopilot, hamiltonian_cycle,
+                           create_autopilot, TICK_BUDGET, ROOM_LIMIT, _Board, _body_cells)
+from eel.simulation import Simulation, RIGHT
+from eel.eel import DIRECTIONS
+from eel.tournament import load_policy
+
+
+def play(pilot, simulation, max_ticks=20000):
+    result = None
+    while simulation.alive and simulation.ticks < max_ticks:
+        result = simulation.step(pilot(simulation))
+    return simulation, result
+
+
+def can_enter(simulation, x, y):
+    if not (0 <= x < simulation.width and 0 <= y < simulation.height):
+        return False
+    history = simulation.eel.body_history
+    return (simulation.eel.is_cell_free(x, y)
+            or len(history) == history.capacity and history[0] == (x, y))
+
+
+class TestHamiltonianCycle:
+
+    @pytest.mark.parametrize("width, height", [(10, 10), (11, 10), (10, 11), (11, 11), (3, 3), (2, 5)])
+    def test_cycle_is_closed_and_covers_grid(self, width, height):
+        cycle, off_cycle = hamiltonian_cycle(width, height)
+        assert len(set(cycle)) == len(cycle) == width * height - len(off_cycle)
+        for cell, following in zip(cycle, cycle[1:] + cycle[:1]):
+            assert abs(cell % width - following % width) + abs(cell // width - following // width) == 1
+
+    def test_odd_grid_leaves_one_corner(self):
+        _, off_cycle = hamiltonian_cycle(11, 11)
+        assert off_cycle == {10 * 11: 9 * 11 + 1}
+
+    def test_too_small_grid(self):
+        with pytest.raises(ValueError):
+            hamiltonian_cycle(1, 4)
+
+
+class TestPathfindingAutopilot:
+
+    def setup_method(self):
+        self.pilot = PathfindingAutopilot()
+        self.sim = Simulation(seed=0)
+
+    def test_heads_to_food(self):
+        self.sim.food.x, self.sim.food.y = (5, 2)
+        assert self.pilot(self.sim) == (0, -1)
+
+    def test_never_reverses(self):
+        self.sim.food.x, self.sim.food.y = (2, 5)
+        assert self.pilot(self.sim) != (-1, 0)
+
+    def test_path_is_cached_until_food_moves(self):
+        self.sim.food.x, self.sim.food.y = (9, 9)
+        with patch.object(self.pilot, '_search', wraps=self.pilot._search) as mock_search:
+            for _ in range(4):
+                self.sim.step(self.pilot(self.sim))
+            assert mock_search.call_count == 1
+
+    def test_plays_good_games(self):
+        scores = [play(self.pilot, Simulation(seed=seed))[0].score for seed in range(3)]
+        assert min(scores) >= 20
+
+    def test_reused_across_games(self):
+        first = play(self.pilot, Simulation(seed=1))[0].score
+        play(self.pilot, Simulation(seed=2))
+        assert play(self.pilot, Simulation(seed=1))[0].score == first
+
+    def test_trail_path_follows_tail(self):
+        for _ in range(5):
+            self.sim.eel.add_segment()
+            self.sim.step()
+        board = _Board(self.sim.width, self.sim.height)
+        eel = self.sim.eel
+        head = board.cell(eel.get_head_position())
+        body = _body_cells(board, eel)
+        path = self.pilot._trail_path(board, head, body, self.pilot._free_at(board, eel), -1)
+        assert path[-1] == body[-1]
+        for cell, following in zip([head] + path, path):
+            assert following in board.neighbours[cell]
+
+    def test_search_stops_at_budget(self):
+        # Nourriture inaccessible sur une grande grille : la recherche s'arrête au lieu de tout parcourir
+        board = _Board(200, 200)
+        goal = board.cell((150, 150))
+        walls = {cell: 10 ** 9 for cell in board.neighbours[goal]}
+        self.pilot._budget = TICK_BUDGET
+        assert self.pilot._search(board, board.cell((10, 10)), goal, walls, -1) is None
+        assert self.pilot._budget == 0
+
+    def test_worst_decision_cost_is_bounded(self):
+        # Cases explorées par tick (recherches, puis place autour des issues) sur toute une partie
+        sim = Simulation(width=40, height=40, seed=0)
+        room = self.pilot._room
+        counted = []
+
+        def counting_room(*args):
+            seen = room(*args)
+            counted.append(len(seen))
+            return seen
+
+        worst = 0
+        with patch.object(self.pilot, '_room', side_effect=counting_room):
+            while sim.alive and sim.ticks < 20000:
+                counted.clear()
+                sim.step(self.pilot(sim))
+                worst = max(worst, TICK_BUDGET - self.pilot._budget + sum(counted))
+        assert sim.eel.length > 100
+        assert worst <= TICK_BUDGET + 3 * ROOM_LIMIT
+
+
+class TestHamiltonianAutopilot:
+
+    def test_first_move_is_not_a_reverse(self):
+        sim = Simulation(seed=0)
+        assert HamiltonianAutopilot()(sim) != (-1, 0)
+
+    @pytest.mark.parametrize("width, height", [(6, 6), (7, 6), (6, 7)])
+    def test_fills_small_boards(self, width, height):
+        _, result = play(HamiltonianAutopilot(), Simulation(width, height, seed=0))
+        assert result == "won"
+
+    @pytest.mark.parametrize("width, height", [(7, 7), (11, 11)])
+    def test_fills_odd_boards(self, width, height):
+        # Sans cycle complet, la fin dépend de l'endroit où la nourriture réapparaît
+        results = [play(HamiltonianAutopilot(), Simulation(width, height, seed=seed))[1] for seed in range(5)]
+        assert "won" in results
+
+    @pytest.mark.parametrize("width, height", [(7, 7), (11, 11)])
+    @pytest.mark.parametrize("seed", range(4))
+    def test_odd_board_never_picks_occupied_cell(self, width, height, seed):
+        pilot, sim = HamiltonianAutopilot(), Simulation(width, height, seed=seed)
+        while sim.alive and sim.ticks < 5000:
+            direction = pilot(sim)
+            x, y = sim.get_head_position()
+            moves = [move for move in DIRECTIONS
+                     if not len(sim.eel.body_history) or move != (-sim.eel.auto_direction[0], -sim.eel.auto_direction[1])]
+            if any(can_enter(sim, x + dx, y + dy) for dx, dy in moves):
+                assert can_enter(sim, x + direction[0], y + direction[1])
+            else:
+                # Le coin hors cycle n'est pris que si la tête peut en ressortir
+                assert (x, y) != (0, height - 1)
+            sim.step(direction)
+        assert sim.eel.length >= width * height - 2
+
+    def test_without_shortcuts_follows_cycle(self):
+        _, result = play(HamiltonianAutopilot(shortcuts=False), Simulation(6, 6, seed=0))
+        assert result == "won"
+
+
+class TestCreateAutopilot:
+
+    def test_create(self):
+        assert create_autopilot(None) is None
+        assert isinstance(create_autopilot("pathfinding"), PathfindingAutopilot)
+        assert isinstance(create_autopilot("hamiltonian"), HamiltonianAutopilot)
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            create_autopilot("random")
+
+    def test_tournament_instantiates_class(self):
+        assert isinstance(load_policy("eel.autopilot:HamiltonianAutopilot"), HamiltonianAutopilot)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock
+from eel.batch import BatchEelEnv, NO_ACTION
+from eel.simulation import Simulation, DIRECTIONS
+from eel.autopilot import HamiltonianAutopilot
+
+
+class TestBatchEelEnv:
+
+    def setup_method(self):
+        self.env = BatchEelEnv(4, seed=0)
+
+    def test_init_state(self):
+        assert (self.env.head_x == 5).all()
+        assert (self.env.head_y == 5).all()
+        assert (self.env.length == 1).all()
+        assert (self.env.occupancy.sum(axis=1) == 1).all()
+        assert (self.env.food != 5 * 11 + 5).all()
+        assert not self.env.done.any()
+
+    def test_step_moves_right_by_default(self):
+        self.env.food[:] = 0
+        self.env.step(np.full(4, NO_ACTION))
+        assert (self.env.head_x == 6).all()
+        assert (self.env.length == 2).all()
+
+    def test_reverse_direction_ignored(self):
+        self.env.food[:] = 0
+        self.env.step(np.full(4, 2))
+        assert (self.env.head_x == 6).all()
+
+    def test_out_of_bounds(self):
+        self.env.food[:] = 0
+        for _ in range(5):
+            ate, died, won = self.env.step(np.full(4, 3))
+            assert not died.any()
+        ate, died, won = self.env.step(np.full(4, 3))
+        assert died.all()
+        assert self.env.done.all()
+
+    def test_self_collision(self):
+        self.env.food[:] = 0
+        self.env.growth[:] = 10
+        for action in (3, 1, 2):
+            self.env.step(np.full(4, action))
+        ate, died, won = self.env.step(np.array([0, 3, 3, 3]))
+        assert died.tolist() == [True, False, False, False]
+
+    def test_eat_food(self):
+        self.env.food[:] = 0
+        self.env.food[1] = 5 * 11 + 6
+        ate, died, won = self.env.step(np.full(4, NO_ACTION))
+        assert ate.tolist() == [False, True, False, False]
+        assert self.env.score[1] == 1
+        assert self.env.occupancy[1, self.env.food[1]] == 0
+
+    def test_reset_mask(self):
+        self.env.food[:] = 0
+        self.env.step(np.full(4, 3))
+        self.env.reset(np.array([True, False, False, False]))
+        assert self.env.head_x.tolist() == [5, 6, 6, 6]
+
+    def test_food_placed_without_scanning_board(self):
+        env = BatchEelEnv(4, width=1000, height=1000, seed=0)
+        env.rng = Mock(wraps=np.random.default_rng(0))
+        env._place_food(np.arange(4))
+        # Grille presque vide : quelques tirages, pas de clé par case
+        assert not env.rng.random.called
+        assert (env.occupancy[np.arange(4), env.food] == 0).all()
+
+    def test_food_on_last_free_cell(self):
+        env = BatchEelEnv(2, width=4, height=4, seed=0)
+        env.occupancy[:] = 1
+        env.occupancy[0, 6] = 0
+        assert env._place_food(np.arange(2)).tolist() == [1]
+        assert env.food.tolist() == [6, -1]
+
+    def _match_simulation(self, env, sim, choose, ticks):
+        """Jouer la même partie dans les deux environnements ; renvoie le dernier résultat de Simulation"""
+        result = None
+        for _ in range(ticks):
+            # Même nourriture des deux côtés
+            food = int(env.food[0])
+            sim.food.x, sim.food.y = (food % sim.width, food // sim.width)
+            action = choose(sim)
+            result = sim.step(None if action == NO_ACTION else DIRECTIONS[action])
+            ate, died, won = env.step(np.array([action]))
+            assert bool(ate[0]) == (result in ("ate", "won"))
+            assert bool(died[0]) == (result == "game_over")
+            assert bool(won[0]) == (result == "won")
+            assert bool(env.done[0]) == (not sim.alive)
+            if not sim.alive:
+                break
+            head = sim.get_head_position()
+            assert (int(env.head_x[0]), int(env.head_y[0])) == head
+            assert int(env.length[0]) == len(sim.eel.body_history) + 1
+            assert int(env.occupancy[0].sum()) == sim.width * sim.height - sim.eel.occupancy.free_count() + 1
+        return result
+
+    def test_matches_simulation(self):
+        rng = np.random.default_rng(3)
+        env = BatchEelEnv(1, seed=1)
+        self._match_simulation(env, Simulation(), lambda sim: int(rng.integers(0, 4)), 200)
+
+    def test_matches_simulation_until_board_is_full(self):
+        env = BatchEelEnv(1, width=4, height=4, seed=1)
+        sim = Simulation(width=4, height=4)
+        pilot = HamiltonianAutopilot()
+
+        def choose(sim):
+            direction = pilot(sim)
+            return NO_ACTION if direction is None else DIRECTIONS.index(direction)
+
+        assert self._match_simulation(env, sim, choose, 1000) == "won"
+        assert int(env.score[0]) == sim.score == 4 * 4 - 3
+        assert int(env.food[0]) == -1
+        # Partie gagnée : elle ne bouge plus jusqu'au reset
+        ate, died, won = env.step(np.array([NO_ACTION]))
+        assert not (ate[0] or died[0] or won[0])
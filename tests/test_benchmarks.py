@@ -0,0 +1,28 @@
+import json
+from benchmarks.run import BENCHMARKS, run_benchmarks, main
+
+
+class TestBenchmarks:
+
+    def test_registered(self):
+        names = {(name, params.get("length")) for name, params, _, _ in BENCHMARKS}
+        for length in (3, 100, 10000):
+            assert ("eel.tick", length) in names
+            assert ("eel.check_self_collision", length) in names
+        assert ("game.frame", None) in names
+        assert ("game.arena_frame", None) in names
+        assert ("game.startup", None) in names
+
+    def test_run_filtered(self):
+        results = run_benchmarks("eel.tick", repeat=2, scale=0.01)
+        assert [result["params"]["length"] for result in results] == [3, 100, 10000]
+        for result in results:
+            assert result["number"] == 10
+            assert 0 < result["min_ns"] <= result["median_ns"]
+
+    def test_main_writes_json(self, tmp_path):
+        output = tmp_path / "bench.json"
+        main(["-k", "draw", "--repeat", "1", "--scale", "0.01", "-o", str(output)])
+        report = json.loads(output.read_text())
+        assert {result["name"] for result in report["results"]} == {"grid.draw", "eel.draw", "eel.draw_changed"}
+        assert "python" in report
@@ -1,6 +1,6 @@
 import pytest
 import pygame
-from eel.eel import Eel
+from eel.eel import Eel, UP, DOWN, LEFT, RIGHT, MAX_QUEUED_DIRECTIONS, direction_code
 from eel import config
 
 
@@ -32,12 +32,12 @@ class TestEel:
         assert self.eel.pending_direction is None
 
     def test_init_movement_state(self):
-        assert self.eel.move_timer == 0
+        assert self.eel.alpha == 0
         assert self.eel.first_move is True
 
     def test_init_body(self):
         assert self.eel.body == []
-        assert self.eel.body_history == []
+        assert len(self.eel.body_history) == 0
 
     def test_add_segment_empty_body(self):
         self.eel.add_segment()
@@ -45,24 +45,85 @@ class TestEel:
         assert self.eel.body[0] == (-10, -10)
 
     def test_add_segment_with_history(self):
-        for i in range(50):
-            self.eel.body_history.append((i, i))
-
+        for _ in range(5):
+            self.eel.tick()
+        tail = self.eel.body[-1]
         initial_body_count = len(self.eel.body)
-        history_length = len(self.eel.body_history)
 
         self.eel.add_segment()
         assert len(self.eel.body) == initial_body_count + 1
+        assert self.eel.body[-1] == (-10, -10)
+
+        # Le nouveau segment prend la place de la queue au tick suivant
+        self.eel.tick()
+        assert self.eel.body[-1] == tail
+
+    def test_initial_segments_added_progressively(self):
+        for expected in range(1, 4):
+            self.eel.tick()
+            assert len(self.eel.body) == expected
+            assert self.eel.segments_added == expected
+        self.eel.tick()
+        assert self.eel.body == [(8, 5), (7, 5), (6, 5)]
+
+    def test_tick_moves_one_cell(self):
+        self.eel.tick()
+        assert self.eel.get_head_position() == (6, 5)
+        assert self.eel.first_move is False
+
+    def test_tick_applies_pending_direction(self):
+        self.eel.set_pending_direction(pygame.Vector2(0, 1))
+        self.eel.tick()
+        assert self.eel.get_head_position() == (5, 6)
+        assert self.eel.pending_direction is None
 
-        positions_per_cell = int(config.MOVE_INTERVAL * config.FPS)
-        new_segment_index = initial_body_count * positions_per_cell + positions_per_cell
+    def test_tick_drops_reverse_pending_direction(self):
+        self.eel.set_pending_direction(LEFT)
+        self.eel.tick()
+        assert self.eel.auto_direction == RIGHT
+        assert self.eel.pending_direction is None
 
-        if history_length > new_segment_index:
-            assert self.eel.body[-1] != (-10, -10)
-        else:
-            assert self.eel.body[-1] == (-10, -10)
+    def test_queue_direction_one_per_tick(self):
+        assert self.eel.queue_direction(DOWN) is True
+        assert self.eel.queue_direction(LEFT) is True
+        self.eel.tick()
+        assert self.eel.get_head_position() == (5, 6)
+        self.eel.tick()
+        assert self.eel.get_head_position() == (4, 6)
+        assert not self.eel.direction_queue
+
+    def test_queue_direction_ignores_repeats_and_reverses(self):
+        assert self.eel.queue_direction(RIGHT) is False
+        assert self.eel.queue_direction(LEFT) is False
+        assert self.eel.queue_direction(UP) is True
+        assert self.eel.queue_direction(UP) is False
+        assert self.eel.queue_direction(DOWN) is False
+        assert self.eel.direction_queue == [direction_code(UP)]
+
+    def test_queue_direction_is_bounded(self):
+        for direction in (UP, LEFT, DOWN, RIGHT, UP):
+            self.eel.queue_direction(direction)
+        assert len(self.eel.direction_queue) == MAX_QUEUED_DIRECTIONS
+
+    def test_queue_waits_for_pending_direction(self):
+        self.eel.set_pending_direction(DOWN)
+        self.eel.queue_direction(LEFT)
+        self.eel.tick()
+        assert self.eel.auto_direction == DOWN
+        self.eel.tick()
+        assert self.eel.auto_direction == LEFT
+
+    def test_interpolate(self):
+        self.eel.tick()
+        self.eel.interpolate(0.25)
+        assert self.eel.grid_x == 5.25
+        assert self.eel.grid_y == 5
+        self.eel.interpolate(2)
+        assert self.eel.grid_x == 6
 
     def test_get_head_position(self):
+        self.eel.target_grid_x = 6
+        self.eel.target_grid_y = 3
         self.eel.grid_x = 5.7
         self.eel.grid_y = 3.2
         head_pos = self.eel.get_head_position()
@@ -108,6 +169,16 @@ class TestEel:
         self.eel.target_grid_y = 11
         assert self.eel.is_out_of_bounds() is True
 
+    def test_is_out_of_bounds_custom_board(self, monkeypatch):
+        monkeypatch.setattr(config, 'GRID_WIDTH', 30)
+        monkeypatch.setattr(config, 'GRID_HEIGHT', 20)
+        eel = Eel(15, 10)
+        eel.target_grid_x = 29
+        eel.target_grid_y = 19
+        assert eel.is_out_of_bounds() is False
+        eel.target_grid_y = 20
+        assert eel.is_out_of_bounds() is True
+
     def test_check_self_collision_no_body(self):
         assert self.eel.check_self_collision() is False
 
@@ -123,6 +194,28 @@ class TestEel:
         self.eel.grid_y = 5.0
         assert self.eel.check_self_collision() is True
 
+    def test_check_self_collision_ignores_off_grid_segments(self):
+        self.eel.add_segment()
+        self.eel.grid_x = 5.0
+        self.eel.grid_y = 5.0
+        assert self.eel.check_self_collision() is False
+
+    def test_occupancy_follows_body(self):
+        self.eel.start_movement(pygame.Vector2(0, 1))
+        for tick in range(40):
+            if tick == 3:
+                self.eel.set_pending_direction(pygame.Vector2(-1, 0))
+            if tick == 6:
+                self.eel.set_pending_direction(pygame.Vector2(0, -1))
+            self.eel.tick()
+            if tick % 4 == 0:
+                self.eel.add_segment()
+
+        body_cells = set(self.eel.body)
+        for x in range(11):
+            for y in range(11):
+                assert self.eel.is_cell_free(x, y) == ((x, y) not in body_cells)
+
     def test_get_pixel_position(self):
         grid_bounds = pygame.Rect(100, 100, 550, 550)
         self.eel.grid_x = 2
@@ -135,20 +228,83 @@ class TestEel:
         assert pixel_pos.x == expected_x
         assert pixel_pos.y == expected_y
 
-    def test_limit_history(self):
-        for i in range(1000):
-            self.eel.body_history.append((i, i))
-
-        self.eel.body = [(1, 1), (2, 2), (3, 3)]
-
-        self.eel._limit_history()
+    def test_body_history_capacity_follows_length(self):
+        for _ in range(10):
+            self.eel.tick()
+        assert self.eel.body_history.capacity == 3
+        self.eel.add_segment()
+        assert self.eel.body_history.capacity == self.eel.length == 4
 
-        positions_per_cell = int(config.MOVE_INTERVAL * config.FPS)
-        max_history = len(self.eel.body) * positions_per_cell + 100
-        assert len(self.eel.body_history) <= max_history
+    def test_score(self):
+        for _ in range(3):
+            self.eel.tick()
+        assert self.eel.score == 0
+        self.eel.add_segment()
+        assert self.eel.score == 1
+
+    def test_draw_returns_rects(self):
+        screen = pygame.Surface((800, 800))
+        for _ in range(5):
+            self.eel.tick()
+        rects = self.eel.draw(screen, pygame.Rect(0, 0, 605, 605))
+        assert len(rects) == len(self.eel.body) + 2
+        assert all(isinstance(rect, pygame.Rect) for rect in rects)
+
+    def test_snapshot_restore(self):
+        for _ in range(5):
+            self.eel.tick()
+        self.eel.add_segment()
+        self.eel.queue_direction(DOWN)
+        self.eel.queue_direction(LEFT)
+        blob = self.eel.snapshot()
+
+        copy = Eel.from_snapshot(blob)
+        assert copy.body == self.eel.body
+        assert copy.get_head_position() == self.eel.get_head_position()
+        assert copy.direction_queue == self.eel.direction_queue
+        assert copy.previous_tail == self.eel.previous_tail
+
+        # Restaurer annule les ticks suivants
+        for _ in range(3):
+            self.eel.tick()
+        self.eel.restore(blob)
+        assert self.eel.snapshot() == blob
+        assert self.eel.is_cell_free(*copy.previous_tail)
+
+    def test_changed_rects_after_tick(self):
+        screen = pygame.Surface((800, 800))
+        bounds = pygame.Rect(0, 0, 605, 605)
+        for _ in range(5):
+            self.eel.tick()
+        self.eel.draw(screen, bounds)
+        assert self.eel.changed_rects(bounds) == []
+
+        self.eel.tick()
+        # Case libérée par la queue et nouveau segment à l'ancienne place de la tête
+        assert len(self.eel.changed_rects(bounds)) == 2
+
+    def test_draw_changed_matches_full_draw(self):
+        bounds = pygame.Rect(0, 0, 605, 605)
+        screen = pygame.Surface((800, 800))
+        for _ in range(5):
+            self.eel.tick()
+        self.eel.interpolate(0.5)
+        previous = self.eel.draw(screen, bounds)
+
+        self.eel.tick()
+        self.eel.interpolate(0.25)
+        erased = previous + self.eel.changed_rects(bounds)
+        for rect in erased:
+            screen.fill("black", rect)
+        rects = self.eel.draw_changed(screen, bounds, erased)
+        assert len(rects) < len(previous) + 2
+
+        expected = pygame.Surface((800, 800))
+        self.eel.draw(expected, bounds)
+        assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(expected, 'RGB')
 
     def test_methods_exist(self):
-        methods = ['add_segment', 'update_movement', 'get_head_position',
+        methods = ['add_segment', 'tick', 'interpolate', 'get_head_position',
                   'check_self_collision', 'is_out_of_bounds', 'set_pending_direction',
                   'get_pixel_position', 'draw']
 
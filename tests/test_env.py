@@ -0,0 +1,87 @@
+import random
+import pytest
+import numpy as np
+from eel.env import EelEnv, BODY, HEAD, FOOD
+
+
+class TestEelEnv:
+
+    def setup_method(self):
+        self.env = EelEnv(seed=0)
+
+    def _expected(self):
+        """Observation reconstruite depuis les tuples du corps"""
+        sim = self.env.simulation
+        expected = np.zeros_like(self.env.observation)
+        for x, y in sim.eel.body:
+            if sim.eel.occupancy.contains(x, y):
+                expected[BODY, y, x] = 1
+        if not sim.eel.is_out_of_bounds():
+            head_x, head_y = sim.get_head_position()
+            expected[HEAD, head_y, head_x] = 1
+        food_x, food_y = sim.food.get_position()
+        expected[FOOD, food_y, food_x] = 1
+        return expected
+
+    def test_reset(self):
+        observation, info = self.env.reset(seed=1)
+        assert observation.shape == (3, 11, 11)
+        assert observation[HEAD, 5, 5] == 1
+        assert observation[BODY].sum() == 0
+        assert observation[FOOD].sum() == 1
+        assert info["score"] == 0
+
+    def test_reset_seed_reproducible(self):
+        first = self.env.reset(seed=4)[0].copy()
+        assert (self.env.reset(seed=4)[0] == first).all()
+
+    def test_step_returns_same_array(self):
+        observation, _ = self.env.reset(seed=0)
+        result = self.env.step(None)
+        assert result[0] is observation
+        assert result[0][HEAD, 5, 6] == 1
+        assert result[0][BODY, 5, 5] == 1
+
+    def test_wall_terminates(self):
+        self.env.reset(seed=0)
+        self.env.simulation.food.x, self.env.simulation.food.y = (0, 0)
+        self.env._rebuild_observation()
+        for _ in range(5):
+            _, reward, terminated, _, _ = self.env.step(None)
+            assert reward == 0.0 and not terminated
+        _, reward, terminated, truncated, info = self.env.step(None)
+        assert reward == -1.0
+        assert terminated is True
+        assert truncated is False
+        assert info["result"] == "game_over"
+
+        # La tête est hors de la grille : plus de pas avant reset()
+        observation = self.env.observation.copy()
+        with pytest.raises(RuntimeError):
+            self.env.step(None)
+        assert (self.env.observation == observation).all()
+
+    def test_eating_rewards(self):
+        self.env.reset(seed=0)
+        self.env.simulation.food.x, self.env.simulation.food.y = (6, 5)
+        self.env._rebuild_observation()
+        observation, reward, _, _, info = self.env.step(None)
+        assert reward == 1.0
+        assert info["result"] == "ate"
+        assert (observation == self._expected()).all()
+
+    def test_truncated_after_max_steps(self):
+        env = EelEnv(max_steps=2, seed=0)
+        env.reset(seed=0)
+        env.simulation.food.x, env.simulation.food.y = (0, 0)
+        assert env.step(None)[3] is False
+        assert env.step(None)[3] is True
+
+    def test_incremental_matches_rebuild(self):
+        rng = random.Random(0)
+        for seed in range(20):
+            self.env.reset(seed=seed)
+            terminated = truncated = False
+            while not (terminated or truncated):
+                observation, _, terminated, truncated, _ = self.env.step(rng.randrange(4))
+                assert (observation == self._expected()).all()
@@ -2,6 +2,7 @@ import pytest
 import pygame
 from unittest.mock import patch
 from eel.food import Food
+from eel.occupancy import OccupancyGrid
 from eel import config
 
 
@@ -108,4 +109,40 @@ class TestFood:
         self.food.generate(avoid_positions)
 
         assert self.food.x == 8
-        assert self.food.y == 9
\ No newline at end of file
+        assert self.food.y == 9
+
+    def test_generate_full_board_returns_false(self):
+        avoid_positions = [(x, y) for x in range(11) for y in range(11)]
+        assert self.food.generate(avoid_positions) is False
+
+    def test_generate_nearly_full_board_finds_last_cell(self):
+        avoid_positions = [(x, y) for x in range(11) for y in range(11) if (x, y) != (7, 2)]
+        assert self.food.generate(avoid_positions) is True
+        assert self.food.get_position() == (7, 2)
+
+    def test_place_on_free_cell(self):
+        occupancy = OccupancyGrid(11, 11)
+        for x in range(11):
+            for y in range(11):
+                if (x, y) not in [(1, 1), (2, 2)]:
+                    occupancy.add(x, y)
+
+        for _ in range(20):
+            assert self.food.place(occupancy, exclude=(1, 1)) is True
+            assert self.food.get_position() == (2, 2)
+
+    def test_place_full_board_returns_false(self):
+        occupancy = OccupancyGrid(11, 11)
+        for x in range(11):
+            for y in range(11):
+                if (x, y) != (4, 4):
+                    occupancy.add(x, y)
+        assert self.food.place(occupancy, exclude=(4, 4)) is False
+
+    def test_generate_position_range_custom_board(self, monkeypatch):
+        monkeypatch.setattr(config, 'GRID_WIDTH', 40)
+        monkeypatch.setattr(config, 'GRID_HEIGHT', 3)
+        for _ in range(100):
+            self.food.generate()
+            assert 0 <= self.food.x < 40
+            assert 0 <= self.food.y < 3
@@ -1,10 +1,13 @@
+import os
 import pytest
 import pygame
 from unittest.mock import patch, MagicMock
 from eel.game import Game
-from eel.eel import Eel
+from eel.autopilot import PathfindingAutopilot
+from eel.eel import Eel, UP, DOWN, LEFT, RIGHT, direction_code
 from eel.food import Food
 from eel.grid import Grid
+from eel.simulation import Simulation
 from eel import config
 
 
@@ -56,77 +59,76 @@ class TestGame:
 
         assert self.game.running is False
 
-    @patch('pygame.event.get')
-    @patch('pygame.key.get_pressed')
-    def test_handle_events_keyboard_up(self, mock_get_pressed, mock_event_get):
-        mock_event_get.return_value = []
-
-        mock_keys = MagicMock()
-        mock_keys.__getitem__.side_effect = lambda key: key == pygame.K_z
-        mock_get_pressed.return_value = mock_keys
+    def _key_event(self, key):
+        event = MagicMock()
+        event.type = pygame.KEYDOWN
+        event.key = key
+        return event
 
-        with patch.object(self.game.eel, 'set_pending_direction') as mock_set_dir:
-            self.game.handle_events()
-            mock_set_dir.assert_called_once_with(pygame.Vector2(0, -1))
+    def _start_playing(self):
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
 
     @patch('pygame.event.get')
-    @patch('pygame.key.get_pressed')
-    def test_handle_events_keyboard_down(self, mock_get_pressed, mock_event_get):
-        mock_event_get.return_value = []
-
-        mock_keys = MagicMock()
-        mock_keys.__getitem__.side_effect = lambda key: key == pygame.K_s
-        mock_get_pressed.return_value = mock_keys
-
-        with patch.object(self.game.eel, 'set_pending_direction') as mock_set_dir:
-            self.game.handle_events()
-            mock_set_dir.assert_called_once_with(pygame.Vector2(0, 1))
+    def test_handle_events_keyboard_up(self, mock_event_get):
+        self._start_playing()
+        mock_event_get.return_value = [self._key_event(pygame.K_z)]
+        self.game.handle_events()
+        assert self.game.eel.direction_queue == [direction_code(UP)]
 
     @patch('pygame.event.get')
-    @patch('pygame.key.get_pressed')
-    def test_handle_events_keyboard_left(self, mock_get_pressed, mock_event_get):
-        mock_event_get.return_value = []
-
-        mock_keys = MagicMock()
-        mock_keys.__getitem__.side_effect = lambda key: key == pygame.K_q
-        mock_get_pressed.return_value = mock_keys
-
-        with patch.object(self.game.eel, 'set_pending_direction') as mock_set_dir:
-            self.game.handle_events()
-            mock_set_dir.assert_called_once_with(pygame.Vector2(-1, 0))
+    def test_handle_events_keyboard_down(self, mock_event_get):
+        self._start_playing()
+        mock_event_get.return_value = [self._key_event(pygame.K_s)]
+        self.game.handle_events()
+        assert self.game.eel.direction_queue == [direction_code(DOWN)]
 
     @patch('pygame.event.get')
-    @patch('pygame.key.get_pressed')
-    def test_handle_events_keyboard_right(self, mock_get_pressed, mock_event_get):
-        mock_event_get.return_value = []
-
-        mock_keys = MagicMock()
-        mock_keys.__getitem__.side_effect = lambda key: key == pygame.K_d
-        mock_get_pressed.return_value = mock_keys
-
-        with patch.object(self.game.eel, 'set_pending_direction') as mock_set_dir:
-            self.game.handle_events()
-            mock_set_dir.assert_called_once_with(pygame.Vector2(1, 0))
+    def test_handle_events_keyboard_left(self, mock_event_get):
+        self._start_playing()
+        # Demi-tour ignoré, mais accepté après un virage
+        mock_event_get.return_value = [self._key_event(pygame.K_q)]
+        self.game.handle_events()
+        assert self.game.eel.direction_queue == []
+        mock_event_get.return_value = [self._key_event(pygame.K_z), self._key_event(pygame.K_q)]
+        self.game.handle_events()
+        assert self.game.eel.direction_queue == [direction_code(UP), direction_code(LEFT)]
 
     @patch('pygame.event.get')
-    @patch('pygame.key.get_pressed')
-    def test_handle_events_arrow_keys(self, mock_get_pressed, mock_event_get):
-        mock_event_get.return_value = []
+    def test_handle_events_keyboard_right(self, mock_event_get):
+        self.game.state_manager.start_game()
+        mock_event_get.return_value = [self._key_event(pygame.K_d)]
+        self.game.handle_events()
+        assert self.game.state_manager.is_playing
+        assert self.game.eel.pending_direction == RIGHT
 
-        mock_keys = MagicMock()
-        mock_keys.__getitem__.side_effect = lambda key: key == pygame.K_UP
-        mock_get_pressed.return_value = mock_keys
+    @patch('pygame.event.get')
+    def test_handle_events_arrow_keys(self, mock_event_get):
+        self._start_playing()
+        mock_event_get.return_value = [self._key_event(pygame.K_UP)]
+        self.game.handle_events()
+        assert self.game.eel.direction_queue == [direction_code(UP)]
 
-        with patch.object(self.game.eel, 'set_pending_direction') as mock_set_dir:
-            self.game.handle_events()
-            mock_set_dir.assert_called_once_with(pygame.Vector2(0, -1))
+    @patch('pygame.event.get')
+    def test_quick_taps_not_dropped(self, mock_event_get, monkeypatch):
+        self._start_playing()
+        monkeypatch.setattr(config, 'MOVE_INTERVAL', config.SPEED_FAST)
+        # Deux appuis dans la même frame : chacun appliqué à son tick
+        mock_event_get.return_value = [self._key_event(pygame.K_z), self._key_event(pygame.K_q)]
+        self.game.handle_events()
+        self.game.dt = config.MOVE_INTERVAL
+        self.game.update()
+        assert self.game.eel.auto_direction == UP
+        self.game.update()
+        assert self.game.eel.auto_direction == LEFT
+        assert [code for _, code in self.game.recorder.inputs] == [0, 2]
 
     def test_update_start_delay_not_started(self):
         self.game.dt = 0.5
         self.game.start_timer = 1.0
         self.game.game_started = False
 
-        with patch.object(self.game.eel, 'update_movement') as mock_update:
+        with patch.object(Eel, 'update_movement') as mock_update:
             self.game.update()
             mock_update.assert_not_called()
             assert self.game.start_timer == 1.5
@@ -142,53 +144,117 @@ class TestGame:
         assert self.game.game_started is True
 
     def test_update_game_started(self):
-        self.game.game_started = True
-        self.game.dt = 0.016
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+        self.game.dt = config.MOVE_INTERVAL
 
-        with patch.object(self.game.eel, 'update_movement') as mock_update, \
+        with patch.object(Simulation, 'advance') as mock_advance, \
              patch.object(self.game, '_check_collisions') as mock_collisions:
             self.game.update()
 
-            mock_update.assert_called_once_with(0.016)
+            mock_advance.assert_called_once_with()
             mock_collisions.assert_called_once()
 
+    def test_update_fixed_timestep(self):
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+
+        with patch.object(Simulation, 'advance') as mock_advance, \
+             patch.object(self.game, '_check_collisions'):
+            # Frames courtes : un tick seulement quand l'intervalle est atteint
+            self.game.dt = config.MOVE_INTERVAL / 4
+            for _ in range(3):
+                self.game.update()
+            mock_advance.assert_not_called()
+            self.game.update()
+            assert mock_advance.call_count == 1
+
+            # Frame longue (gel) : plusieurs ticks rattrapés, plafonnés
+            self.game.dt = 10
+            self.game.update()
+            expected = 1 + int(config.MAX_FRAME_TIME / config.MOVE_INTERVAL + 1e-9)
+            assert mock_advance.call_count == expected
+
+    def test_update_autopilot_plays(self):
+        self.game.autopilot = PathfindingAutopilot()
+        self.game.state_manager.start_game()
+        self.game.dt = config.MOVE_INTERVAL
+
+        self.game.update()
+        assert self.game.state_manager.is_playing
+        for _ in range(50):
+            self.game.update()
+        assert self.game.state_manager.is_playing
+        assert self.game.simulation.ticks == 51
+        assert self.game.recorder.inputs
+
+    def test_update_frame_rate_independent(self):
+        positions = []
+        for frame_time in (1 / 30, 1 / 144):
+            self.game._init_game_components()
+            self.game.state_manager.start_game()
+            self.game.state_manager.begin_playing()
+            self.game.food.x, self.game.food.y = (0, 0)
+            self.game.eel.start_movement((0, 1))
+            self.game.dt = frame_time
+            frames = round(3 * config.MOVE_INTERVAL / frame_time) + 1
+            for _ in range(frames):
+                self.game.update()
+            positions.append((self.game.eel.get_head_position(), self.game.eel.body))
+        assert positions[0] == positions[1]
+
     def test_check_collisions_out_of_bounds(self):
         self.game.game_started = True
 
-        with patch.object(self.game.eel, 'is_out_of_bounds', return_value=True):
+        with patch.object(Eel, 'is_out_of_bounds', return_value=True):
             self.game._check_collisions()
             assert self.game.running is False
 
     def test_check_collisions_self_collision(self):
         self.game.game_started = True
 
-        with patch.object(self.game.eel, 'is_out_of_bounds', return_value=False), \
-             patch.object(self.game.eel, 'check_self_collision', return_value=True):
+        with patch.object(Eel, 'is_out_of_bounds', return_value=False), \
+             patch.object(Eel, 'check_self_collision', return_value=True):
             self.game._check_collisions()
             assert self.game.running is False
 
     def test_check_collisions_food_collision(self):
         self.game.game_started = True
 
-        with patch.object(self.game.eel, 'is_out_of_bounds', return_value=False), \
-             patch.object(self.game.eel, 'check_self_collision', return_value=False), \
-             patch.object(self.game.eel, 'get_head_position', return_value=(5, 5)), \
-             patch.object(self.game.food, 'get_position', return_value=(5, 5)), \
-             patch.object(self.game.eel, 'add_segment') as mock_add_segment, \
-             patch.object(self.game.food, 'generate') as mock_generate:
+        with patch.object(Eel, 'is_out_of_bounds', return_value=False), \
+             patch.object(Eel, 'check_self_collision', return_value=False), \
+             patch.object(Eel, 'get_head_position', return_value=(5, 5)), \
+             patch.object(Food, 'get_position', return_value=(5, 5)), \
+             patch.object(Eel, 'add_segment') as mock_add_segment, \
+             patch.object(Food, 'place', return_value=True) as mock_place:
 
             self.game._check_collisions()
 
             mock_add_segment.assert_called_once()
-            mock_generate.assert_called_once()
+            mock_place.assert_called_once_with(self.game.eel.occupancy, (5, 5))
+
+    def test_check_collisions_board_full_wins(self):
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+
+        with patch.object(Eel, 'is_out_of_bounds', return_value=False), \
+             patch.object(Eel, 'check_self_collision', return_value=False), \
+             patch.object(Eel, 'get_head_position', return_value=(5, 5)), \
+             patch.object(Food, 'get_position', return_value=(5, 5)), \
+             patch.object(Food, 'place', return_value=False):
+
+            self.game._check_collisions()
+
+            assert self.game.state_manager.is_game_over
+            assert self.game.state_manager.won is True
 
     def test_check_collisions_no_collision(self):
         self.game.game_started = True
 
-        with patch.object(self.game.eel, 'is_out_of_bounds', return_value=False), \
-             patch.object(self.game.eel, 'check_self_collision', return_value=False), \
-             patch.object(self.game.eel, 'get_head_position', return_value=(5, 5)), \
-             patch.object(self.game.food, 'get_position', return_value=(3, 3)):
+        with patch.object(Eel, 'is_out_of_bounds', return_value=False), \
+             patch.object(Eel, 'check_self_collision', return_value=False), \
+             patch.object(Eel, 'get_head_position', return_value=(5, 5)), \
+             patch.object(Food, 'get_position', return_value=(3, 3)):
 
             original_running = self.game.running
             self.game._check_collisions()
@@ -198,15 +264,15 @@ class TestGame:
     def test_draw_method_calls(self, mock_flip):
         with patch.object(self.game.screen, 'fill') as mock_fill, \
              patch.object(self.game.grid, 'draw') as mock_grid_draw, \
-             patch.object(self.game.food, 'draw') as mock_food_draw, \
-             patch.object(self.game.eel, 'draw') as mock_eel_draw, \
+             patch.object(Food, 'draw') as mock_food_draw, \
+             patch.object(Eel, 'draw') as mock_eel_draw, \
              patch.object(self.game.grid, 'get_bounds') as mock_get_bounds:
 
             mock_get_bounds.return_value = pygame.Rect(0, 0, 100, 100)
 
             self.game.draw()
 
-            mock_fill.assert_called_once_with(config.BG_COLOR)
+            mock_fill.assert_not_called()
             mock_grid_draw.assert_called_once_with(self.game.screen, config.CELL_SIZE)
             mock_food_draw.assert_called_once()
             mock_eel_draw.assert_called_once()
@@ -219,4 +285,180 @@ class TestGame:
     def test_initial_food_avoids_snake(self):
         eel_pos = self.game.eel.get_head_position()
         food_pos = self.game.food.get_position()
-        assert eel_pos != food_pos
\ No newline at end of file
+        assert eel_pos != food_pos
+
+
+class TestGameDirtyRendering:
+
+    def setup_method(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        self.game = Game()
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def _play_frames(self, count):
+        for _ in range(count):
+            self.game.dt = 1 / config.FPS
+            self.game.update()
+            self.game.draw()
+
+    def test_snapshot_restore(self):
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+        self.game.recorder.record(0, DOWN)
+        self.game.simulation.step(DOWN)
+        blob = self.game.snapshot()
+        head = self.game.eel.get_head_position()
+
+        self.game.simulation.step()
+        self.game.state_manager.game_over()
+        self.game.restore(blob)
+
+        assert self.game.state_manager.is_playing
+        assert self.game.eel.get_head_position() == head
+        assert self.game.eel is self.game.simulation.eel
+        assert self.game.recorder.inputs == [(0, direction_code(DOWN))]
+        assert self.game.snapshot() == blob
+
+    def test_game_over_records_score(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, 'SCORES_DB', str(tmp_path / "scores.db"))
+        game = Game()
+        game.scores.record(50, 54, 10.0, config.MOVE_INTERVAL, 1)
+        game.scores.flush()
+        game.state_manager.start_game()
+        game.state_manager.begin_playing()
+        game.simulation.step(DOWN)
+        with patch.object(Eel, 'is_out_of_bounds', return_value=True):
+            game._check_collisions()
+
+        assert game.state_manager.is_game_over
+        assert game.leaderboard == [50, 0]
+        game.scores.flush()
+        last = game.scores.top(2)[1]
+        assert (last.score, last.seed, last.duration) == (0, game.seed, config.MOVE_INTERVAL)
+        game.scores.close()
+
+    def test_dirty_frames_match_full_redraw(self):
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+        self.game.eel.start_movement(pygame.Vector2(0, 1))
+        self._play_frames(40)
+
+        dirty_frame = pygame.image.tobytes(self.game.screen, 'RGB')
+        self.game._draw_full()
+        assert pygame.image.tobytes(self.game.screen, 'RGB') == dirty_frame
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_flip_only_on_state_change(self, mock_flip, mock_update):
+        self.game.draw()
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+        self._play_frames(5)
+
+        assert mock_flip.call_count == 2
+        assert mock_update.call_count == 4
+
+    @patch('pygame.display.update')
+    @patch('pygame.display.flip')
+    def test_idle_menu_draws_nothing(self, mock_flip, mock_update):
+        for _ in range(5):
+            self.game.draw()
+
+        assert mock_flip.call_count == 1
+        mock_update.assert_not_called()
+
+    @patch('pygame.display.flip')
+    def test_speed_change_redraws_menu(self, mock_flip):
+        self.game.draw()
+        self.game._handle_mouse_click(self.game.menu.speed_fast_rect.center)
+        self.game.draw()
+        assert mock_flip.call_count == 2
+
+    @patch('pygame.display.flip')
+    def test_full_mode_always_flips(self, mock_flip, monkeypatch):
+        monkeypatch.setattr(config, 'DIRTY_RECTS', False)
+        for _ in range(3):
+            self.game.draw()
+        assert mock_flip.call_count == 3
+
+
+class TestGameArena:
+
+    def _arena_game(self, monkeypatch, humans=1, ai_eels=8):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        for name in ('GRID_WIDTH', 'GRID_HEIGHT', 'CELL_SIZE', 'PLAYER_RADIUS', 'FOOD_RADIUS'):
+            monkeypatch.setattr(config, name, getattr(config, name))
+        monkeypatch.setattr(config, 'ARENA', True)
+        monkeypatch.setattr(config, 'ARENA_WIDTH', 60)
+        monkeypatch.setattr(config, 'ARENA_HEIGHT', 40)
+        monkeypatch.setattr(config, 'ARENA_HUMANS', humans)
+        monkeypatch.setattr(config, 'ARENA_AI_EELS', ai_eels)
+        monkeypatch.setattr(config, 'ARENA_FOOD', 10)
+        self.game = Game()
+        return self.game
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def _play_frames(self, count):
+        for _ in range(count):
+            self.game.dt = 1 / config.FPS
+            self.game.update()
+            self.game.draw()
+            if not self.game.state_manager.is_playing:
+                break
+
+    def test_arena_populated(self, monkeypatch):
+        game = self._arena_game(monkeypatch, humans=2)
+        assert len(game.arena) == 10
+        assert (config.GRID_WIDTH, config.GRID_HEIGHT) == (60, 40)
+        assert game.eel is game.arena.eels[game.human_ids[0]]
+        assert [eel.color for eel in game.human_eels] == list(config.ARENA_HUMAN_COLORS)
+
+    def test_keys_steer_each_player(self, monkeypatch):
+        game = self._arena_game(monkeypatch, humans=2)
+        game.state_manager.start_game()
+        first, second = game.human_eels
+        turn = UP if first.direction in (direction_code(LEFT), direction_code(RIGHT)) else LEFT
+        game._handle_key_down(pygame.K_UP if turn == UP else pygame.K_LEFT)
+        assert game.state_manager.is_playing
+        assert list(first.direction_queue) == [direction_code(turn)]
+        assert not second.direction_queue
+
+        turn = UP if second.direction in (direction_code(LEFT), direction_code(RIGHT)) else LEFT
+        game._handle_key_down(pygame.K_z if turn == UP else pygame.K_q)
+        assert list(second.direction_queue) == [direction_code(turn)]
+
+    def test_ai_eels_respawn(self, monkeypatch):
+        game = self._arena_game(monkeypatch)
+        game.state_manager.start_game()
+        game.state_manager.begin_playing()
+        ai_id = game.ai_seats[0].player_id
+        game.arena.remove_player(ai_id)
+        game._respawn_arena_ai()
+        assert game.ai_seats[0].player_id not in (None, ai_id)
+        assert len(game.arena) == 9
+
+    def test_game_over_when_players_die(self, monkeypatch):
+        game = self._arena_game(monkeypatch)
+        game.state_manager.start_game()
+        game.state_manager.begin_playing()
+        # Sortir de la grille au prochain tick
+        eel = game.eel
+        game.arena._heads.pop(eel.get_head_position(), None)
+        eel.target_grid_x = eel.previous_grid_x = 0
+        eel.direction = direction_code(LEFT)
+        game.dt = config.MOVE_INTERVAL
+        game.update()
+        assert game.state_manager.is_game_over
+        assert game._calculate_final_score() == eel.score
+
+    def test_frames_advance_all_eels(self, monkeypatch):
+        game = self._arena_game(monkeypatch)
+        game.state_manager.start_game()
+        game.state_manager.begin_playing()
+        self._play_frames(int(config.FPS * config.MOVE_INTERVAL) + 2)
+        assert game.arena.ticks >= 1
+        assert len(game.arena) == 9 or not game.state_manager.is_playing
@@ -1,6 +1,8 @@
 import pytest
 import pygame
-from eel.grid import Grid
+from unittest.mock import patch
+from eel.grid import Grid, fit_board
+from eel import config
 
 
 class TestGrid:
@@ -36,6 +38,57 @@ class TestGrid:
         bounds = self.grid.get_bounds()
         assert bounds.center == self.screen_center
 
+    def test_bounds_follow_board_size(self, monkeypatch):
+        monkeypatch.setattr(config, 'GRID_WIDTH', 20)
+        monkeypatch.setattr(config, 'GRID_HEIGHT', 8)
+        grid = Grid(self.screen_center)
+        assert grid.bounds.width == 20 * config.CELL_SIZE - 1
+        assert grid.bounds.height == 8 * config.CELL_SIZE - 1
+
     def test_draw_method_exists(self):
         assert hasattr(self.grid, 'draw')
-        assert callable(getattr(self.grid, 'draw'))
\ No newline at end of file
+        assert callable(getattr(self.grid, 'draw'))
+
+    def test_draw_blits_layer(self):
+        screen = pygame.Surface((1280, 720))
+        self.grid.draw(screen, config.CELL_SIZE)
+        assert screen.get_at((0, 0)) == pygame.Color(config.BG_COLOR)
+        assert screen.get_at(self.grid.bounds.topleft) == pygame.Color(config.GRID_BORDER_COLOR)
+
+    def test_layer_built_once(self):
+        screen = pygame.Surface((1280, 720))
+        with patch('pygame.draw.line') as mock_line:
+            self.grid.draw(screen, config.CELL_SIZE)
+            calls = mock_line.call_count
+            self.grid.draw(screen, config.CELL_SIZE)
+            self.grid.draw(screen, config.CELL_SIZE)
+            assert calls > 0
+            assert mock_line.call_count == calls
+
+    def test_layer_rebuilt_on_change(self, monkeypatch):
+        screen = pygame.Surface((1280, 720))
+        first_layer = self.grid.get_layer(screen.get_size(), config.CELL_SIZE)
+        assert self.grid.get_layer(screen.get_size(), config.CELL_SIZE) is first_layer
+
+        monkeypatch.setattr(config, 'GRID_LINE_COLOR', "white")
+        assert self.grid.get_layer(screen.get_size(), config.CELL_SIZE) is not first_layer
+        assert self.grid.get_layer((800, 600), config.CELL_SIZE).get_size() == (800, 600)
+
+
+class TestFitBoard:
+
+    def test_large_board_shrinks_cells(self, monkeypatch):
+        for name in ('GRID_WIDTH', 'GRID_HEIGHT', 'CELL_SIZE', 'PLAYER_RADIUS', 'FOOD_RADIUS'):
+            monkeypatch.setattr(config, name, getattr(config, name))
+        fit_board(200, 200)
+        assert (config.GRID_WIDTH, config.GRID_HEIGHT) == (200, 200)
+        assert config.CELL_SIZE * 200 <= config.SCREEN_HEIGHT
+        assert 1 <= config.PLAYER_RADIUS <= config.CELL_SIZE
+
+    def test_small_board_keeps_cells(self, monkeypatch):
+        for name in ('GRID_WIDTH', 'GRID_HEIGHT', 'CELL_SIZE', 'PLAYER_RADIUS', 'FOOD_RADIUS'):
+            monkeypatch.setattr(config, name, getattr(config, name))
+        cell_size, radius = config.CELL_SIZE, config.PLAYER_RADIUS
+        fit_board(5, 5)
+        assert config.CELL_SIZE == cell_size
+        assert config.PLAYER_RADIUS == radius
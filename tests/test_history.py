@@ -0,0 +1,85 @@
+import pytest
+from eel.history import PositionHistory
+
+
+class TestPositionHistory:
+
+    def setup_method(self):
+        self.history = PositionHistory(4)
+
+    def test_init_empty(self):
+        assert len(self.history) == 0
+        assert self.history.capacity == 4
+
+    def test_append_and_index(self):
+        self.history.append(1, 2)
+        self.history.append(3, 4)
+        assert len(self.history) == 2
+        assert self.history[0] == (1, 2)
+        assert self.history[-1] == (3, 4)
+        assert self.history.x_at(-2) == 1
+        assert self.history.y_at(1) == 4
+
+    def test_overwrites_oldest_when_full(self):
+        for i in range(6):
+            self.history.append(i, i)
+        assert len(self.history) == 4
+        assert self.history[0] == (2, 2)
+        assert self.history[-1] == (5, 5)
+
+    def test_index_out_of_range(self):
+        self.history.append(1, 1)
+        with pytest.raises(IndexError):
+            self.history[1]
+        with pytest.raises(IndexError):
+            self.history.x_at(-2)
+
+    def test_resize_keeps_newest(self):
+        for i in range(6):
+            self.history.append(i, i)
+        self.history.resize(2)
+        assert len(self.history) == 2
+        assert self.history[0] == (4, 4)
+        self.history.resize(5)
+        self.history.append(6, 6)
+        assert len(self.history) == 3
+        assert self.history[-1] == (6, 6)
+
+    def test_grow_doubles_buffer(self):
+        for i in range(4):
+            self.history.append(i, i)
+        self.history.grow()
+        buffer = self.history._xs
+        assert len(buffer) == 8
+        for _ in range(3):
+            self.history.grow()
+        # Capacité 8 : le même tampon, sans nouvelle allocation
+        assert self.history._xs is buffer
+        for i in range(4, 12):
+            self.history.append(i, i)
+        assert self.history.capacity == 8
+        assert list(self.history.ordered()[0]) == list(range(4, 12))
+
+    def test_shrink_after_wrap(self):
+        for i in range(6):
+            self.history.append(i, i)
+        self.history.resize(3)
+        self.history.append(6, 6)
+        assert [self.history[i] for i in range(3)] == [(4, 4), (5, 5), (6, 6)]
+
+    def test_ordered_oldest_first(self):
+        for i in range(6):
+            self.history.append(i, 10 + i)
+        xs, ys = self.history.ordered()
+        assert list(xs) == [2, 3, 4, 5]
+        assert list(ys) == [12, 13, 14, 15]
+
+    def test_zero_capacity_ignores_append(self):
+        history = PositionHistory()
+        history.append(1, 1)
+        assert len(history) == 0
+
+    def test_clear(self):
+        self.history.append(1, 1)
+        self.history.clear()
+        assert len(self.history) == 0
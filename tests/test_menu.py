@@ -0,0 +1,89 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from eel.menu import Menu
+from eel.scores import ScoreStore
+from eel import config
+
+
+class TestMenu:
+
+    def setup_method(self):
+        pygame.init()
+        self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.menu = Menu(self.screen, pygame.font.Font(None, 36))
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def test_draw_overlay_darkens_screen(self):
+        self.screen.fill("white")
+        self.menu.draw_overlay(128)
+        assert self.screen.get_at((0, 0)).r < 255
+
+    def test_overlay_cached_per_alpha(self):
+        self.menu.draw_overlay(128)
+        overlay = self.menu._overlay
+        with patch('pygame.Surface') as mock_surface:
+            self.menu.draw_overlay(128)
+            mock_surface.assert_not_called()
+        assert self.menu._overlay is overlay
+        self.menu.draw_overlay(64)
+        assert self.menu._overlay is not overlay
+
+    def test_main_menu_frame_cached(self):
+        self.menu.draw_main_menu()
+        frame = self.menu._frame
+        with patch('pygame.Surface') as mock_surface:
+            self.menu.draw_main_menu()
+            self.menu.draw_main_menu()
+            mock_surface.assert_not_called()
+        assert self.menu._frame is frame
+
+    def test_main_menu_frame_rebuilt_on_speed_change(self):
+        self.menu.draw_main_menu()
+        frame = self.menu._frame
+        self.menu.handle_click(self.menu.speed_fast_rect.center)
+        self.menu.draw_main_menu()
+        assert self.menu._frame is not frame
+
+    def test_main_menu_shows_selected_speed(self):
+        self.menu.selected_speed = config.SPEED_FAST
+        self.menu.draw_main_menu()
+        inside = (self.menu.speed_fast_rect.left + 5, self.menu.speed_fast_rect.top + 5)
+        assert self.screen.get_at(inside) == pygame.Color("green")
+
+    def test_game_over_frame_rebuilt_on_score_change(self):
+        self.menu.draw_game_over(3)
+        frame = self.menu._frame
+        self.menu.draw_game_over(3)
+        assert self.menu._frame is frame
+        self.menu.draw_game_over(4)
+        assert self.menu._frame is not frame
+
+    def test_main_menu_shows_best_score_per_speed(self, tmp_path):
+        store = ScoreStore(str(tmp_path / "scores.db"))
+        store.record_many([(7, 11, 1.0, config.SPEED_NORMAL, 1, False), (3, 7, 1.0, config.SPEED_FAST, 2, False)])
+        store.flush()
+        self.menu.scores = store
+        self.menu.draw_main_menu()
+        assert self.menu._frame_key[2] == 7
+        self.menu.handle_click(self.menu.speed_fast_rect.center)
+        self.menu.draw_main_menu()
+        assert self.menu._frame_key[2] == 3
+        store.close()
+
+    def test_game_over_frame_rebuilt_on_leaderboard_change(self):
+        self.menu.draw_game_over(3, leaderboard=[5, 3])
+        frame = self.menu._frame
+        self.menu.draw_game_over(3, leaderboard=[5, 3])
+        assert self.menu._frame is frame
+        self.menu.draw_game_over(3, leaderboard=[6, 5, 3])
+        assert self.menu._frame is not frame
+
+    def test_handle_click_play(self):
+        assert self.menu.handle_click(self.menu.play_button_rect.center) == "play"
+
+    def test_handle_game_over_click(self):
+        assert self.menu.handle_game_over_click(self.menu.restart_button_rect.center) == "restart"
+        assert self.menu.handle_game_over_click((0, 0)) is None
@@ -0,0 +1,94 @@
+import random
+import pytest
+from eel.occupancy import OccupancyGrid
+
+
+class TestOccupancyGrid:
+
+    def setup_method(self):
+        self.grid = OccupancyGrid(11, 11)
+
+    def test_init_empty(self):
+        for x in range(11):
+            for y in range(11):
+                assert self.grid.is_free(x, y)
+
+    def test_add_and_remove(self):
+        self.grid.add(3, 4)
+        assert self.grid.is_occupied(3, 4)
+        assert not self.grid.is_free(3, 4)
+        self.grid.remove(3, 4)
+        assert self.grid.is_free(3, 4)
+
+    def test_counts_overlapping_segments(self):
+        self.grid.add(2, 2)
+        self.grid.add(2, 2)
+        self.grid.remove(2, 2)
+        assert self.grid.is_occupied(2, 2)
+
+    def test_out_of_grid_ignored(self):
+        self.grid.add(-10, -10)
+        self.grid.remove(-10, -10)
+        assert not self.grid.is_occupied(-10, -10)
+        assert not self.grid.is_free(11, 0)
+
+    def test_move(self):
+        self.grid.add(1, 1)
+        self.grid.move(1, 1, 1, 2)
+        assert self.grid.is_free(1, 1)
+        assert self.grid.is_occupied(1, 2)
+
+    def test_clear(self):
+        self.grid.add(1, 1)
+        self.grid.clear()
+        assert self.grid.is_free(1, 1)
+
+    def test_free_count(self):
+        assert self.grid.free_count() == 121
+        self.grid.add(1, 1)
+        self.grid.add(1, 1)
+        assert self.grid.free_count() == 120
+        self.grid.remove(1, 1)
+        assert self.grid.free_count() == 120
+        self.grid.remove(1, 1)
+        assert self.grid.free_count() == 121
+
+    def test_random_free_cell_only_free(self):
+        rng = random.Random(0)
+        for x in range(11):
+            for y in range(11):
+                if (x + y) % 3:
+                    self.grid.add(x, y)
+
+        for _ in range(200):
+            x, y = self.grid.random_free_cell(rng)
+            assert (x + y) % 3 == 0
+
+    def test_random_free_cell_exclude(self):
+        rng = random.Random(0)
+        for x in range(11):
+            for y in range(11):
+                if (x, y) not in [(0, 0), (10, 10)]:
+                    self.grid.add(x, y)
+
+        for _ in range(20):
+            assert self.grid.random_free_cell(rng, exclude=(0, 0)) == (10, 10)
+            assert self.grid.random_free_cell(rng, exclude=(10, 10)) == (0, 0)
+
+    def test_random_free_cell_full(self):
+        for x in range(11):
+            for y in range(11):
+                self.grid.add(x, y)
+        assert self.grid.random_free_cell(random.Random(0)) is None
+
+    def test_snapshot_keeps_free_cell_order(self):
+        for cell in [(3, 4), (0, 0), (7, 2)]:
+            self.grid.add(*cell)
+        self.grid.remove(0, 0)
+        copy = OccupancyGrid.from_snapshot(self.grid.snapshot())
+
+        assert copy.free_count() == self.grid.free_count()
+        assert copy.is_occupied(3, 4) and copy.is_free(0, 0)
+        rng_a, rng_b = random.Random(5), random.Random(5)
+        for _ in range(20):
+            assert copy.random_free_cell(rng_a) == self.grid.random_free_cell(rng_b)
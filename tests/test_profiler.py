@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+import pygame
+from unittest.mock import patch
+from eel import config
+from eel.game import Game
+from eel.profiler import FrameProfiler, PHASES
+
+
+class TestFrameProfiler:
+
+    def setup_method(self):
+        self.profiler = FrameProfiler(capacity=4)
+
+    def _frame(self, update_ns):
+        self.profiler.begin_frame()
+        self.profiler.add("update", update_ns)
+        self.profiler.end_frame()
+
+    def test_init_empty(self):
+        assert len(self.profiler) == 0
+        assert self.profiler.percentiles("update") == [0, 0, 0]
+
+    def test_measure_records_phase(self):
+        self.profiler.begin_frame()
+        assert self.profiler.measure("events", lambda: 42) == 42
+        self.profiler.end_frame()
+        assert self.profiler.samples("events")[0] > 0
+        assert self.profiler.samples("frame")[0] >= self.profiler.samples("events")[0]
+
+    def test_ring_buffer_keeps_newest(self):
+        for value in range(1, 7):
+            self._frame(value)
+        assert len(self.profiler) == 4
+        assert list(self.profiler.samples("update")) == [3, 4, 5, 6]
+        assert self.profiler.frames == 6
+
+    def test_percentiles(self):
+        profiler = FrameProfiler(capacity=100)
+        for value in range(100):
+            profiler.begin_frame()
+            profiler.add("update", value)
+            profiler.end_frame()
+        assert profiler.percentiles("update") == [50, 95, 99]
+        assert profiler.summary()["update"]["p99"] == 99 / 1e6
+
+    def test_draw_excludes_present(self):
+        self.profiler.begin_frame()
+        self.profiler.add("draw", 100)
+        self.profiler.add("present", 30)
+        self.profiler.end_frame()
+        assert self.profiler.samples("draw")[0] == 70
+        assert self.profiler.samples("present")[0] == 30
+
+    def test_dump_json(self, tmp_path):
+        for value in range(3):
+            self._frame(value)
+        path = tmp_path / "trace.json"
+        self.profiler.dump(str(path))
+        trace = json.loads(path.read_text())
+        assert trace["frames"] == 3
+        assert trace["samples_ns"]["update"] == [0, 1, 2]
+        assert set(trace["summary_ms"]) == set(PHASES)
+
+    def test_dump_csv(self, tmp_path):
+        for value in range(3):
+            self._frame(value)
+        path = tmp_path / "trace.csv"
+        self.profiler.dump(str(path))
+        rows = list(csv.reader(path.open()))
+        assert rows[0] == [f"{phase}_ns" for phase in PHASES]
+        assert [row[PHASES.index("update")] for row in rows[1:]] == ["0", "1", "2"]
+
+
+class TestGameProfiling:
+
+    def setup_method(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        with patch.object(config, 'PROFILE', True):
+            self.game = Game()
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def test_disabled_by_default(self):
+        game = Game()
+        assert game.profiler is None
+
+    def test_profiled_frame(self):
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+        for _ in range(3):
+            self.game.dt = 1 / config.FPS
+            self.game._run_profiled_frame()
+        profiler = self.game.profiler
+        assert len(profiler) == 3
+        assert all(value > 0 for value in profiler.samples("present"))
+        assert all(value > 0 for value in profiler.samples("draw"))
+
+    def test_f3_toggles_hud(self):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+        self.game.handle_events()
+        assert self.game.profiler.hud_visible is True
+
+    def test_hud_drawn_and_erased(self):
+        self.game.profiler.toggle_hud()
+        self.game.state_manager.start_game()
+        self.game.state_manager.begin_playing()
+        for _ in range(3):
+            self.game._run_profiled_frame()
+        hud_rect = self.game._dirty_rects[-1]
+        assert hud_rect.right == self.game.screen.get_width() - 20
+
+    def test_trace_written_on_exit(self, tmp_path):
+        path = tmp_path / "trace.json"
+        self.game.running = False
+        with patch.object(config, 'PROFILE_TRACE', str(path)):
+            self.game.run()
+        assert path.exists()
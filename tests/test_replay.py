@@ -0,0 +1,91 @@
+import os
+import pytest
+import pygame
+from eel.replay import Replay, ReplayRecorder, _read_varint, _write_varint
+from eel.simulation import Simulation, UP, DOWN, LEFT, RIGHT
+from eel import config
+
+
+class TestReplay:
+
+    def test_varint_roundtrip(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 21, 2 ** 40):
+            data = bytearray()
+            _write_varint(data, value)
+            assert _read_varint(data, 0) == (value, len(data))
+
+    def test_roundtrip(self):
+        recorder = ReplayRecorder(1234, 11, 11)
+        recorder.record(0, DOWN)
+        recorder.record(3, pygame.Vector2(-1, 0))
+        recorder.record(300, UP)
+
+        replay = Replay.from_bytes(recorder.to_bytes(500))
+        assert (replay.seed, replay.width, replay.height, replay.end_tick) == (1234, 11, 11, 500)
+        assert replay.inputs == [(0, 1), (3, 2), (300, 0)]
+
+    def test_invalid_file(self):
+        with pytest.raises(ValueError):
+            Replay.from_bytes(b"NOPE" + bytes(30))
+
+    def test_compact_size(self):
+        recorder = ReplayRecorder(1, 11, 11)
+        for tick in range(0, 4000, 4):
+            recorder.record(tick, (DOWN, LEFT, UP, RIGHT)[(tick // 4) % 4])
+        assert len(recorder.to_bytes(4000)) < 1100
+
+    def test_play_reproduces_game(self, tmp_path):
+        seed = 99
+        simulation = Simulation(seed=seed)
+        recorder = ReplayRecorder(seed, simulation.width, simulation.height)
+        moves = {0: DOWN, 2: LEFT, 5: UP, 7: RIGHT, 9: DOWN, 14: LEFT}
+        while simulation.alive and simulation.ticks < 40:
+            if simulation.ticks in moves:
+                simulation.eel.set_pending_direction(moves[simulation.ticks])
+                recorder.record(simulation.ticks, moves[simulation.ticks])
+            simulation.step()
+
+        path = tmp_path / "game.eelr"
+        recorder.save(path, simulation.ticks)
+        replayed = Replay.load(path).play()
+
+        assert replayed.ticks == simulation.ticks
+        assert replayed.alive == simulation.alive
+        assert replayed.eel.body == simulation.eel.body
+        assert replayed.food.get_position() == simulation.food.get_position()
+
+
+class TestGameReplay:
+
+    def setup_method(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        from eel.game import Game
+        self.game = Game()
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def _press(self, key):
+        self.game._handle_key_down(key)
+
+    def test_game_replay_matches(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, 'REPLAY_DIR', str(tmp_path))
+        self.game.state_manager.start_game()
+        self._press(pygame.K_s)
+        script = {2: pygame.K_q, 4: pygame.K_z, 6: pygame.K_d}
+
+        self.game.dt = config.MOVE_INTERVAL
+        while self.game.state_manager.is_playing:
+            ticks = self.game.simulation.ticks
+            if ticks in script:
+                # Même touche appuyée deux fois : une seule entrée enregistrée
+                self._press(script[ticks])
+                self._press(script[ticks])
+            self.game.update()
+
+        replay = Replay.load(tmp_path / f"{self.game.seed}.eelr")
+        assert len(replay.inputs) == 4
+        replayed = replay.play()
+        assert replayed.ticks == self.game.simulation.ticks
+        assert replayed.score == self.game.simulation.score
+        assert replayed.eel.body == self.game.eel.body
@@ -0,0 +1,119 @@
+import sqlite3
+import time
+import pytest
+from unittest.mock import patch
+from eel.scores import ScoreStore
+
+
+class TestScoreStore:
+
+    def setup_method(self):
+        self.store = None
+
+    def teardown_method(self):
+        if self.store is not None:
+            self.store.close()
+
+    def _open(self, tmp_path, **kwargs):
+        self.store = ScoreStore(str(tmp_path / "scores.db"), **kwargs)
+        return self.store
+
+    def test_record_and_top(self, tmp_path):
+        store = self._open(tmp_path)
+        store.record(5, 9, 3.0, 0.2, 11)
+        store.record(12, 16, 8.0, 0.2, 12, won=True)
+        store.record(7, 11, 2.0, 0.1, 13)
+        store.flush()
+
+        top = store.top(2)
+        assert [result.score for result in top] == [12, 7]
+        assert (top[0].length, top[0].duration, top[0].speed, top[0].seed, top[0].won) == (16, 8.0, 0.2, 12, True)
+
+    def test_top_per_speed(self, tmp_path):
+        store = self._open(tmp_path)
+        store.record_many([(5, 9, 3.0, 0.2, 1, False), (12, 16, 8.0, 0.2, 2, False), (30, 34, 4.0, 0.1, 3, False)])
+        store.flush()
+        assert [result.score for result in store.top(10, speed=0.2)] == [12, 5]
+        assert store.best_score(0.1) == 30
+        assert store.best_score(0.3) == 0
+
+    def test_ties_keep_oldest_first(self, tmp_path):
+        store = self._open(tmp_path)
+        store.record_many([(4, 8, 1.0, 0.2, seed, False) for seed in range(3)])
+        store.flush()
+        assert [result.seed for result in store.top(3)] == [0, 1, 2]
+
+    def test_record_does_not_block_on_locked_database(self, tmp_path):
+        store = self._open(tmp_path)
+        # Une autre connexion verrouille la base : seul le thread d'écriture attend
+        blocker = sqlite3.connect(store.path, isolation_level=None)
+        blocker.execute("BEGIN EXCLUSIVE")
+        start = time.perf_counter()
+        store.record(1, 5, 1.0, 0.2, 1)
+        assert time.perf_counter() - start < 0.05
+        blocker.execute("COMMIT")
+        blocker.close()
+
+        store.flush()
+        assert store.best_score() == 1
+
+    def test_batched_writes(self, tmp_path):
+        store = self._open(tmp_path, batch_size=100)
+        store.record_many([(score, 5, 1.0, 0.2, score, False) for score in range(1000)])
+        store.flush()
+        assert store.stats()["games"] == 1000
+        assert store.top(1)[0].score == 999
+
+    def test_close_writes_pending(self, tmp_path):
+        store = self._open(tmp_path)
+        store.record(9, 13, 1.0, 0.2, 1)
+        store.close()
+        self.store = None
+
+        reopened = self._open(tmp_path)
+        assert reopened.best_score() == 9
+
+    def test_stats(self, tmp_path):
+        store = self._open(tmp_path)
+        store.record_many([(2, 6, 1.5, 0.2, 1, False), (4, 8, 2.5, 0.2, 2, False), (9, 13, 1.0, 0.1, 3, False)])
+        store.flush()
+        assert store.stats(0.2) == {"games": 2, "mean_score": 3.0, "duration": 4.0}
+        assert store.stats()["games"] == 3
+
+    def test_leaderboards_loaded_at_open(self, tmp_path):
+        store = self._open(tmp_path, cached=3)
+        store.record_many([(score, 5, 1.0, 0.1 * (score % 3 + 1), score, False) for score in range(20)])
+        store.close()
+        self.store = None
+
+        reopened = self._open(tmp_path, cached=3)
+        assert [result.score for result in reopened.top(3)] == [19, 18, 17]
+        assert [result.score for result in reopened.top(3, speed=0.1)] == [18, 15, 12]
+        assert reopened.best_score(0.2) == 19
+
+    def test_leaderboards_never_query_database(self, tmp_path):
+        store = self._open(tmp_path, cached=3)
+        with patch.object(store, '_connection') as connection:
+            # Parties encore en file : visibles sans attendre l'écriture
+            store.record(4, 8, 1.0, 0.2, 1)
+            store.record_many([(9, 13, 1.0, 0.2, 2, False), (4, 8, 1.0, 0.1, 3, False), (1, 5, 1.0, 0.2, 4, False)])
+            assert [result.seed for result in store.top(3)] == [2, 1, 3]
+            assert [result.seed for result in store.top(3, speed=0.2)] == [2, 1, 4]
+            assert store.best_score(0.1) == 4
+            assert store.best_score(0.3) == 0
+            assert not connection.execute.called
+
+    def test_top_beyond_cache_reads_database(self, tmp_path):
+        store = self._open(tmp_path, cached=2)
+        store.record_many([(score, 5, 1.0, 0.2, score, False) for score in range(5)])
+        store.flush()
+        assert [result.score for result in store.top(4)] == [4, 3, 2, 1]
+
+    def test_queries_use_indexes(self, tmp_path):
+        store = self._open(tmp_path)
+        for query, params in (("SELECT score FROM games ORDER BY score DESC, id LIMIT 5", ()),
+                              ("SELECT score FROM games WHERE speed = ? ORDER BY score DESC, id LIMIT 5", (0.2,)),
+                              ("SELECT MIN(speed) FROM games WHERE speed > ?", (0.2,))):
+            plan = " ".join(row[-1] for row in store._connection.execute("EXPLAIN QUERY PLAN " + query, params))
+            assert "USING INDEX" in plan or "USING COVERING INDEX" in plan
+            assert "TEMP B-TREE" not in plan
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from eel import protocol
+from eel.arena import Arena
+from eel.client import ArenaView
+from eel.eel import DOWN, LEFT, RIGHT, direction_code
+from eel.server import ArenaServer
+
+
+async def _connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    return reader, writer, ArenaView()
+
+
+async def _receive(reader, view, until):
+    """Appliquer les messages reçus jusqu'à ce que until(view) soit vrai"""
+    while not until(view):
+        view.apply(*await asyncio.wait_for(protocol.read_message(reader), 2))
+
+
+def _assert_same(view, arena):
+    assert view.ticks == arena.ticks
+    assert list(view.eels) == list(arena.eels)
+    for player_id in arena.eels:
+        assert view.cells(player_id) == arena.player_cells(player_id)
+    assert [(food.x, food.y) for food in view.foods] == [(food.x, food.y) for food in arena.foods]
+
+
+class TestProtocol:
+
+    def test_tick_round_trip(self):
+        message = protocol.encode_tick(7, [3], [(1, 2, True), (4, 0, False)], [(0, 5, 6)], [(9, 1, 2)])
+        _, kind = protocol.FRAME.unpack_from(message)
+        body = message[protocol.FRAME.size:]
+        assert kind == protocol.TICK
+        ticks, deaths, moves, food_changes, joins = protocol.decode_tick(body)
+        assert (ticks, deaths, food_changes, joins) == (7, [3], [(0, 5, 6)], [(9, 1, 2)])
+        assert list(moves) == [2 | protocol.TAIL_DROPPED, 0]
+
+    def test_move_is_one_byte(self):
+        empty = protocol.encode_tick(1, [], [], [], [])
+        moves = [(player_id, 0, True) for player_id in range(100)]
+        assert len(protocol.encode_tick(1, [], moves, [], [])) == len(empty) + 100
+
+    def test_state_round_trip(self):
+        arena = Arena(10, 10, food_count=2, seed=0)
+        player_id = arena.add_player()
+        for _ in range(4):
+            arena.step()
+        message = protocol.encode_state(arena)
+        ticks, eels, foods = protocol.decode_state(message[protocol.FRAME.size:])
+        assert ticks == 4
+        assert eels == [(player_id, arena.player_cells(player_id))]
+        assert foods == [(i, food.x, food.y) for i, food in enumerate(arena.foods)]
+
+
+class TestArenaServer:
+
+    def test_clients_mirror_server(self):
+        async def scenario():
+            server = ArenaServer(Arena(30, 30, food_count=5, seed=3), tick_interval=0.01)
+            port = await server.start()
+            clients = [await _connect(port) for _ in range(3)]
+            await asyncio.sleep(0.05)
+
+            await server.run(ticks=1)
+            for reader, _, view in clients:
+                await _receive(reader, view, lambda view: view.ready)
+            assert len(server.arena) == 3
+            assert {view.player_id for _, _, view in clients} == set(server.arena.eels)
+
+            # Un joueur tourne : la direction est appliquée au tick suivant
+            reader, writer, view = clients[0]
+            eel = server.arena.eels[view.player_id]
+            turn = DOWN if eel.direction in (direction_code(LEFT), direction_code(RIGHT)) else RIGHT
+            writer.write(protocol.frame(protocol.DIRECTION, bytes([direction_code(turn)])))
+            await writer.drain()
+            await asyncio.sleep(0.05)
+
+            await server.run(ticks=5)
+            for reader, _, view in clients:
+                await _receive(reader, view, lambda view: view.ticks == server.arena.ticks)
+                _assert_same(view, server.arena)
+
+            for _, writer, _ in clients:
+                writer.close()
+            await server.close()
+
+        asyncio.run(scenario())
+
+    def test_disconnect_removes_player(self):
+        async def scenario():
+            server = ArenaServer(Arena(30, 30, food_count=1, seed=4), tick_interval=0.01)
+            port = await server.start()
+            first = await _connect(port)
+            second = await _connect(port)
+            await asyncio.sleep(0.05)
+            await server.run(ticks=1)
+            for reader, _, view in (first, second):
+                await _receive(reader, view, lambda view: view.ready)
+
+            first[1].close()
+            await asyncio.sleep(0.05)
+            await server.run(ticks=2)
+
+            reader, writer, view = second
+            await _receive(reader, view, lambda view: view.ticks == server.arena.ticks)
+            assert first[2].player_id not in view.eels
+            _assert_same(view, server.arena)
+
+            writer.close()
+            await server.close()
+
+        asyncio.run(scenario())
+
+    def test_late_joiner_gets_full_state(self):
+        async def scenario():
+            server = ArenaServer(Arena(30, 30, food_count=3, seed=5), tick_interval=0.01)
+            port = await server.start()
+            first = await _connect(port)
+            await asyncio.sleep(0.05)
+            await server.run(ticks=6)
+
+            reader, writer, view = await _connect(port)
+            await asyncio.sleep(0.05)
+            await server.run(ticks=3)
+            await _receive(reader, view, lambda view: view.ready and view.ticks == server.arena.ticks)
+            _assert_same(view, server.arena)
+
+            first[1].close()
+            writer.close()
+            await server.close()
+
+        asyncio.run(scenario())
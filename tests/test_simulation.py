@@ -0,0 +1,184 @@
+import subprocess
+import sys
+import pytest
+from eel import config
+from eel.simulation import Simulation, UP, DOWN, LEFT, RIGHT
+
+
+class TestSimulation:
+
+    def setup_method(self):
+        self.sim = Simulation(seed=42)
+        self._move_food((0, 0))
+
+    def _move_food(self, position):
+        self.sim.food.x, self.sim.food.y = position
+
+    def test_no_pygame_import(self):
+        code = "import sys, eel.simulation; print('pygame' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
+
+    def test_init_state(self):
+        sim = Simulation(seed=42)
+        assert sim.get_head_position() == (5, 5)
+        assert sim.eel.auto_direction == RIGHT
+        assert sim.alive is True
+        assert sim.score == 0
+        assert sim.food.get_position() != (5, 5)
+
+    def test_step_moves_right(self):
+        self.sim.step()
+        assert self.sim.get_head_position() == (6, 5)
+        assert self.sim.ticks == 1
+
+    def test_initial_segments_grow(self):
+        for i in range(5):
+            self.sim.step(DOWN if i % 2 else RIGHT)
+        assert len(self.sim.eel.body) == self.sim.eel.initial_segments_to_add
+        assert self.sim.score == 0
+
+    def test_reverse_direction_ignored(self):
+        self.sim.step(LEFT)
+        assert self.sim.eel.auto_direction == RIGHT
+        assert self.sim.get_head_position() == (6, 5)
+
+    def test_out_of_bounds(self):
+        results = [self.sim.step(RIGHT) for _ in range(6)]
+        assert results[-1] == "game_over"
+        assert self.sim.alive is False
+        assert self.sim.step() == "game_over"
+
+    def test_self_collision(self):
+        for _ in range(3):
+            self.sim.eel.add_segment()
+        for action in (RIGHT, DOWN, LEFT):
+            assert self.sim.step(action) is None
+        assert self.sim.step(UP) == "game_over"
+
+    def test_tail_cell_is_free_when_moving(self):
+        for action in (RIGHT, DOWN, LEFT):
+            self.sim.step(action)
+        assert self.sim.step(UP) is None
+        assert self.sim.alive is True
+
+    def test_eat_food(self):
+        self._move_food((6, 5))
+        assert self.sim.step() == "ate"
+        assert self.sim.food.get_position() not in self.sim.eel.body
+        assert self.sim.food.get_position() != self.sim.get_head_position()
+
+        for action in (RIGHT, DOWN, DOWN):
+            self.sim.step(action)
+        assert self.sim.score == 1
+
+    def test_reset_with_seed_is_reproducible(self):
+        self.sim.reset(seed=7)
+        first_food = self.sim.food.get_position()
+        self.sim.reset(seed=7)
+        assert self.sim.food.get_position() == first_food
+
+    def test_same_seed_same_game(self):
+        results = []
+        for _ in range(2):
+            sim = Simulation(seed=3)
+            trace = []
+            for i in range(300):
+                trace.append((sim.step((DOWN, LEFT, UP, RIGHT)[(i // 3) % 4]), sim.food.get_position()))
+            results.append(trace)
+        assert results[0] == results[1]
+
+    def test_is_cell_free(self):
+        assert self.sim.is_cell_free(5, 5) is False
+        assert self.sim.is_cell_free(0, 0) is True
+        assert self.sim.is_cell_free(-1, 0) is False
+        assert self.sim.is_cell_free(0, 11) is False
+
+    def test_filling_board_wins(self):
+        sim = Simulation(width=3, height=1, start_x=0, start_y=0, seed=1)
+        sim.eel.initial_segments_to_add = 1
+        sim.food.x, sim.food.y = (1, 0)
+        assert sim.step(RIGHT) == "ate"
+        assert sim.food.get_position() == (2, 0)
+        assert sim.step(RIGHT) == "won"
+        assert sim.alive is False
+
+    def test_board_size_from_config(self, monkeypatch):
+        monkeypatch.setattr(config, 'GRID_WIDTH', 21)
+        monkeypatch.setattr(config, 'GRID_HEIGHT', 9)
+        sim = Simulation()
+        assert (sim.width, sim.height) == (21, 9)
+        assert sim.get_head_position() == (10, 4)
+
+    def _traced_lines(self, width, height, steps):
+        """Lignes Python exécutées pour steps pas (anguille de 20 segments, sans manger)"""
+        sim = Simulation(width=width, height=height, start_x=0, start_y=0, seed=0)
+        for _ in range(20):
+            sim.eel.add_segment()
+        sim.food.x, sim.food.y = width - 1, height - 1
+        for i in range(30):
+            sim.step(DOWN if (i // 10) % 2 else RIGHT)
+
+        count = 0
+
+        def trace(frame, event, arg):
+            nonlocal count
+            if event == "line":
+                count += 1
+            return trace
+
+        sys.settrace(trace)
+        try:
+            for i in range(steps):
+                sim.step(DOWN if (i // 10) % 2 else RIGHT)
+        finally:
+            sys.settrace(None)
+        assert sim.alive is True
+        return count
+
+    def test_large_board_step_cost_independent_of_area(self):
+        # Même travail par pas sur 100x100 et 1000x1000 : rien n'est proportionnel à la surface
+        assert self._traced_lines(1000, 1000, 100) == self._traced_lines(100, 100, 100)
+
+    def test_state_uses_slots(self):
+        sim = Simulation(seed=0)
+        for obj in (sim, sim.eel, sim.eel.occupancy, sim.eel.body_history, sim.food):
+            assert not hasattr(obj, '__dict__')
+        assert sim.eel.direction == 3  # code de RIGHT
+
+    def test_snapshot_is_immutable_bytes(self):
+        assert isinstance(self.sim.snapshot(), bytes)
+
+    def test_restore_rewinds_game(self):
+        for _ in range(4):
+            self.sim.step()
+        blob = self.sim.snapshot()
+        head = self.sim.get_head_position()
+        for _ in range(3):
+            self.sim.step(DOWN)
+
+        self.sim.restore(blob)
+        assert self.sim.get_head_position() == head
+        assert self.sim.ticks == 4
+        assert self.sim.snapshot() == blob
+
+    def test_fork_plays_identically(self):
+        sim = Simulation(width=8, height=8, seed=7)
+        for _ in range(3):
+            sim.step()
+        forks = sim.fork(3)
+        assert all(fork.eel is not sim.eel for fork in forks)
+
+        # Mêmes actions : mêmes parties, nourriture comprise
+        actions = [DOWN, LEFT, UP, None, RIGHT, DOWN] * 10
+        for game in [sim] + forks:
+            for action in actions:
+                game.step(action)
+        assert len({game.snapshot() for game in [sim] + forks}) == 1
+
+    def test_forks_are_independent(self):
+        fork = self.sim.fork(1)[0]
+        fork.step(DOWN)
+        assert fork.ticks == 1
+        assert self.sim.ticks == 0
+        assert fork.get_head_position() != self.sim.get_head_position()
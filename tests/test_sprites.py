@@ -0,0 +1,40 @@
+import pytest
+import pygame
+from eel import sprites
+
+
+class TestSprites:
+
+    def setup_method(self):
+        pygame.init()
+        sprites.clear()
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def test_sprite_is_cached(self):
+        sprite = sprites.circle_sprite(25, "darkgreen")
+        assert sprites.circle_sprite(25, "darkgreen") is sprite
+        assert sprites.circle_sprite(25, pygame.Color("darkgreen")) is not None
+        assert sprites.circle_sprite(8, "darkgreen") is not sprite
+        assert sprite.get_size() == (50, 50)
+
+    @pytest.mark.parametrize("center", [(100, 100), (100.4, 100.6), (127.5, 99.2)])
+    def test_blit_matches_draw_circle(self, center):
+        radius = 25
+        drawn = pygame.Surface((300, 300))
+        drawn.fill("darkblue")
+        drawn_rect = pygame.draw.circle(drawn, "darkgreen", center, radius)
+
+        blitted = pygame.Surface((300, 300))
+        blitted.fill("darkblue")
+        blitted_rect = blitted.blit(sprites.circle_sprite(radius, "darkgreen"),
+                                    (center[0] - radius, center[1] - radius))
+
+        assert blitted_rect == drawn_rect
+        assert pygame.image.tobytes(blitted, 'RGB') == pygame.image.tobytes(drawn, 'RGB')
+
+    def test_clear(self):
+        sprite = sprites.circle_sprite(25, "red")
+        sprites.clear()
+        assert sprites.circle_sprite(25, "red") is not sprite
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import pygame
+from benchmarks.run import measure_startup
+
+
+# Budget de démarrage : de l'import du jeu au premier menu dessiné (pygame déjà importé)
+STARTUP_BUDGET_MS = 100
+
+# Modules sans affichage : utilisables sans pygame (simulation, apprentissage, serveur, scores)
+HEADLESS_MODULES = [
+    "eel.config", "eel.eel", "eel.food", "eel.history", "eel.occupancy", "eel.simulation",
+    "eel.snapshot", "eel.replay", "eel.autopilot", "eel.tournament", "eel.env", "eel.batch",
+    "eel.arena", "eel.protocol", "eel.server", "eel.client", "eel.scores", "eel.game_state",
+    "eel.profiler", "eel.text_cache",
+]
+
+
+def _imported_modules(code):
+    output = subprocess.run([sys.executable, "-c", code + "; print(' '.join(sys.modules))"],
+                            capture_output=True, text=True, check=True)
+    return set(output.stdout.split())
+
+
+class TestStartup:
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def test_headless_modules_skip_pygame(self):
+        modules = _imported_modules("import sys, " + ", ".join(HEADLESS_MODULES))
+        assert "pygame" not in modules
+
+    def test_game_skips_disabled_options(self):
+        modules = _imported_modules("import sys, eel.game")
+        for name in ("eel.tournament", "eel.arena", "eel.scores", "eel.profiler", "eel.autopilot", "sqlite3"):
+            assert name not in modules
+
+    def test_only_display_and_font_initialised(self):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.quit()
+        from eel.game import Game
+        Game()
+        assert pygame.display.get_init()
+        assert pygame.font.get_init()
+        assert pygame.mixer.get_init() is None
+        assert not pygame.joystick.get_init()
+
+    def test_startup_budget(self):
+        # Meilleur de trois lancements : les autres processus de la machine ne comptent pas
+        startup_ms = min(measure_startup()[1] for _ in range(3)) / 1e6
+        assert startup_ms < STARTUP_BUDGET_MS
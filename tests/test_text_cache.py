@@ -0,0 +1,49 @@
+import pytest
+import pygame
+from unittest.mock import MagicMock
+from eel.text_cache import TextCache
+
+
+class TestTextCache:
+
+    def setup_method(self):
+        pygame.init()
+        self.font = pygame.font.Font(None, 36)
+        self.cache = TextCache(self.font, max_size=2)
+
+    def teardown_method(self):
+        pygame.quit()
+
+    def test_render_returns_surface(self):
+        surface = self.cache.render("Score: 0", True, "white")
+        assert isinstance(surface, pygame.Surface)
+        assert surface.get_size() == self.font.size("Score: 0")
+
+    def test_render_reuses_surface(self):
+        first = self.cache.render("PLAY", True, "white")
+        assert self.cache.render("PLAY", True, "white") is first
+        assert self.cache.render("PLAY", True, "red") is not first
+
+    def test_render_calls_font_once(self):
+        font = MagicMock()
+        cache = TextCache(font)
+        for _ in range(10):
+            cache.render("THE EEL", True, "white")
+        font.render.assert_called_once_with("THE EEL", True, "white")
+
+    def test_color_object_key(self):
+        first = self.cache.render("A", True, pygame.Color("white"))
+        assert self.cache.render("A", True, pygame.Color("white")) is first
+
+    def test_evicts_least_recently_used(self):
+        first = self.cache.render("A", True, "white")
+        self.cache.render("B", True, "white")
+        self.cache.render("A", True, "white")
+        self.cache.render("C", True, "white")
+        assert len(self.cache) == 2
+        assert self.cache.render("A", True, "white") is first
+
+    def test_clear(self):
+        self.cache.render("A", True, "white")
+        self.cache.clear()
+        assert len(self.cache) == 0
@@ -0,0 +1,70 @@
+import json
+import pytest
+from eel.simulation import Simulation, UP, RIGHT
+from eel.tournament import greedy_policy, load_policy, play_game, run_tournament, summarize, main
+
+
+def straight_policy(simulation):
+    return None
+
+
+class TestTournament:
+
+    def setup_method(self):
+        self.sim = Simulation(seed=0)
+
+    def test_load_policy(self):
+        assert load_policy("eel.tournament:greedy_policy") is greedy_policy
+        assert load_policy("eel.tournament:play_game") is play_game
+
+    def test_play_game_straight_dies_at_wall(self):
+        score, ticks = play_game(self.sim, straight_policy, 0, 1000)
+        assert score == 0
+        assert ticks == 6
+        assert self.sim.alive is False
+
+    def test_play_game_respects_max_ticks(self):
+        score, ticks = play_game(self.sim, greedy_policy, 0, 10)
+        assert ticks == 10
+
+    def test_play_game_is_reproducible(self):
+        first = play_game(self.sim, greedy_policy, 5, 1000)
+        second = play_game(Simulation(), greedy_policy, 5, 1000)
+        assert first == second
+
+    def test_greedy_policy_moves_towards_food(self):
+        self.sim.food.x, self.sim.food.y = (5, 0)
+        assert greedy_policy(self.sim) == UP
+        self.sim.food.x, self.sim.food.y = (10, 5)
+        assert greedy_policy(self.sim) == RIGHT
+
+    def test_summarize(self):
+        stats = summarize([(1, 10), (3, 30), (3, 20), (5, 40)], 2.0)
+        assert stats["games"] == 4
+        assert stats["games_per_second"] == 2.0
+        assert stats["score"]["mean"] == 3.0
+        assert stats["score"]["max"] == 5
+        assert stats["score"]["distribution"] == {1: 1, 3: 2, 5: 1}
+        assert stats["survival_ticks"]["max"] == 40
+
+    def test_run_tournament_single_process(self):
+        stats = run_tournament("eel.tournament:greedy_policy", 20, workers=1, seed=0)
+        assert stats["games"] == 20
+        assert stats["score"]["mean"] > 0
+
+    def test_run_tournament_workers_match_single_process(self):
+        single = run_tournament("eel.tournament:greedy_policy", 12, workers=1, seed=3)
+        multi = run_tournament("eel.tournament:greedy_policy", 12, workers=2, seed=3)
+        assert single["score"] == multi["score"]
+        assert single["survival_ticks"] == multi["survival_ticks"]
+
+    def test_no_games_rejected(self):
+        with pytest.raises(ValueError):
+            run_tournament("eel.tournament:greedy_policy", 0, workers=1)
+        with pytest.raises(SystemExit):
+            main(["--games", "0"])
+
+    def test_main_json(self, capsys):
+        main(["--games", "5", "--workers", "1", "--json"])
+        stats = json.loads(capsys.readouterr().out)
+        assert stats["games"] == 5